@@ -0,0 +1,94 @@
+"""Run the NodeAudit benchmarks headless and print JSON.
+
+    python -m benchmarks                      # 1k, 10k and 100k rows, every case
+    python -m benchmarks --sizes 1000 --cases load extract -o results.json
+
+Synthetic workbooks are generated once per size into --data-dir (default: a
+temporary directory). Every (case, size) pair runs in its own interpreter so
+its peak RSS is its own. Qt runs on the offscreen platform.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.cases import CASES, peak_rss_bytes
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def run_case(name, path, rows):
+    """Child side: run one case and print its result as JSON."""
+    result = CASES[name](path, rows)
+    result = {key: round(value, 4) if isinstance(value, float) else value for key, value in result.items()}
+    result["peak_rss_bytes"] = peak_rss_bytes()
+    print(json.dumps(result))
+
+
+def workbook_for(rows, data_dir):
+    from benchmarks.synthetic import make_workbook
+    path = os.path.join(data_dir, f"audit_{rows}.xlsx")
+    if not os.path.exists(path):
+        print(f"generating {rows} rows...", file=sys.stderr)
+        make_workbook(path, rows)
+    return path
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="NodeAudit benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="data rows per workbook")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--data-dir", help="keep generated workbooks here and reuse them across runs")
+    parser.add_argument("-o", "--output", help="also write the full results document to this JSON file")
+    parser.add_argument("--run-case", nargs=3, metavar=("CASE", "PATH", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        name, path, rows = args.run_case
+        run_case(name, path, int(rows))
+        return 0
+
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="nodeaudit-bench-data-")
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+    failed = False
+    for rows in args.sizes:
+        path = workbook_for(rows, data_dir)
+        for name in args.cases:
+            proc = subprocess.run([sys.executable, "-m", "benchmarks", "--run-case", name, path, str(rows)],
+                                  cwd=ROOT, env=env, capture_output=True, text=True)
+            result = {"case": name, "rows": rows}
+            if proc.returncode == 0:
+                result.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+            else:
+                failed = True
+                result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+            print(json.dumps(result), flush=True)
+            results.append(result)
+
+    if args.output:
+        document = {"timestamp": time.time(), "revision": git_revision(), "python": platform.python_version(),
+                    "platform": platform.platform(), "results": results}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Memory held by the compact column model vs. a full openpyxl load of the same sheet.
+
+    python benchmarks/bench_memory.py --rows 10000 100000
+
+Each measurement runs in a fresh interpreter under tracemalloc; one JSON
+object per workbook size is printed to stdout.
+"""
+import os
+import sys
+import gc
+import json
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ("compact", "load_workbook")
+
+
+def measure(mode, path):
+    from openpyxl import load_workbook
+    from nodeaudit.row_navigator import scan_sheet
+    gc.collect()
+    tracemalloc.start()
+    if mode == "compact":
+        model = scan_sheet(path)
+    else:
+        model = load_workbook(path)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return {"retained_bytes": retained, "peak_bytes": peak}
+
+
+def run(rows, directory):
+    from benchmarks.synthetic import make_workbook
+    path = make_workbook(os.path.join(directory, f"audit_{rows}.xlsx"), rows)
+    result = {"benchmark": "memory_model", "rows": rows}
+    for mode in MODES:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", mode, path],
+                             check=True, capture_output=True, text=True).stdout
+        stats = json.loads(out)
+        stats["retained_bytes_per_row"] = round(stats["retained_bytes"] / rows, 1)
+        result[mode] = stats
+    result["retained_ratio"] = round(result["load_workbook"]["retained_bytes"] / result["compact"]["retained_bytes"], 1)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000])
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return 0
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            print(json.dumps(run(rows, directory)), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
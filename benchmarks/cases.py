@@ -0,0 +1,190 @@
+"""Benchmark cases. Each takes a workbook path and returns a dict of measurements.
+
+Cases run in a fresh interpreter (see __main__), so ``peak_rss_bytes`` at the
+end of a case is that case's own peak.
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+
+SAMPLE_ROWS = 2000
+SAVE_ROUNDS = 3
+BULK_FRACTION = 0.1
+GUI_SAVES = 50
+
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_set(path, journal=False):
+    from nodeaudit.workbook_set import WorkbookSet, expand_sources
+    return WorkbookSet.open(expand_sources([path]), journal=journal)
+
+
+def scratch_copy(path):
+    """Cases that write work on a copy so the cached input stays untouched."""
+    directory = tempfile.mkdtemp(prefix="nodeaudit-bench-")
+    return shutil.copy(path, os.path.join(directory, os.path.basename(path)))
+
+
+def case_load(path, rows):
+    started = time.perf_counter()
+    workbooks = open_set(path)
+    elapsed = time.perf_counter() - started
+    workbooks.close(flush=False)
+    return {"seconds": elapsed, "rows_per_second": rows / elapsed}
+
+
+def case_row_read(path, rows):
+    workbooks = open_set(path)
+    rng = random.Random(1)
+    sample = [rng.randrange(2, workbooks.max_row + 1) for _ in range(SAMPLE_ROWS)]
+    started = time.perf_counter()
+    for row in sample:
+        workbooks.row(row).to_dict()
+    random_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    for row in range(2, min(workbooks.max_row, SAMPLE_ROWS + 1) + 1):
+        workbooks.row(row).to_dict()
+    sequential_elapsed = time.perf_counter() - started
+    workbooks.close(flush=False)
+    return {"random_reads_per_second": len(sample) / random_elapsed,
+            "sequential_reads_per_second": SAMPLE_ROWS / sequential_elapsed}
+
+
+def case_save_one_row(path, rows):
+    from nodeaudit.column_schema import NODE_FIELDS, BUILD_STATE
+    path = scratch_copy(path)
+    workbooks = open_set(path, journal=True)
+    schema = workbooks.schema_at(2)
+    timings = []
+    for i in range(SAVE_ROUNDS):
+        row = 2 + i
+        cells = {schema.column(NODE_FIELDS[0]): f"BENCH-{i}", schema.column(BUILD_STATE): "PRO-I"}
+        started = time.perf_counter()
+        journaled = workbooks.append_journal("row", row, cells)
+        for col_idx, value in cells.items():
+            workbooks.write_cell(row, col_idx, value)
+        workbooks.mark_applied({journaled[0]: journaled[1]})
+        workbooks.flush()
+        timings.append(time.perf_counter() - started)
+    workbooks.close(flush=False)
+    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+    # Saves patch the sheet XML (see nodeaudit.xlsx_patch), so the first costs about the same as the rest
+    # unless a cell needs the full openpyxl fallback, which parses the whole workbook once
+    return {"first_save_seconds": timings[0], "next_save_seconds": min(timings[1:])}
+
+
+def case_bulk_update(path, rows):
+    from benchmarks.synthetic import pid_for
+    from nodeaudit.cli import apply_updates
+    path = scratch_copy(path)
+    rng = random.Random(2)
+    targets = rng.sample(range(2, rows + 2), max(1, int(rows * BULK_FRACTION)))
+    updates = [{"PID": pid_for(row), "NODE 1": f"BULK-{row}", "BUILD STATE": "Design Approved"} for row in targets]
+    started = time.perf_counter()
+    report = apply_updates(path, updates)
+    elapsed = time.perf_counter() - started
+    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+    return {"seconds": elapsed, "updates": len(updates), "rows_updated": report.rows_updated,
+            "rows_per_second": report.rows_scanned / elapsed}
+
+
+def design_page(pid, status="Design Approved"):
+    fields = "".join(f"<tr><td class='formLabel'>Field {i}</td><td>value {i}</td></tr>" for i in range(40))
+    return (f"<html><head><meta charset='utf-8'></head><body><table>{fields}"
+            f"<tr><td class='formLabel'>PID:</td><td>{pid}</td></tr>"
+            f"<tr><td class='formLabel'>Node:</td><td>N-{pid}</td></tr>"
+            f"<tr><td class='formLabel'>Design Status:</td><td>{status}</td></tr></table></body></html>")
+
+
+def list_page(count):
+    rows = "".join(f"<tr><td>PID{i:07d}</td><td>N{i}</td><td>owner</td><td>Design Approved</td></tr>"
+                   for i in range(count))
+    return ("<html><body><table><tr><th>PID</th><th>Node</th><th>Owner</th><th>Design Status</th></tr>"
+            f"{rows}</table></body></html>")
+
+
+def case_extract(path, rows):
+    # Independent of the workbook; run once per size anyway so results line up
+    from nodeaudit.prism_extract import extract_record, extract_records
+    pages = [design_page(f"PID{i:07d}").encode("utf-8") for i in range(500)]
+    started = time.perf_counter()
+    for page in pages:
+        extract_record(page)
+    design_elapsed = time.perf_counter() - started
+    listing = list_page(100)
+    started = time.perf_counter()
+    records = 0
+    for _ in range(50):
+        records += len(extract_records(listing))
+    list_elapsed = time.perf_counter() - started
+    return {"design_pages_per_second": len(pages) / design_elapsed,
+            "list_records_per_second": records / list_elapsed}
+
+
+def case_gui_save_next(path, rows):
+    """Save & Next in the real window on the offscreen Qt platform."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import main
+    from nodeaudit.prism_cache import PrismCache
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtWidgets import QApplication, QFileDialog
+
+    path = scratch_copy(path)
+    scratch_dir = os.path.dirname(path)
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication.instance() or QApplication([])
+    # Modal dialogs would block a headless run
+    main.ExcelAutomationApp.show_dark_messagebox = lambda self, icon, title, text: None
+    QFileDialog.getOpenFileNames = staticmethod(lambda *args, **kwargs: ([path], ""))
+    # Keep the scratch workbook's session and window geometry out of settings.json, and
+    # the PRISM cache and anything else the window writes next to it in the scratch folder
+    main.save_settings = lambda settings: None
+    main.app_dir = lambda: scratch_dir
+    window = main.ExcelAutomationApp()
+    window.prism_cache = PrismCache(os.path.join(scratch_dir, "prism_cache.sqlite3"))
+    started = time.perf_counter()
+    window.load_excel()
+    while window.workbooks is None:
+        app.processEvents()
+        time.sleep(0.005)
+    load_elapsed = time.perf_counter() - started
+
+    window.row_input.setText("2")
+    window.load_specific_row()
+    timings = []
+    for i in range(GUI_SAVES):
+        window.node_inputs[0].setText(f"GUI-{i}")
+        started = time.perf_counter()
+        window.save_next_action()
+        app.processEvents()
+        timings.append(time.perf_counter() - started)
+    started = time.perf_counter()
+    window.close()
+    close_elapsed = time.perf_counter() - started
+    shutil.rmtree(scratch_dir, ignore_errors=True)
+    timings.sort()
+    return {"load_seconds": load_elapsed, "save_next_median_ms": timings[len(timings) // 2] * 1000,
+            "save_next_max_ms": timings[-1] * 1000, "close_flush_seconds": close_elapsed}
+
+
+CASES = {
+    "load": case_load,
+    "row_read": case_row_read,
+    "save_one_row": case_save_one_row,
+    "bulk_update": case_bulk_update,
+    "extract": case_extract,
+    "gui_save_next": case_gui_save_next,
+}
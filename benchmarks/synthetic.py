@@ -0,0 +1,43 @@
+"""Synthetic audit workbooks with the header layout the app expects.
+
+Scope and Magellan columns use the double-space "SCOPE  n" / "MAGELLAN  n"
+spelling found in the real audit sheets; the rest of the ~30 columns are
+filler so rows are as wide as production ones.
+"""
+import random
+from openpyxl import Workbook
+
+CONFIGS = ["1x1", "2x2", "4x4", "N/A"]
+BUILD_STATES = ["In Design", "In Progress", "Does Not Exist", "PRO-I", "Design Approved"]
+FILLER = ["MARKET", "REGION", "SITE ID", "ADDRESS", "CITY", "ZIP", "LAT", "LONG", "OWNER", "DUE DATE"]
+
+HEADER = ([f"PID {i}" for i in range(1, 5)] + [f"NODE {i}" for i in range(1, 5)]
+          + [f"SCOPE  {i}" for i in range(1, 5)] + [f"MAGELLAN  {i}" for i in range(1, 5)]
+          + ["AOI NODE", "NOTES"] + FILLER)
+
+
+def pid_for(row):
+    """The PID synthetic row ``row`` (2-based sheet row) has in slot 1."""
+    return f"PID{row:07d}"
+
+
+def make_row(row, rng):
+    # Most rows carry one or two PIDs, like the real sheets
+    pids = [pid_for(row)] + [f"PID{row:07d}-{slot}" if rng.random() < 0.3 else None for slot in range(2, 5)]
+    nodes = [f"N{rng.randrange(100000):05d}" if pid and rng.random() < 0.5 else None for pid in pids]
+    scopes = [rng.choice(["FTTH", "HFC", "MDU"]) if pid else None for pid in pids]
+    magellans = [f"MG-{rng.randrange(10 ** 6):06d}" if pid else None for pid in pids]
+    filler = [f"{name.lower()}-{rng.randrange(1000)}" for name in FILLER]
+    return pids + nodes + scopes + magellans + [rng.choice(CONFIGS), rng.choice(BUILD_STATES)] + filler
+
+
+def make_workbook(path, rows, seed=0):
+    """Write an audit workbook with ``rows`` data rows (sheet rows 2..rows + 1) to ``path``."""
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Audit")
+    sheet.append(HEADER)
+    for row in range(2, rows + 2):
+        sheet.append(make_row(row, rng))
+    workbook.save(path)
+    return path
@@ -1,86 +1,611 @@
 import sys
 import json
 import os
-import webbrowser
-from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QFileDialog, QLabel, QTextEdit, QComboBox, QGridLayout, QLineEdit, QMessageBox, QStyleFactory
-from PyQt5.QtGui import QPalette, QColor
-from PyQt5.QtCore import Qt, pyqtSlot, pyqtSignal, QUrl, QTimer, QObject
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from openpyxl import load_workbook
+import time
+import threading
 import traceback
-from PyQt5.QtWebChannel import QWebChannel
+from concurrent.futures import ThreadPoolExecutor
+from nodeaudit.startup_profile import startup
+# QtWebEngine, QtWebChannel and openpyxl are imported on first use (see open_browser and load_excel)
+with startup.step("import PyQt5 widgets"):
+    from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QFileDialog, QLabel, QTextEdit, QComboBox, QGridLayout, QLineEdit, QMessageBox, QStyleFactory, QInputDialog, QTableWidget, QTableWidgetItem, QHeaderView, QShortcut, QCheckBox, QListWidget, QListWidgetItem
+    from PyQt5.QtGui import QPalette, QColor, QKeySequence
+    from PyQt5.QtCore import Qt, pyqtSlot, pyqtSignal, QUrl, QTimer, QObject, QThread, QFile, QIODevice, QEvent, QByteArray
+with startup.step("import nodeaudit"):
+    from nodeaudit.column_schema import PID_FIELDS, NODE_FIELDS, SCOPE_FIELDS, MAGELLAN_FIELDS, CONFIG, BUILD_STATE, clean_value, normalize_pid
+    from nodeaudit.prism_batch import PrismFetcher, fetch_statuses, apply_results, row_build_state, upcoming_pids, is_design_url, ReconcileReport, DEFAULT_CONCURRENCY, DEFAULT_PREFETCH_ROWS, DEFAULT_PREFETCH_CONCURRENCY
+    from nodeaudit.settings import load_settings, save_settings, app_dir, remember_session, find_session
+    from nodeaudit.completeness import describe_missing
+    from nodeaudit.audit_summary import ordered_counts, write_report
+    from nodeaudit.diagnostics import diagnostics
+    from nodeaudit.request_filter import RequestFilter, LoadStats, describe_load
+    from nodeaudit.page_pool import PoolScheduler, DEFAULT_POOL_SIZE, DEFAULT_POOL_TIMEOUT, DEFAULT_RECYCLE_AFTER, SETTLE_SECONDS
+    from nodeaudit.prism_extract import PrismRecord, extract_records, format_status, record_from_message, APPROVED, IN_PROGRESS
+
+OBSERVER_JS = """
+(function() {
+    if (window.__nodeAuditObserver) return;
+    var STATUS_CODES = [['design approved', 'APPROVED'], ['in progress', 'IN_PROGRESS'], ['rejected', 'REJECTED']];
+    function statusCode(text) {
+        var lowered = text.toLowerCase();
+        for (var i = 0; i < STATUS_CODES.length; i++) {
+            if (lowered.indexOf(STATUS_CODES[i][0]) !== -1) return STATUS_CODES[i][1];
+        }
+        return 'NOT_FOUND';
+    }
+    function cellText(cell) {
+        // Same cleanup as prism_extract.cell_text; \\s matches NBSP too
+        return cell.textContent.replace(/[\\u200B\\u200C\\u200D\\u2060\\uFEFF]/g, '').replace(/\\s+/g, ' ').trim();
+    }
+    function labelField(text) {
+        if (text.indexOf('PID') !== -1) return 'pid';
+        if (text.indexOf('Node') !== -1) return 'node';
+        if (text.indexOf('Design Status') !== -1) return 'designStatus';
+        return null;
+    }
+    function makeRecord(pid, node, designStatus) {
+        return {pid: pid, node: node, designStatus: designStatus,
+                status: pid && node ? statusCode(designStatus) : 'NOT_FOUND',
+                url: location.href, ts: Date.now() / 1000};
+    }
+    function headerColumns(cells) {
+        var columns = {};
+        for (var c = 0; c < cells.length; c++) {
+            if (cells[c].classList.contains('formLabel')) return null;
+            var field = labelField(cellText(cells[c]));
+            if (field && !(field in columns)) columns[field] = c;
+        }
+        return 'pid' in columns && 'designStatus' in columns ? columns : null;
+    }
+    function extractRecords() {
+        // Same rules as nodeaudit.prism_extract: result tables first, then the td.formLabel form
+        var byPid = {}, order = [], consumed = new Set();
+        function add(record) {
+            if (!(record.pid in byPid)) order.push(record.pid);
+            byPid[record.pid] = record;
+        }
+        document.querySelectorAll('table').forEach(function(table) {
+            var columns = null;
+            for (var r = 0; r < table.rows.length; r++) {
+                var cells = table.rows[r].cells;
+                if (!columns) {
+                    columns = headerColumns(cells);
+                    if (columns) consumed.add(table.rows[r]);
+                    continue;
+                }
+                consumed.add(table.rows[r]);
+                var cell = function(field) {
+                    var i = columns[field];
+                    return i !== undefined && i < cells.length ? cellText(cells[i]) : '';
+                };
+                if (cell('pid')) add(makeRecord(cell('pid'), cell('node'), cell('designStatus')));
+            }
+        });
+        var form = {pid: '', node: '', designStatus: ''};
+        document.querySelectorAll('td.formLabel').forEach(function(label) {
+            if (consumed.has(label.parentElement)) return;
+            var cell = label.nextElementSibling;
+            var field = labelField(cellText(label));
+            if (field) form[field] = cell ? cellText(cell) : '';
+        });
+        if (form.pid) add(makeRecord(form.pid, form.node, form.designStatus));
+        // A page with no design on it still reports, so the Bridge can fall back to In Progress
+        if (!order.length) return [makeRecord('', '', '')];
+        return order.map(function(pid) { return byPid[pid]; });
+    }
+    var last = null, pending = null;
+    function push() {
+        pending = null;
+        var records = extractRecords();
+        // Timestamps change on every call, so compare everything else
+        var key = JSON.stringify(records.map(function(r) { return [r.pid, r.node, r.designStatus, r.status]; }));
+        if (key === last) return;
+        last = key;
+        window.bridge.receiveRecords(records);
+    }
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        window.bridge = channel.objects.bridge;
+        // Coalesce bursts of DOM mutations; push() itself drops unchanged records
+        window.__nodeAuditObserver = new MutationObserver(function() {
+            if (!pending) pending = setTimeout(push, 200);
+        });
+        window.__nodeAuditObserver.observe(document.body, {childList: true, subtree: true, characterData: true});
+    });
+})();
+"""
+
+def make_observer_script():
+    from PyQt5.QtWebEngineWidgets import QWebEngineScript
+    qwebchannel = QFile(":/qtwebchannel/qwebchannel.js")
+    qwebchannel.open(QIODevice.ReadOnly)
+    source = bytes(qwebchannel.readAll()).decode("utf-8")
+    qwebchannel.close()
+    script = QWebEngineScript()
+    script.setName("nodeaudit-observer")
+    script.setSourceCode(source + OBSERVER_JS)
+    script.setInjectionPoint(QWebEngineScript.DocumentReady)
+    script.setWorldId(QWebEngineScript.MainWorld)
+    script.setRunsOnSubFrames(False)
+    return script
+
+# QWebEngineUrlRequestInfo.ResourceType names -> nodeaudit.request_filter names
+RESOURCE_TYPES = {
+    "ResourceTypeMainFrame": "main_frame", "ResourceTypeSubFrame": "sub_frame",
+    "ResourceTypeStylesheet": "stylesheet", "ResourceTypeScript": "script", "ResourceTypeImage": "image",
+    "ResourceTypeFontResource": "font", "ResourceTypeSubResource": "sub_resource", "ResourceTypeObject": "object",
+    "ResourceTypeMedia": "media", "ResourceTypeWorker": "worker", "ResourceTypeSharedWorker": "shared_worker",
+    "ResourceTypePrefetch": "prefetch", "ResourceTypeFavicon": "favicon", "ResourceTypeXhr": "xhr",
+    "ResourceTypePing": "ping", "ResourceTypeServiceWorker": "service_worker", "ResourceTypeCspReport": "csp_report",
+    "ResourceTypePluginResource": "plugin_resource",
+    "ResourceTypeNavigationPreloadMainFrame": "navigation_preload_main_frame",
+    "ResourceTypeNavigationPreloadSubFrame": "navigation_preload_sub_frame",
+}
+
+def make_request_interceptor(request_filter, load_stats):
+    """QWebEngineUrlRequestInterceptor applying a RequestFilter and counting requests into LoadStats"""
+    from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+    resource_types = {getattr(QWebEngineUrlRequestInfo, name): label
+                      for name, label in RESOURCE_TYPES.items() if hasattr(QWebEngineUrlRequestInfo, name)}
+
+    class RequestInterceptor(QWebEngineUrlRequestInterceptor):
+        # Called on Qt's network thread for every request of every page in the profile
+        def interceptRequest(self, info):
+            resource_type = resource_types.get(info.resourceType(), "unknown")
+            blocked = request_filter.should_block(info.requestUrl().toString(), resource_type,
+                                                  info.firstPartyUrl().toString())
+            load_stats.record(resource_type, blocked)
+            if blocked:
+                info.block(True)
+
+    return RequestInterceptor()
 
 class Bridge(QObject):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
-
-    @pyqtSlot(str)
-    def receiveStatus(self, status):
-        print("[Web Scraping Debug] Received status:", status)  # Debug print
+        self.last_key = None
+
+    @pyqtSlot('QVariantList')
+    def receiveRecords(self, messages):
+        # Pushed by the page's observer: a list of {pid, node, designStatus, status, url, ts} objects
+        url = messages[0].get("url") or "" if messages else ""
+        with diagnostics.timer("bridge.receive_records"):
+            self.receive_records([record_from_message(message) for message in messages], url)
+
+    def receive_records(self, records, url=""):
+        # A design page names one PID; search/list pages name many and are applied sheet-wide
+        records = [record for record in records if record.pid]
+        if len(records) <= 1:
+            self.receive_record(records[0] if records else PrismRecord(), url)
+            return
+        key = tuple((record.pid, record.node, record.status) for record in records)
+        if key == self.last_key:
+            return
+        self.last_key = key
+        if diagnostics.enabled:
+            print(f"[Web Scraping Debug] Received {len(records)} records:", url)
+        self.main_window.apply_prism_records(records)
+
+    def receive_record(self, record, url=""):
+        # The observer and loadFinished can both report the same page state
+        key = (record.pid, record.node, record.status)
+        if key == self.last_key:
+            return
+        self.last_key = key
+        self.main_window.remember_prism_records([record])
+        status = format_status(record)
+        if diagnostics.enabled:
+            print("[Web Scraping Debug] Received record:", record, url)
         # Update the browser window's status label for user feedback
         if hasattr(self.main_window, 'browser_status_label'):
             self.main_window.browser_status_label.setText(f"Web Scraping Status: {status}")
         self.main_window.status_label.setText(status)
-        
-        # Handle fallback case
-        if status == 'IN_PROGRESS_FALLBACK':
-            self.main_window.build_state_dropdown.setCurrentText("In Progress")
+
+        # Handle fallback case: only a PRISM design page without a design means In Progress
+        if not record.found:
+            if not is_design_url(url, self.main_window.prism_url_template):
+                return
+            if self.main_window.build_state_edited():
+                self.main_window.status_label.setText("⚠️ Design tab not found – Build State left as set")
+                return
+            self.main_window.set_build_state(IN_PROGRESS)
             self.main_window.status_label.setText("⚠️ Design tab not found – set to In Progress")
-            if hasattr(self.main_window, 'timer'):
-                self.main_window.timer.stop()
             return
-            
+
         # If design is approved, update the Excel file
-        if "✅ Design Approved" in status:
+        if record.status == APPROVED:
             try:
-                # Extract PID and Node from status message
-                pid_match = status.split("PID:")[1].split("|")[0].strip()
-                node_match = status.split("Node:")[1].strip()
-                
-                # Find matching PID input field or first empty one
-                pid_updated = False
-                for i, pid_input in enumerate(self.main_window.pid_inputs):
-                    if pid_input.text().strip() == pid_match:
-                        # Update the corresponding node input
-                        self.main_window.node_inputs[i].setText(node_match)
-                        # Set build state to "Design Approved"
-                        self.main_window.build_state_dropdown.setCurrentText("Design Approved")
-                        pid_updated = True
-                        break
-                
-                # If no match found, fill the first empty PID field
-                if not pid_updated:
-                    for i, pid_input in enumerate(self.main_window.pid_inputs):
-                        if not pid_input.text().strip():
-                            pid_input.setText(pid_match)
-                            self.main_window.node_inputs[i].setText(node_match)
-                            self.main_window.build_state_dropdown.setCurrentText("Design Approved")
-                            pid_updated = True
-                            break
-                
-                if pid_updated:
-                    # Update Excel with approval status
-                    self.main_window.update_excel(pid_match, node_match)
-                    # Stop the timer since we found a successful status
-                    if hasattr(self.main_window, 'timer'):
-                        self.main_window.timer.stop()
-                
+                self.apply_approval(record.pid, record.node)
             except Exception as e:
                 print(f"Error updating Excel: {str(e)}")
                 traceback.print_exc()
 
+    @diagnostics.timed("bridge.apply_approval")
+    def apply_approval(self, pid, node):
+        pid = normalize_pid(pid)
+        # Find matching PID input field or first empty one
+        pid_updated = False
+        for i, pid_input in enumerate(self.main_window.pid_inputs):
+            if normalize_pid(pid_input.text()) == pid:
+                # Update the corresponding node input
+                self.main_window.node_inputs[i].setText(node)
+                # The row's Build State also depends on its other PIDs
+                self.main_window.refresh_form_build_state({pid: APPROVED})
+                pid_updated = True
+                break
+
+        # A PID already saved on some row is written there; only new PIDs go into the form
+        workbooks = self.main_window.workbooks
+        if workbooks and workbooks.locate(pid):
+            self.main_window.update_excel(pid, node)
+            return
+
+        # If no match found, fill the first empty PID field
+        if not pid_updated:
+            for i, pid_input in enumerate(self.main_window.pid_inputs):
+                if not pid_input.text().strip():
+                    pid_input.setText(pid)
+                    self.main_window.node_inputs[i].setText(node)
+                    self.main_window.refresh_form_build_state({pid: APPROVED})
+                    pid_updated = True
+                    break
+
+        if pid_updated:
+            # Update Excel with approval status
+            self.main_window.update_excel(pid, node)
+
+class DiagnosticsPanel(QWidget):
+    """Live table of the hot-path timers (see nodeaudit.diagnostics), with reset and export"""
+    COLUMNS = [("Timer", "name"), ("Count", "count"), ("Mean ms", "mean_ms"), ("p50 ms", "p50_ms"),
+               ("p90 ms", "p90_ms"), ("p99 ms", "p99_ms"), ("Max ms", "max_ms"), ("Total ms", "total_ms")]
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Diagnostics")
+        self.resize(760, 360)
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        buttons = QHBoxLayout()
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        buttons.addWidget(reset_button)
+        export_button = QPushButton("Export...")
+        export_button.clicked.connect(self.export)
+        buttons.addWidget(export_button)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+        # Refresh only while the panel is on screen
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        stats = diagnostics.snapshot()
+        self.table.setRowCount(len(stats))
+        for row, timer in enumerate(stats):
+            for col, (_, key) in enumerate(self.COLUMNS):
+                value = timer[key]
+                item = QTableWidgetItem(f"{value:.2f}" if isinstance(value, float) else str(value))
+                if col:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def reset(self):
+        diagnostics.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timings", "nodeaudit_timings.json",
+                                              "JSON (*.json);;CSV (*.csv)")
+        if path:
+            try:
+                diagnostics.dump(path)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to export timings: {str(e)}")
+
+class DashboardPanel(QWidget):
+    """Rows per Build State and Config over the loaded workbooks (see nodeaudit.audit_summary), with export"""
+    COLUMNS = ["Field", "Value", "Rows", "%"]
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWindowTitle("Audit Progress")
+        self.resize(520, 420)
+        layout = QVBoxLayout()
+        self.totals_label = QLabel("")
+        layout.addWidget(self.totals_label)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        export_button = QPushButton("Export...")
+        export_button.clicked.connect(self.export)
+        layout.addWidget(export_button)
+        self.setLayout(layout)
+        # The counts are kept current by every write; the table just re-reads them while shown
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        workbooks = self.main_window.workbooks
+        if not workbooks:
+            self.totals_label.setText("No file loaded.")
+            self.table.setRowCount(0)
+            return
+        total = workbooks.summary()["total"]
+        rows = total["rows"]
+        self.totals_label.setText(f"{workbooks.label}: {rows} rows, {total['incomplete']} still needing work")
+        lines = [(field, value, count) for field, counts in total["fields"].items()
+                 for value, count in ordered_counts(field, counts)]
+        self.table.setRowCount(len(lines))
+        for row, (field, value, count) in enumerate(lines):
+            percent = f"{100.0 * count / rows:.1f}" if rows else "0.0"
+            for col, text in enumerate((field, value, str(count), percent)):
+                item = QTableWidgetItem(text)
+                if col >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def export(self):
+        workbooks = self.main_window.workbooks
+        if not workbooks:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Audit Summary", "audit_summary.csv",
+                                              "CSV (*.csv);;JSON (*.json)")
+        if path:
+            try:
+                write_report(workbooks.summary(), path)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to export summary: {str(e)}")
+
+class ReconcileWorker(QThread):
+    """Fetches PRISM pages for a list of PIDs off the UI thread"""
+    progress = pyqtSignal(int, int)
+    done = pyqtSignal(object, object, float)
+
+    def __init__(self, pids, fetcher, concurrency):
+        super().__init__()
+        self.pids = pids
+        self.fetcher = fetcher
+        self.concurrency = concurrency
+
+    def run(self):
+        started = time.perf_counter()
+        records, errors = fetch_statuses(self.pids, self.fetcher, self.concurrency, self.progress.emit,
+                                         self.isInterruptionRequested)
+        self.done.emit(records, errors, time.perf_counter() - started)
+
+class PageBridge(QObject):
+    """Web channel object for one pooled page; hands the observer's records to the pool"""
+    def __init__(self, pool, slot):
+        super().__init__()
+        self.pool = pool
+        self.slot = slot
+
+    @pyqtSlot('QVariantList')
+    def receiveRecords(self, messages):
+        self.pool.page_records(self.slot, [record_from_message(message) for message in messages])
+
+class PoolPage:
+    """A hidden QWebEnginePage with its own channel, Bridge and timeout timer"""
+    def __init__(self, pool, slot):
+        from PyQt5.QtWebEngineWidgets import QWebEnginePage
+        from PyQt5.QtWebChannel import QWebChannel
+        self.page = QWebEnginePage(pool.profile, pool)
+        self.bridge = PageBridge(pool, slot)
+        self.channel = QWebChannel(self.page)
+        self.channel.registerObject('bridge', self.bridge)
+        self.page.setWebChannel(self.channel)
+        self.page.scripts().insert(make_observer_script())
+        self.page.loadFinished.connect(lambda ok: pool.load_finished(slot, ok))
+        self.timer = QTimer(self.page)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(lambda: pool.timed_out(slot))
+        # Bumped per job so late toHtml callbacks from an earlier job are ignored
+        self.generation = 0
+        self.settling = False
+        self.load_failed = False
+        self.started = 0.0
+
+    def close(self):
+        self.timer.stop()
+        self.page.deleteLater()
+
+class PagePool(QObject):
+    """Hidden pages sharing the Design Review profile (and so its SSO login) that load PRISM pages in parallel.
+
+    Jobs are (pid, url) pairs queued under a tag; each result is emitted as
+    soon as its page reports it: ``record_ready(tag, pid, record)`` or
+    ``failed(tag, pid, error)``. A page is replaced by a fresh one after
+    ``recycle_after`` loads so renderer memory stays bounded.
+    """
+    record_ready = pyqtSignal(str, str, object)
+    failed = pyqtSignal(str, str, str)
+
+    def __init__(self, profile, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT,
+                 recycle_after=DEFAULT_RECYCLE_AFTER, parent=None):
+        super().__init__(parent)
+        self.profile = profile
+        self.timeout = timeout
+        self.scheduler = PoolScheduler(size, recycle_after)
+        self.pages = [PoolPage(self, slot) for slot in range(size)]
+
+    def submit(self, tag, jobs):
+        queued = self.scheduler.submit(tag, jobs)
+        self.pump()
+        return queued
+
+    def cancel(self, tag):
+        return self.scheduler.cancel(tag)
+
+    def pending(self, tag=None):
+        return self.scheduler.pending(tag)
+
+    def pump(self):
+        for slot, job in self.scheduler.assign():
+            page = self.pages[slot]
+            page.generation += 1
+            page.settling = False
+            page.load_failed = False
+            page.started = time.perf_counter()
+            page.timer.start(int(self.timeout * 1000))
+            page.page.setUrl(QUrl(job.url))
+
+    def page_records(self, slot, records):
+        job = self.scheduler.job(slot)
+        if job is None:
+            return
+        for record in records:
+            if normalize_pid(record.pid) == job.pid:
+                self.complete(slot, record=record)
+                return
+
+    def load_finished(self, slot, ok):
+        page = self.pages[slot]
+        if self.scheduler.job(slot) is None:
+            return
+        # A navigation cut short (by a redirect or by Stop) also reports failure; only the timeout gives up on it
+        page.load_failed = not ok
+        if not ok:
+            return
+        generation = page.generation
+        page.page.toHtml(lambda html: self.page_html(slot, generation, html))
+        if not page.settling:
+            # SSO and script redirects load again; give the observer a moment before giving up
+            page.settling = True
+            page.timer.start(int(SETTLE_SECONDS * 1000))
+
+    def page_html(self, slot, generation, html):
+        if self.pages[slot].generation == generation and self.scheduler.job(slot) is not None:
+            self.page_records(slot, extract_records(html))
+
+    def timed_out(self, slot):
+        page = self.pages[slot]
+        job = self.scheduler.job(slot)
+        if job is None:
+            return
+        if not page.settling:
+            self.complete(slot, error="page failed to load" if page.load_failed else f"timed out after {self.timeout}s")
+        elif page.page.url().host() != QUrl(job.url).host():
+            self.complete(slot, error=f"ended on {page.page.url().host()} – sign in in the Design Review browser")
+        else:
+            # Loaded the design page but it names no design for this PID
+            self.complete(slot, record=PrismRecord(job.pid))
+
+    def complete(self, slot, record=None, error=None):
+        from PyQt5.QtWebEngineWidgets import QWebEnginePage
+        page = self.pages[slot]
+        page.timer.stop()
+        page.page.triggerAction(QWebEnginePage.Stop)
+        page.generation += 1
+        if diagnostics.enabled:
+            diagnostics.record("pool.page_load", time.perf_counter() - page.started)
+        job, recycle = self.scheduler.finish(slot)
+        if recycle:
+            page.close()
+            self.pages[slot] = PoolPage(self, slot)
+        if error is None:
+            self.record_ready.emit(job.tag, job.pid, record)
+        else:
+            self.failed.emit(job.tag, job.pid, error)
+        self.pump()
+
+    def close(self):
+        for tag in {job.tag for job in self.scheduler.queue}:
+            self.scheduler.cancel(tag)
+        for page in self.pages:
+            page.close()
+        self.pages = []
+
+class IOWorker(QObject):
+    """Runs workbook I/O on one background thread, strictly in submission order"""
+    finished = pyqtSignal(object, object, object)  # on_done, result, error
+    progress = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nodeaudit-io")
+        self.pending = 0
+        # Emitted from the worker thread, delivered on the UI thread
+        self.finished.connect(self._deliver)
+
+    def submit(self, fn, *args, on_done=None):
+        self.pending += 1
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(lambda f: self.finished.emit(on_done, *self._outcome(f)))
+        return future
+
+    @staticmethod
+    def _outcome(future):
+        error = future.exception()
+        if error is not None:
+            return None, error
+        return future.result(), None
+
+    def _deliver(self, on_done, result, error):
+        self.pending -= 1
+        if on_done:
+            on_done(result, error)
+
+    def wait(self):
+        """Block until every job submitted so far has run"""
+        self.executor.submit(lambda: None).result()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+def open_workbooks(file_paths, progress, all_sheets=False):
+    """Runs on the I/O thread: scan the audit sheets for navigation and open the write sessions.
+
+    Each workbook's active sheet, or with ``all_sheets`` every sheet with a PID column.
+    """
+    with startup.step("import openpyxl"):
+        from nodeaudit.workbook_set import WorkbookSet, expand_sources
+    sources = expand_sources(file_paths, all_sheets=all_sheets)
+
+    def report(done, total, rows):
+        if rows is not None:
+            progress(f"⏳ Loading {os.path.basename(file_paths[0])}: {rows} rows")
+        else:
+            progress(f"⏳ Loading sheets: {done}/{total}")
+
+    # Also replays saves that never made it into the files last time (crash, kill, power loss)
+    return WorkbookSet.open(sources, progress=report)
+
 class ExcelAutomationApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Excel Automation App")
         self.setGeometry(100, 100, 800, 500)  # Increased window size
-        
-        # Initialize WebChannel for JavaScript-Python communication
-        self.channel = QWebChannel()
+        settings = load_settings()
+        if settings.get("window_geometry"):
+            self.restoreGeometry(QByteArray.fromHex(settings["window_geometry"].encode("ascii")))
         
         # Set up theme
-        self.setup_theme()
+        self.setup_theme(settings.get("dark_mode", False))
 
         # Layout
         layout = QGridLayout()
@@ -91,6 +616,9 @@ class ExcelAutomationApp(QMainWindow):
         
         self.browser_dropdown = QComboBox()
         self.browser_dropdown.addItems(["Edge", "Chrome"])
+        if settings.get("browser") in ("Edge", "Chrome"):
+            self.browser_dropdown.setCurrentText(settings["browser"])
+        self.browser_dropdown.currentTextChanged.connect(self.save_browser_choice)
         layout.addWidget(self.browser_dropdown, 0, 1)
 
         self.open_browser_button = QPushButton("Open Browser")
@@ -100,7 +628,17 @@ class ExcelAutomationApp(QMainWindow):
         # Second row - Excel controls
         self.load_button = QPushButton("Load Excel File")
         self.load_button.clicked.connect(self.load_excel)
-        layout.addWidget(self.load_button, 1, 0, 1, 3)  # Span 3 columns
+        layout.addWidget(self.load_button, 1, 0, 1, 2)  # Span 2 columns
+
+        # Off: each workbook's active sheet; on: every sheet with a PID column
+        self.all_sheets_checkbox = QCheckBox("All sheets")
+        self.all_sheets_checkbox.setChecked(bool(settings.get("all_sheets")))
+        self.all_sheets_checkbox.toggled.connect(self.save_all_sheets_choice)
+        layout.addWidget(self.all_sheets_checkbox, 1, 2)
+
+        self.reconcile_button = QPushButton("Reconcile All PIDs")
+        self.reconcile_button.clicked.connect(self.reconcile_all_pids)
+        layout.addWidget(self.reconcile_button, 1, 3)
 
         # PID Inputs - Start from row 2
         self.pid_inputs = [QLineEdit() for _ in range(4)]
@@ -139,6 +677,8 @@ class ExcelAutomationApp(QMainWindow):
         self.build_state_dropdown.addItems(["In Design", "In Progress", "Does Not Exist", "PRO-I", "Design Approved"])
         self.build_state_dropdown.setMinimumWidth(180)
         self.build_state_dropdown.setMaximumWidth(180)
+        # What the dropdown showed when the row was loaded; anything else is the operator's choice
+        self.loaded_build_state = self.build_state_dropdown.currentText()
         config_build_row.addWidget(self.build_state_dropdown)
 
         layout.addLayout(config_build_row, 6, 0, 1, 4)
@@ -179,6 +719,43 @@ class ExcelAutomationApp(QMainWindow):
         self.current_row_label = QLabel("Current Row: N/A")
         layout.addWidget(self.current_row_label, 11, 0, 1, 4)  # Span all columns
 
+        # Jump to rows still missing a PID, Node or Build State
+        self.next_incomplete_button = QPushButton("Next Incomplete")
+        self.next_incomplete_button.clicked.connect(self.load_next_incomplete)
+        layout.addWidget(self.next_incomplete_button, 12, 0)
+
+        self.resume_button = QPushButton("Resume")
+        self.resume_button.clicked.connect(self.resume_session)
+        self.resume_button.setEnabled(find_session(settings) is not None)
+        layout.addWidget(self.resume_button, 12, 1)
+
+        self.dashboard_panel = None
+        self.dashboard_button = QPushButton("Dashboard")
+        self.dashboard_button.clicked.connect(self.open_dashboard)
+        layout.addWidget(self.dashboard_button, 12, 2)
+
+        # Search over every PID, Node and Magellan cell; Enter or a click opens the row
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search PID / Node / Magellan")
+        self.search_input.textChanged.connect(self.search_changed)
+        self.search_input.returnPressed.connect(self.open_first_search_result)
+        layout.addWidget(self.search_input, 13, 0, 1, 4)
+
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.itemActivated.connect(self.open_search_result)
+        self.search_results.itemClicked.connect(self.open_search_result)
+        self.search_results.hide()
+        layout.addWidget(self.search_results, 14, 0, 1, 4)
+
+        # Timing panel: always on Ctrl+Shift+D, plus a button when started with --diagnostics
+        self.diagnostics_panel = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.open_diagnostics)
+        if diagnostics.enabled:
+            self.diagnostics_button = QPushButton("Diagnostics")
+            self.diagnostics_button.clicked.connect(self.open_diagnostics)
+            layout.addWidget(self.diagnostics_button, 12, 3)
+
         # Main Widget
         container = QWidget()
         container.setLayout(layout)
@@ -186,6 +763,41 @@ class ExcelAutomationApp(QMainWindow):
 
         # Placeholder for Excel file path
         self.excel_file_path = None
+        self.excel_files = []
+        self.loaded_all_sheets = False
+        self.workbooks = None
+        self.current_row = None
+        # Row last written to the session in settings.json
+        self.session_row = None
+        self.prism_cache = None
+        # PRISM look-ahead for the rows after the current one; interrupted workers
+        # stay referenced until their in-flight requests return
+        self.prefetch_worker = None
+        self.prefetch_workers = []
+        self.prefetch_tried = set()
+        # Read here and when they change, not on every row load
+        self.apply_prefetch_settings(settings)
+        # Design Review browser profile, created on first "Open Browser"
+        self.browser_profile = None
+        # Hidden pages on that profile for PRISM lookups, and the reconcile run they are serving
+        self.page_pool = None
+        self.pool_reconcile = None
+
+        # All workbook parsing and saving happens on this thread
+        self.io = IOWorker()
+        self.io.progress.connect(self.status_label.setText)
+        # Saved rows waiting for the I/O thread; consecutive saves share one job
+        self.pending_writes = {}
+        self.pending_seqs = {}
+        self.write_job_queued = False
+        self.pending_writes_lock = threading.Lock()
+        self.asking_overwrite = False
+
+        # Periodically write out rows saved since the last flush
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.schedule_flush)
+        self.flush_timer.timeout.connect(self.save_session)
+        self.flush_timer.start(5000)
 
     def setup_theme(self, dark_mode=False):
         app = QApplication.instance()
@@ -278,93 +890,387 @@ class ExcelAutomationApp(QMainWindow):
         msg.exec_()
 
     def load_excel(self):
-        # Open file dialog to select Excel file
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open Excel File", "", "Excel Files (*.xlsx *.xls)")
-        if file_path:
+        # Open file dialog to select one or more Excel files
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Open Excel Files", "", "Excel Files (*.xlsx *.xls)")
+        if file_paths:
+            self.open_files(file_paths)
+
+    def open_files(self, file_paths, resume=False, all_sheets=None):
+        if all_sheets is None:
+            all_sheets = self.all_sheets_checkbox.isChecked()
+        if file_paths:
             try:
-                # Try to load the workbook to check if it's valid
-                workbook = load_workbook(file_path, read_only=True)
-                workbook.close()
-                
-                self.excel_file_path = file_path
-                self.status_label.setText(f"Loaded: {file_path}")
-                self.show_dark_messagebox(QMessageBox.Information, "Excel Loaded", f"Loaded: {os.path.basename(file_path)}")
+                # Write out anything still pending for the previous workbooks
+                if self.workbooks and not self.flush_workbook(immediate=True):
+                    return
+                self.save_session()
+                if self.workbooks:
+                    self.workbooks.close(flush=False)
+                    self.workbooks = None
+                    self.excel_file_path = None
+                self.current_row = self.session_row = None
+                self.search_input.clear()
+                self.stop_prefetch()
+
+                # One streaming pass per sheet feeds row navigation (in parallel for
+                # several sheets); a workbook is fully parsed only once something is written
+                self.load_button.setEnabled(False)
+                self.status_label.setText(f"⏳ Loading {', '.join(os.path.basename(path) for path in file_paths)}...")
+                self.io.submit(open_workbooks, file_paths, self.io.progress.emit, all_sheets,
+                               on_done=lambda result, error: self.excel_loaded(file_paths, result, error, resume,
+                                                                               all_sheets))
             except Exception as e:
                 self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to load Excel file: {str(e)}")
 
+    def excel_loaded(self, file_paths, result, error, resume=False, all_sheets=False):
+        self.load_button.setEnabled(True)
+        if error is not None:
+            self.status_label.setText("No file loaded.")
+            self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to load Excel file: {str(error)}")
+            return
+        self.workbooks = result
+        self.loaded_all_sheets = all_sheets
+
+        file_path = file_paths[0]
+        self.excel_file_path = file_path
+        self.excel_files = [os.path.abspath(path) for path in file_paths]
+        if len(self.workbooks.parts) == 1:
+            self.status_label.setText(f"Loaded: {file_path}")
+            self.show_dark_messagebox(QMessageBox.Information, "Excel Loaded", f"Loaded: {os.path.basename(file_path)}")
+        else:
+            sheets = "\n".join(f"{part.label}: rows {part.to_global(2)}–{part.to_global(part.navigator.max_row)}"
+                                for part in self.workbooks.parts)
+            self.status_label.setText(f"Loaded: {self.workbooks.label}")
+            self.show_dark_messagebox(QMessageBox.Information, "Excel Loaded", f"Loaded {self.workbooks.label}:\n{sheets}")
+        replayed, stale = self.workbooks.replayed, self.workbooks.stale
+        if replayed or stale:
+            message = f"Recovered {replayed} unsaved change(s) from the last session."
+            if stale:
+                message += f"\n{stale} older change(s) were skipped because the file was saved after them."
+            self.show_dark_messagebox(QMessageBox.Information, "Recovered Changes", message)
+
+        # Tell the operator now which fields can't be saved, not after they type a row
+        problems = self.workbooks.problems()
+        if problems:
+            self.show_dark_messagebox(QMessageBox.Warning, "Column Check", problems)
+
+        duplicates = self.workbooks.duplicates()
+        if duplicates:
+            lines = [f"{pid}: rows {', '.join(map(str, rows))}" for pid, rows in sorted(duplicates.items())[:10]]
+            if len(duplicates) > 10:
+                lines.append(f"...and {len(duplicates) - 10} more")
+            self.show_dark_messagebox(QMessageBox.Warning, "Duplicate PIDs",
+                                      f"{len(duplicates)} PID(s) appear on more than one row:\n" + "\n".join(lines))
+
+        # Pick up where the last session on these files left off
+        session = find_session(load_settings(), file_path)
+        # Row numbers only carry over when the same sheets are open
+        if session and session["files"] == self.excel_files and session.get("all_sheets", False) == all_sheets:
+            row = session.get("current_row")
+            if row and 2 <= row <= self.workbooks.max_row:
+                self.session_row = row
+                if resume:
+                    # Resume goes on to the first row from there that still needs work
+                    row = self.workbooks.next_incomplete(row - 1) or row
+                self.show_row(row, "Resumed at row" if resume else "Restored row")
+
+    def queue_row_write(self, row, cells, kind="row"):
+        """Journal a row's {column: value} cells and hand them to the I/O thread.
+
+        The journal append is what makes the save durable; the workbook is
+        written later. Saves made while an earlier write job is still queued
+        are merged into it, so a burst of Save & Next clicks costs one job and
+        one flush check.
+        """
+        journaled = self.workbooks.append_journal(kind, row, cells)
+        with self.pending_writes_lock:
+            self.pending_writes.setdefault(row, {}).update(cells)
+            if journaled:
+                path, seq = journaled
+                self.pending_seqs[path] = seq
+            if self.write_job_queued:
+                return
+            self.write_job_queued = True
+        self.io.submit(self.write_rows_job, self.workbooks, on_done=self.rows_written)
+
+    def write_rows_job(self, workbooks):
+        # Runs on the I/O thread
+        with self.pending_writes_lock:
+            writes = self.pending_writes
+            seqs = self.pending_seqs
+            self.pending_writes = {}
+            self.pending_seqs = {}
+            self.write_job_queued = False
+        with diagnostics.timer("cells.write"):
+            for row, cells in writes.items():
+                for col_idx, value in cells.items():
+                    workbooks.write_cell(row, col_idx, value)
+        # The next flush, whenever it happens, makes these journal entries redundant
+        workbooks.mark_applied(seqs)
+        workbooks.maybe_flush()
+        return max(writes), workbooks.pending
+
+    def rows_written(self, result, error):
+        if error is not None:
+            self.io_error(error)
+            return
+        row, pending = result
+        if pending:
+            self.status_label.setText(f"Saved row {row} ({pending} row(s) pending write)")
+
+    def schedule_flush(self):
+        if self.workbooks:
+            self.io.submit(self.workbooks.maybe_flush, on_done=lambda result, error: error and self.io_error(error))
+
+    def io_error(self, error):
+        from nodeaudit.workbook_session import ExternalModificationError
+        if isinstance(error, ExternalModificationError):
+            self.confirm_overwrite(error)
+        else:
+            traceback.print_exception(type(error), error, error.__traceback__)
+            self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to save workbook: {str(error)}")
+
+    def confirm_overwrite(self, error):
+        # The flush timer keeps failing until the user answers; ask only once
+        if self.asking_overwrite or not self.workbooks:
+            return
+        self.asking_overwrite = True
+        try:
+            reply = QMessageBox.question(
+                self, "Workbook Changed",
+                f"{error}.\n"
+                f"Overwrite with your {self.workbooks.pending} unsaved row(s)?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        finally:
+            self.asking_overwrite = False
+        if reply != QMessageBox.Yes:
+            self.status_label.setText(f"⚠️ {self.workbooks.pending} row(s) not written – file changed on disk")
+            return
+        self.status_label.setText("⏳ Writing workbook...")
+        self.io.submit(self.workbooks.flush, True, on_done=self.overwrite_done)
+
+    def overwrite_done(self, result, error):
+        if error is not None:
+            self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to save workbook: {str(error)}")
+        else:
+            self.status_label.setText("Workbook saved.")
+
+    def flush_workbook(self, immediate=False):
+        """Wait for the I/O thread, then write pending rows now (or when due).
+
+        Used where the caller has to know the outcome, like switching files or
+        quitting. Returns False if there are still unsaved rows afterwards.
+        """
+        if not self.workbooks:
+            return True
+        self.io.wait()
+        if not self.workbooks.pending:
+            return True
+        from nodeaudit.workbook_session import ExternalModificationError
+        try:
+            if immediate:
+                self.workbooks.flush()
+            else:
+                self.workbooks.maybe_flush()
+        except ExternalModificationError as error:
+            reply = QMessageBox.question(
+                self, "Workbook Changed",
+                f"{error}.\n"
+                f"Overwrite with your {self.workbooks.pending} unsaved row(s)?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                self.status_label.setText(f"⚠️ {self.workbooks.pending} row(s) not written – file changed on disk")
+                return False
+            try:
+                self.workbooks.flush(force=True)
+            except Exception as e:
+                self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to save workbook: {str(e)}")
+                return False
+        except Exception as e:
+            self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to save workbook: {str(e)}")
+            traceback.print_exc()
+            return False
+        return not self.workbooks.pending
+
+    def closeEvent(self, event):
+        if getattr(self, 'reconcile_worker', None) and self.reconcile_worker.isRunning():
+            self.reconcile_worker.requestInterruption()
+            self.reconcile_worker.wait()
+        self.stop_prefetch()
+        for worker in list(self.prefetch_workers):
+            worker.wait()
+        self.pool_reconcile = None
+        if self.page_pool is not None:
+            self.page_pool.cancel("reconcile")
+        if not self.flush_workbook(immediate=True):
+            reply = QMessageBox.question(
+                self, "Unsaved Rows", "Some rows were not written to the workbook. Quit anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+        self.release_browser()
+        self.save_session()
+        settings = load_settings()
+        settings["window_geometry"] = bytes(self.saveGeometry().toHex()).decode("ascii")
+        try:
+            save_settings(settings)
+        except OSError:
+            traceback.print_exc()
+        if self.workbooks:
+            self.workbooks.close(flush=False)
+        self.io.shutdown()
+        if self.prism_cache is not None:
+            self.prism_cache.close()
+        if diagnostics.enabled:
+            try:
+                diagnostics.append_log(os.path.join(app_dir(), "diagnostics.jsonl"))
+            except OSError:
+                traceback.print_exc()
+        if self.diagnostics_panel is not None:
+            self.diagnostics_panel.close()
+        if self.dashboard_panel is not None:
+            self.dashboard_panel.close()
+        event.accept()
+
+    def reconcile_all_pids(self):
+        """Look up every PID in the sheet on PRISM and write all results in one save"""
+        if not self.workbooks:
+            self.status_label.setText("No Excel file loaded.")
+            return
+        settings = load_settings()
+        url_template = settings.get("prism_url_template")
+        if not url_template:
+            url_template, ok = QInputDialog.getText(
+                self, "PRISM URL", "Design page URL for a PID (use {pid} where the PID goes):")
+            if not ok or "{pid}" not in url_template:
+                return
+            settings["prism_url_template"] = url_template
+            save_settings(settings)
+            self.apply_prefetch_settings(settings)
+
+        self.reconcile_workbooks = workbooks = self.workbooks
+        self.reconcile_button.setEnabled(False)
+        self.status_label.setText("⏳ Collecting PIDs...")
+        self.io.submit(workbooks.pid_locations,
+                       on_done=lambda locations, error: self.start_reconcile(locations, error, url_template, settings))
+
+    def start_reconcile(self, locations, error, url_template, settings):
+        if error is not None or not locations or self.workbooks is not self.reconcile_workbooks:
+            self.reconcile_button.setEnabled(True)
+            self.status_label.setText(f"Failed to read PIDs: {error}" if error else "No PIDs found in the sheet.")
+            return
+        self.reconcile_locations = locations
+        fetcher = PrismFetcher(url_template, cache=self.get_prism_cache())
+        pool = self.get_page_pool()
+        if pool is not None:
+            self.start_pool_reconcile(pool, fetcher)
+            return
+        concurrency = settings.get("prism_concurrency", DEFAULT_CONCURRENCY)
+        self.reconcile_worker = ReconcileWorker(list(self.reconcile_locations), fetcher, concurrency)
+        self.reconcile_worker.progress.connect(
+            lambda done, total: self.status_label.setText(f"Reconciling PIDs: {done}/{total}"))
+        self.reconcile_worker.done.connect(
+            lambda records, errors, elapsed: self.reconcile_finished(records, errors, elapsed, fetcher.cache_hits))
+        self.reconcile_worker.start()
+
+    def start_pool_reconcile(self, pool, fetcher):
+        """Reconcile through the hidden browser pages, which carry the operator's PRISM login"""
+        pids = list(self.reconcile_locations)
+        cached = fetcher.cache.get_many(pids)
+        pending = [pid for pid in pids if pid not in cached]
+        self.pool_reconcile = {"pending": set(pending), "records": dict(cached), "errors": {},
+                               "total": len(pids), "cache_hits": len(cached), "started": time.perf_counter()}
+        pool.submit("reconcile", [(pid, fetcher.url_for(pid)) for pid in pending])
+        self.pool_reconcile_progress()
+
+    def pool_reconcile_progress(self, pid=None, record=None, error=None):
+        run = self.pool_reconcile
+        if run is None or (pid is not None and pid not in run["pending"]):
+            return
+        if pid is not None:
+            run["pending"].discard(pid)
+            if error is None:
+                run["records"][pid] = record
+            else:
+                run["errors"][pid] = error
+        self.status_label.setText(f"Reconciling PIDs: {run['total'] - len(run['pending'])}/{run['total']}")
+        if not run["pending"]:
+            self.pool_reconcile = None
+            self.reconcile_finished(run["records"], run["errors"], time.perf_counter() - run["started"],
+                                    run["cache_hits"])
+
+    def reconcile_finished(self, records, errors, elapsed, cache_hits):
+        if self.workbooks is not self.reconcile_workbooks:
+            self.reconcile_button.setEnabled(True)
+            self.status_label.setText("Workbook changed during reconciliation – PRISM results discarded")
+            return
+        workbooks = self.workbooks
+        locations = self.reconcile_locations
+
+        def apply_and_flush():
+            rows_updated = apply_results(workbooks, locations, records)
+            workbooks.flush()
+            return rows_updated
+
+        self.status_label.setText("⏳ Writing PRISM results...")
+        self.io.submit(apply_and_flush, on_done=lambda rows_updated, error: self.reconcile_applied(
+            ReconcileReport(len(locations), records, errors, rows_updated or 0, elapsed, cache_hits), error))
+
+    def reconcile_applied(self, report, error):
+        self.reconcile_button.setEnabled(True)
+        if error is not None:
+            self.io_error(error)
+            return
+        self.status_label.setText(str(report))
+        self.show_dark_messagebox(QMessageBox.Information, "PRISM Reconciliation", str(report))
+
     def save_next_action(self):
         if not self.excel_file_path:
             self.status_label.setText("No Excel file loaded.")
             return
 
         try:
-            workbook = load_workbook(self.excel_file_path)
-            sheet = workbook.active
-
-            headers = [cell.value for cell in sheet[1]]
-
             # Decide which row to write to
-            row = self.current_row if self.current_row else sheet.max_row + 1
-
-            # Write PIDs
-            for i, pid_input in enumerate(self.pid_inputs):
-                col_name = f"PID {i+1}"
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    sheet.cell(row=row, column=col_idx).value = pid_input.text().strip().replace('\u00A0', '').replace('\u200B', '')
-
-            # Write Scope - Fix spacing issue in header name
-            for i, scope_input in enumerate(self.scope_inputs):
-                # Try both with single and double space
-                col_name1 = f"SCOPE {i+1}"
-                col_name2 = f"SCOPE  {i+1}"
-                if col_name1 in headers:
-                    col_idx = headers.index(col_name1) + 1
-                    sheet.cell(row=row, column=col_idx).value = scope_input.text().strip().replace('\u00A0', '').replace('\u200B', '')
-                elif col_name2 in headers:
-                    col_idx = headers.index(col_name2) + 1
-                    sheet.cell(row=row, column=col_idx).value = scope_input.text().strip().replace('\u00A0', '').replace('\u200B', '')
-
-            # Write Magellan - Fix spacing issue in header name
-            for i, mag_input in enumerate(self.magellan_inputs):
-                col_name1 = f"MAGELLAN {i+1}"
-                col_name2 = f"MAGELLAN  {i+1}"
-                if col_name1 in headers:
-                    col_idx = headers.index(col_name1) + 1
-                    sheet.cell(row=row, column=col_idx).value = mag_input.text().strip().replace('\u00A0', '').replace('\u200B', '')
-                elif col_name2 in headers:
-                    col_idx = headers.index(col_name2) + 1
-                    sheet.cell(row=row, column=col_idx).value = mag_input.text().strip().replace('\u00A0', '').replace('\u200B', '')
-
-            # Write NODE
-            for i, node_input in enumerate(self.node_inputs):
-                col_name = f"NODE {i+1}"
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    sheet.cell(row=row, column=col_idx).value = node_input.text().strip().replace('\u00A0', '').replace('\u200B', '')
-
-            # Try multiple possible column names for AOI NODE or CONFIG
-            config_value = self.config_dropdown.currentText().strip().replace('\u00A0', '').replace('\u200B', '')
-            for col_name in ["AOI NODE", "CONFIG", "NODE CONFIG"]:
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    sheet.cell(row=row, column=col_idx).value = config_value
-                    break
-
-            # Try multiple possible column names for NOTES or BUILD STATE
-            build_state_value = self.build_state_dropdown.currentText().strip().replace('\u00A0', '').replace('\u200B', '')
-            for col_name in ["NOTES", "BUILD STATE", "STATE"]:
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    sheet.cell(row=row, column=col_idx).value = build_state_value
-                    break
+            row = self.current_row if self.current_row else self.workbooks.max_row + 1
+            schema = self.workbooks.schema_at(row)
+
+            values = {}
+            for fields, inputs in ((PID_FIELDS, self.pid_inputs), (SCOPE_FIELDS, self.scope_inputs),
+                                   (MAGELLAN_FIELDS, self.magellan_inputs), (NODE_FIELDS, self.node_inputs)):
+                for field, field_input in zip(fields, inputs):
+                    values[field] = clean_value(field_input.text())
+
+            # Refuse to drop typed data on the floor when the sheet has no column for it
+            missing = [field for field, value in values.items() if value and field not in schema]
+            if missing:
+                self.show_dark_messagebox(QMessageBox.Warning, "Missing Columns",
+                                          "The sheet has no column for: " + ", ".join(missing) + "\nRow was not saved.")
+                return
 
-            # Update labels
-            self.last_node_label.setText(f"Last Node: {self.magellan_inputs[0].text()}")
-            self.current_row_label.setText(f"Current Row: {row}")
-            self.status_label.setText(f"Saved row {row}")
+            # Timed up to the confirmation box, which waits for the operator
+            with diagnostics.timer("ui.save_next"):
+                values[CONFIG] = clean_value(self.config_dropdown.currentText())
+                values[BUILD_STATE] = clean_value(self.build_state_dropdown.currentText())
+
+                # Navigation sees the new values right away; the I/O thread writes them
+                cells = {}
+                for field, value in values.items():
+                    col_idx = schema.column(field)
+                    if col_idx:
+                        self.workbooks.set_value(row, field, value)
+                        cells[col_idx] = value
+                self.queue_row_write(row, cells)
+
+                # Update labels
+                self.last_node_label.setText(f"Last Node: {self.magellan_inputs[0].text()}")
+                self.current_row_label.setText(f"Current Row: {self.row_label(row)}")
+                self.status_label.setText(f"Saved row {row}")
+                duplicated = [pid for _, pid in self.workbooks.row_pids(row)
+                              if any(other != row for other, _ in self.workbooks.locate(pid))]
+                if duplicated:
+                    self.status_label.setText(f"Saved row {row} – ⚠️ also on other rows: {', '.join(duplicated)}")
 
-            workbook.save(self.excel_file_path)
             self.show_dark_messagebox(QMessageBox.Information, "Saved", f"Row {row} saved successfully!")
 
             # Clear inputs
@@ -374,33 +1280,100 @@ class ExcelAutomationApp(QMainWindow):
 
             self.config_dropdown.setCurrentIndex(0)
             self.build_state_dropdown.setCurrentIndex(0)
+            self.loaded_build_state = self.build_state_dropdown.currentText()
 
-            # Move to next row
+            # Move to next row; one that already exists is shown with its values, blanks filled
+            # from the PRISM look-ahead
             self.current_row = row + 1
+            if self.current_row <= self.workbooks.max_row:
+                self.load_row_data()
+                self.prefetch_upcoming(self.current_row)
             
         except Exception as e:
             self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to save data: {str(e)}")
             traceback.print_exc()
 
+    def update_excel(self, pid, node):
+        """Write a PRISM approval to every row holding the PID, wherever it is in the sheet"""
+        if not self.workbooks:
+            return
+        cells_by_row = self.plan_approval(pid, node)
+        if not cells_by_row:
+            self.status_label.setText(f"⚠️ PID {pid} is not in the sheet yet – press Save & Next")
+            return
+        self.write_planned_cells(cells_by_row, kind="approval")
+        rows = sorted(cells_by_row)
+        if len(rows) > 1:
+            self.status_label.setText(f"⚠️ PID {pid} is on rows {', '.join(map(str, rows))} – approval written to all")
+        else:
+            self.status_label.setText(f"✅ Approval for PID {pid} written to row {rows[0]}")
+
+    def plan_approval(self, pid, node, cells_by_row=None, known=None):
+        """{row: {column: value}} for an approved PID: its node on every row holding it, and those rows' Build State.
+
+        The Build State folds all of a row's PIDs through row_build_state, taking
+        their statuses from ``known`` ({pid: status}) or the PRISM cache. A row
+        with a PID whose status isn't known only gets the node.
+        """
+        cells_by_row = {} if cells_by_row is None else cells_by_row
+        known = dict(known or {}, **{normalize_pid(pid): APPROVED})
+        for row, slot in self.workbooks.locate(pid):
+            schema = self.workbooks.schema_at(row)
+            state_col = schema.column(BUILD_STATE)
+            cells = cells_by_row.setdefault(row, {})
+            node_col = schema.column(NODE_FIELDS[slot])
+            if node_col:
+                cells[node_col] = clean_value(node)
+            if state_col:
+                statuses = self.known_statuses([other for _, other in self.workbooks.row_pids(row)], known)
+                if statuses:
+                    cells[state_col] = row_build_state(statuses)
+        return cells_by_row
+
+    def known_statuses(self, pids, known=None):
+        """PRISM statuses of ``pids`` from ``known`` ({pid: status}) or the cache; None if any isn't known"""
+        cache = self.get_prism_cache()
+        statuses = []
+        for pid in pids:
+            status = known.get(pid) if known else None
+            if status is None:
+                record = cache.get(pid)
+                if record is None:
+                    return None
+                # Same fallback as reconciliation for pages without a usable Design Status
+                status = record.status or IN_PROGRESS
+            statuses.append(status)
+        return statuses
+
+    def refresh_form_build_state(self, known=None):
+        """Set the form's Build State from its PIDs when every one of them has a known PRISM status"""
+        pids = [pid for pid in (normalize_pid(pid_input.text()) for pid_input in self.pid_inputs) if pid]
+        statuses = self.known_statuses(pids, known) if pids else None
+        if statuses:
+            self.set_build_state(row_build_state(statuses))
+
+    def write_planned_cells(self, cells_by_row, kind):
+        for row, cells in cells_by_row.items():
+            for col_idx, value in cells.items():
+                self.workbooks.cell_written(row, col_idx, value)
+            self.queue_row_write(row, cells, kind=kind)
+
     def load_previous_row(self):
         if not self.excel_file_path:
             self.status_label.setText("No Excel file loaded.")
             return
 
         try:
-            workbook = load_workbook(self.excel_file_path)
-            sheet = workbook.active
-
             if self.current_row is None:
-                self.current_row = sheet.max_row
+                self.current_row = self.workbooks.max_row
             else:
                 self.current_row = max(2, self.current_row - 1)
 
-            headers = [cell.value for cell in sheet[1]]
-            self.load_row_data(sheet, headers)
+            self.load_row_data()
+            self.prefetch_upcoming(self.current_row)
             
-            self.status_label.setText(f"Loaded previous row: {self.current_row}")
-            self.current_row_label.setText(f"Current Row: {self.current_row}")
+            self.status_label.setText(f"Loaded previous row: {self.row_label(self.current_row)}")
+            self.current_row_label.setText(f"Current Row: {self.row_label(self.current_row)}")
             
         except Exception as e:
             self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to load previous row: {str(e)}")
@@ -417,111 +1390,293 @@ class ExcelAutomationApp(QMainWindow):
             return
 
         try:
-            workbook = load_workbook(self.excel_file_path)
-            sheet = workbook.active
-
             if target_row == 1:
                 self.show_dark_messagebox(QMessageBox.Information, "Invalid Row", "Row 1 contains headers and cannot be edited.")
                 self.status_label.setText("Row 1 contains headers and cannot be edited.")
                 return
-            elif target_row < 2 or target_row > sheet.max_row:
+            elif target_row < 2 or target_row > self.workbooks.max_row:
                 self.status_label.setText("Row number out of range.")
                 return
 
             self.current_row = target_row
-            headers = [cell.value for cell in sheet[1]]
-            
-            self.load_row_data(sheet, headers)
+            self.load_row_data()
+            # The operator jumped: rows ahead of the old position aren't worth fetching any more
+            self.prefetch_upcoming(self.current_row, jump=True)
             
-            self.status_label.setText(f"Loaded row: {self.current_row}")
-            self.current_row_label.setText(f"Current Row: {self.current_row}")
+            self.status_label.setText(f"Loaded row: {self.row_label(self.current_row)}")
+            self.current_row_label.setText(f"Current Row: {self.row_label(self.current_row)}")
             
         except Exception as e:
             self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to load row {target_row}: {str(e)}")
 
-    def load_row_data(self, sheet, headers):
+    def show_row(self, row, message):
+        self.current_row = row
+        self.load_row_data()
+        self.prefetch_upcoming(row, jump=True)
+        text = f"{message}: {self.row_label(row)}"
+        missing = self.workbooks.missing(row)
+        if missing:
+            text += f" – missing {describe_missing(missing)}"
+        self.status_label.setText(text)
+        self.current_row_label.setText(f"Current Row: {self.row_label(row)}")
+
+    def load_next_incomplete(self):
+        if not self.excel_file_path:
+            self.status_label.setText("No Excel file loaded.")
+            return
+        row = self.workbooks.next_incomplete(self.current_row or 1)
+        if row is None:
+            self.status_label.setText("✅ Every row has its PIDs, Nodes and Build State.")
+            return
+        self.show_row(row, f"Next incomplete ({self.workbooks.incomplete_count} left)")
+
+    def resume_session(self):
+        """Reopen the last session's workbooks and go to the first row from its saved row that still needs work"""
+        session = find_session(load_settings())
+        if session is None:
+            self.status_label.setText("No saved session.")
+            return
+        files = session["files"]
+        all_sheets = session.get("all_sheets", False)
+        if self.workbooks and self.excel_files == files and self.loaded_all_sheets == all_sheets:
+            row = self.workbooks.next_incomplete((self.current_row or 2) - 1)
+            if row is not None:
+                self.show_row(row, "Resumed at row")
+            return
+        missing = [path for path in files if not os.path.exists(path)]
+        if missing:
+            self.show_dark_messagebox(QMessageBox.Warning, "Resume", "Workbook not found:\n" + "\n".join(missing))
+            return
+        self.open_files(files, resume=True, all_sheets=all_sheets)
+
+    def search_changed(self, text):
+        self.search_results.clear()
+        hits = self.workbooks.search(text) if self.workbooks and text.strip() else []
+        for row, field, value in hits:
+            item = QListWidgetItem(f"{value}   {field}, row {self.row_label(row)}")
+            item.setData(Qt.UserRole, row)
+            self.search_results.addItem(item)
+        self.search_results.setVisible(bool(hits))
+        if text.strip() and self.workbooks and not hits:
+            self.status_label.setText(f"No PID, Node or Magellan matches \"{text.strip()}\"")
+
+    def open_first_search_result(self):
+        if self.search_results.count():
+            self.open_search_result(self.search_results.item(0))
+
+    def open_search_result(self, item):
+        self.show_row(item.data(Qt.UserRole), "Search result row")
+
+    def save_session(self):
+        """Store the current workbooks and row in settings.json when the row has moved"""
+        if not self.excel_file_path or self.current_row is None or self.current_row == self.session_row:
+            return
+        try:
+            save_settings(remember_session(load_settings(), self.excel_files, self.current_row,
+                                           self.loaded_all_sheets))
+        except OSError:
+            traceback.print_exc()
+            return
+        self.session_row = self.current_row
+        self.resume_button.setEnabled(True)
+
+    def save_browser_choice(self, browser):
+        settings = load_settings()
+        settings["browser"] = browser
+        save_settings(settings)
+
+    def save_all_sheets_choice(self, checked):
+        settings = load_settings()
+        settings["all_sheets"] = checked
+        save_settings(settings)
+
+    def row_label(self, row):
+        # With several sheets loaded, say which file and sheet a unified row number is in
+        if self.workbooks and len(self.workbooks.parts) > 1:
+            return f"{row} ({self.workbooks.describe(row)})"
+        return str(row)
+
+    @diagnostics.timed("ui.load_row")
+    def load_row_data(self):
         """Helper method to load data from the current row into the input fields"""
+        values = self.workbooks.row(self.current_row)
+
         # Load values back into input fields
-        for i in range(4):
-            # Get PID values
-            for col_name in [f"PID {i+1}"]:
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    self.pid_inputs[i].setText(str(sheet.cell(row=self.current_row, column=col_idx).value or ""))
-
-            # Get Scope values - try both spacing variants
-            for col_name in [f"SCOPE {i+1}", f"SCOPE  {i+1}"]:
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    self.scope_inputs[i].setText(str(sheet.cell(row=self.current_row, column=col_idx).value or ""))
-
-            # Get Magellan values - try both spacing variants
-            for col_name in [f"MAGELLAN {i+1}", f"MAGELLAN  {i+1}"]:
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    self.magellan_inputs[i].setText(str(sheet.cell(row=self.current_row, column=col_idx).value or ""))
-
-            # Get Node values
-            for col_name in [f"NODE {i+1}"]:
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    self.node_inputs[i].setText(str(sheet.cell(row=self.current_row, column=col_idx).value or ""))
-
-        # Try multiple column names for CONFIG
-        config_found = False
-        for config_col_name in ["CONFIG", "AOI NODE", "NODE CONFIG"]:
-            if config_col_name in headers:
-                col_idx = headers.index(config_col_name) + 1
-                config_value = sheet.cell(row=self.current_row, column=col_idx).value
-                if config_value in [self.config_dropdown.itemText(i) for i in range(self.config_dropdown.count())]:
-                    self.config_dropdown.setCurrentText(str(config_value))
-                    config_found = True
-                    break
+        for fields, inputs in ((PID_FIELDS, self.pid_inputs), (SCOPE_FIELDS, self.scope_inputs),
+                               (MAGELLAN_FIELDS, self.magellan_inputs), (NODE_FIELDS, self.node_inputs)):
+            for field, field_input in zip(fields, inputs):
+                if field in values:
+                    field_input.setText(str(values[field] or ""))
 
-        # Try multiple column names for BUILD STATE
-        state_found = False
-        for state_col_name in ["BUILD STATE", "NOTES", "STATE"]:
-            if state_col_name in headers:
-                col_idx = headers.index(state_col_name) + 1
-                state_value = sheet.cell(row=self.current_row, column=col_idx).value
-                if state_value:
-                    self.build_state_dropdown.setCurrentText(str(state_value))
-                    state_found = True
-                    break
+        config_value = values.get(CONFIG)
+        if config_value in [self.config_dropdown.itemText(i) for i in range(self.config_dropdown.count())]:
+            self.config_dropdown.setCurrentText(str(config_value))
+
+        state_value = values.get(BUILD_STATE)
+        if state_value:
+            self.build_state_dropdown.setCurrentText(str(state_value))
+        self.loaded_build_state = self.build_state_dropdown.currentText()
+
+        # Fill blanks from earlier PRISM lookups so the PID doesn't have to be scraped again
+        self.fill_from_prism_cache(state_value)
 
         # Update node label
         self.last_node_label.setText(f"Last Node: {self.magellan_inputs[0].text()}")
 
+    def fill_from_prism_cache(self, state_value=None):
+        """Fill blank Node fields, and Build State when the row has none, from cached PRISM results"""
+        cache = self.get_prism_cache()
+        pids = []
+        for pid_input, node_input in zip(self.pid_inputs, self.node_inputs):
+            # Normalized like the sheet PIDs, so a PID pasted with NBSP / zero-width characters still matches
+            pid = normalize_pid(pid_input.text())
+            if not pid:
+                continue
+            pids.append(pid)
+            record = cache.get(pid)
+            if record and not node_input.text().strip() and record.node:
+                node_input.setText(record.node)
+        # Only when every PID on the row has a cached status; a partial view can't decide the row
+        statuses = self.known_statuses(pids) if pids else None
+        if statuses and not state_value and not self.build_state_edited():
+            self.set_build_state(row_build_state(statuses))
+
+    def set_build_state(self, state):
+        """Show a Build State NodeAudit worked out (not the operator's own choice)"""
+        self.build_state_dropdown.setCurrentText(state)
+        self.loaded_build_state = self.build_state_dropdown.currentText()
+
+    def build_state_edited(self):
+        """True when the operator changed the Build State since the row was loaded or NodeAudit last set it"""
+        return self.build_state_dropdown.currentText() != self.loaded_build_state
+
+    def apply_prefetch_settings(self, settings):
+        """Keep the look-ahead settings on the window, so moving between rows doesn't read settings.json"""
+        self.prism_url_template = settings.get("prism_url_template")
+        self.prefetch_rows = settings.get("prism_prefetch_rows", DEFAULT_PREFETCH_ROWS)
+        self.prefetch_concurrency = settings.get("prism_prefetch_concurrency", DEFAULT_PREFETCH_CONCURRENCY)
+
+    def prefetch_upcoming(self, row, jump=False):
+        """Fetch PRISM results for the PIDs on ``row`` and the rows after it into the cache, in the background.
+
+        Runs only when a design page URL is configured. A running look-ahead
+        is left alone when the operator moves one row, and interrupted when
+        they ``jump`` elsewhere. Once the Design Review browser is open the
+        pages are loaded by the page pool instead of over plain HTTP.
+        """
+        url_template = self.prism_url_template
+        count = self.prefetch_rows
+        if not self.workbooks or not url_template or count <= 0:
+            return
+        pool = self.get_page_pool()
+        if jump and pool is not None:
+            self.prefetch_tried.difference_update(pool.cancel("prefetch"))
+        if self.prefetch_worker is not None and self.prefetch_worker.isRunning():
+            if not jump and pool is None:
+                return
+            self.prefetch_worker.requestInterruption()
+        cache = self.get_prism_cache()
+        pids = [pid for pid in upcoming_pids(self.workbooks, row, count) if pid not in self.prefetch_tried]
+        cached = cache.get_many(pids)
+        pids = [pid for pid in pids if pid not in cached]
+        if not pids:
+            return
+        # Pages that fail or show no design aren't cached; don't ask for them again this session
+        self.prefetch_tried.update(pids)
+        fetcher = PrismFetcher(url_template, cache=cache)
+        if pool is not None:
+            pool.submit("prefetch", [(pid, fetcher.url_for(pid)) for pid in pids])
+            return
+        worker = ReconcileWorker(pids, fetcher, self.prefetch_concurrency)
+        worker.done.connect(lambda records, errors, elapsed: self.prefetch_finished(worker, records, errors))
+        self.prefetch_worker = worker
+        self.prefetch_workers.append(worker)
+        worker.start()
+
+    def prefetch_finished(self, worker, records, errors):
+        worker.wait()
+        self.prefetch_workers.remove(worker)
+        if self.prefetch_worker is worker:
+            self.prefetch_worker = None
+        # PIDs an interruption skipped can be fetched again later
+        self.prefetch_tried.difference_update(pid for pid in worker.pids if pid not in records and pid not in errors)
+        self.prefetch_arrived(records)
+
+    def prefetch_arrived(self, records):
+        # The operator may already be on one of these rows; fill its blanks now
+        row = self.current_row
+        if not self.workbooks or not row or row > self.workbooks.max_row:
+            return
+        if any(normalize_pid(pid_input.text()) in records for pid_input in self.pid_inputs):
+            self.fill_from_prism_cache(self.workbooks.value(row, BUILD_STATE))
+
+    def stop_prefetch(self):
+        for worker in self.prefetch_workers:
+            worker.requestInterruption()
+        if self.page_pool is not None:
+            self.page_pool.cancel("prefetch")
+        self.prefetch_worker = None
+        self.prefetch_tried.clear()
+
     def open_excel_readonly(self):
         if not self.excel_file_path:
             self.status_label.setText("No Excel file loaded.")
             return
 
         try:
+            # Open the workbook the current row is in
+            file_path = self.excel_file_path
+            if self.current_row:
+                file_path = self.workbooks.part_for(self.current_row)[0].path
             if sys.platform == "win32":
                 # Use the /r switch with start to explicitly open Excel in read-only mode
-                os.system(f'start "" "EXCEL.EXE" /r "{self.excel_file_path}"')
+                os.system(f'start "" "EXCEL.EXE" /r "{file_path}"')
             elif sys.platform == "darwin":
-                os.system(f'open -a "Microsoft Excel" "{self.excel_file_path}"')
+                os.system(f'open -a "Microsoft Excel" "{file_path}"')
             else:
-                os.system(f'libreoffice --view "{self.excel_file_path}"')
+                os.system(f'libreoffice --view "{file_path}"')
 
             self.status_label.setText("Opened Excel in read-only mode.")
         except Exception as e:
             self.status_label.setText(f"Failed to open Excel: {e}")
             self.show_dark_messagebox(QMessageBox.Critical, "Error", f"Failed to open Excel: {str(e)}")
 
+    def open_dashboard(self):
+        if self.dashboard_panel is None:
+            self.dashboard_panel = DashboardPanel(self)
+        self.dashboard_panel.show()
+        self.dashboard_panel.raise_()
+
+    def open_diagnostics(self):
+        # Timers start collecting from the moment the panel is first opened
+        diagnostics.enabled = True
+        if self.diagnostics_panel is None:
+            self.diagnostics_panel = DiagnosticsPanel()
+        self.diagnostics_panel.show()
+        self.diagnostics_panel.raise_()
+
     def toggle_dark_mode(self):
         current_palette = QApplication.instance().palette()
         is_dark_mode = current_palette.color(QPalette.Window).lightness() < 128
         self.setup_theme(not is_dark_mode)  # Toggle the theme
+        settings = load_settings()
+        settings["dark_mode"] = not is_dark_mode
+        save_settings(settings)
 
     def open_browser(self):
         try:
             self.browser_window = QMainWindow()
             self.browser_window.setWindowTitle("Design Review")
             self.browser_window.resize(1200, 800)
+            with startup.step("import QtWebEngine"):
+                from PyQt5.QtWebEngineWidgets import QWebEngineView
+                from PyQt5.QtWebChannel import QWebChannel
+            if not hasattr(self, 'channel'):
+                # Initialize WebChannel for JavaScript-Python communication
+                self.channel = QWebChannel()
             self.web_view = QWebEngineView()
+            from PyQt5.QtWebEngineWidgets import QWebEnginePage
+            self.web_view.setPage(QWebEnginePage(self.get_browser_profile(), self.web_view))
             main_widget = QWidget()
             layout = QVBoxLayout()
             main_widget.setLayout(layout)
@@ -549,9 +1704,17 @@ class ExcelAutomationApp(QMainWindow):
             nav_bar.addWidget(self.url_input)
             nav_bar.addWidget(go_button)
             layout.addLayout(nav_bar)
+            filter_bar = QHBoxLayout()
+            block_checkbox = QCheckBox("Block images, fonts and trackers")
+            block_checkbox.setChecked(self.request_filter.enabled)
+            block_checkbox.toggled.connect(self.set_request_filter_enabled)
+            filter_bar.addWidget(block_checkbox)
+            self.load_stats_label = QLabel("")
+            filter_bar.addWidget(self.load_stats_label, 1)
+            layout.addLayout(filter_bar)
             layout.addWidget(self.web_view)
             scrape_button = QPushButton("Scrape Now")
-            scrape_button.clicked.connect(self.check_status)
+            scrape_button.clicked.connect(self.scrape_now)
             layout.addWidget(scrape_button)
             # Add Show Page Source button
             show_source_button = QPushButton("Show Page Source")
@@ -563,35 +1726,102 @@ class ExcelAutomationApp(QMainWindow):
             self.bridge = Bridge(self)
             self.web_view.page().setWebChannel(self.channel)
             self.channel.registerObject('bridge', self.bridge)
-            # Inject the Qt WebChannel JS so window.bridge is available
-            self.web_view.page().runJavaScript('''
-                if (!window.qt) {
-                    var s = document.createElement('script');
-                    s.src = 'qrc:///qtwebchannel/qwebchannel.js';
-                    s.onload = function() {
-                        new QWebChannel(qt.webChannelTransport, function(channel) {
-                            window.bridge = channel.objects.bridge;
-                        });
-                    };
-                    document.head.appendChild(s);
-                } else {
-                    new QWebChannel(qt.webChannelTransport, function(channel) {
-                        window.bridge = channel.objects.bridge;
-                    });
-                }
-            ''')
+            # qwebchannel.js plus a MutationObserver run on every page load, so
+            # window.bridge exists and status is pushed only when the labels change
+            with diagnostics.timer("js.inject_observer"):
+                self.web_view.page().scripts().insert(make_observer_script())
             prism_url = "https://www.google.com"
-            self.web_view.setUrl(QUrl(prism_url))
+            self.web_view.loadStarted.connect(self.page_load_started)
             self.web_view.loadFinished.connect(self.inject_dark_css_if_needed)
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.check_status)
-            self.timer.start(5000)
+            self.web_view.loadFinished.connect(self.page_load_finished)
+            self.web_view.urlChanged.connect(self.page_url_changed)
+            self.web_view.setUrl(QUrl(prism_url))
             self.browser_window.show()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to open browser: {str(e)}")
             print(f"Error opening browser: {str(e)}")
             traceback.print_exc()
 
+    def get_browser_profile(self):
+        """Named profile under app_dir(), so logins, cookies and cached PRISM assets survive restarts"""
+        if self.browser_profile is None:
+            from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+            settings = load_settings()
+            storage_path = os.path.join(app_dir(), "browser_profile")
+            profile = QWebEngineProfile("nodeaudit", self)
+            profile.setPersistentStoragePath(storage_path)
+            profile.setCachePath(os.path.join(storage_path, "cache"))
+            profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+            profile.setHttpCacheMaximumSize(int(settings.get("browser_cache_mb", 200)) * 1024 * 1024)
+            profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
+            self.request_filter = RequestFilter.from_settings(settings)
+            self.load_stats = LoadStats()
+            self.request_interceptor = make_request_interceptor(self.request_filter, self.load_stats)
+            if hasattr(profile, "setUrlRequestInterceptor"):
+                profile.setUrlRequestInterceptor(self.request_interceptor)
+            else:
+                # Qt before 5.13
+                profile.setRequestInterceptor(self.request_interceptor)
+            self.browser_profile = profile
+        return self.browser_profile
+
+    def release_browser(self):
+        """Delete every page on the browser profile, then the profile.
+
+        QtWebEngine needs a profile to outlive its pages. Left to the window's
+        teardown it wouldn't: children are deleted in creation order, so the
+        profile would go before the pool's pages.
+        """
+        if self.page_pool is not None:
+            self.page_pool.close()
+            self.page_pool.deleteLater()
+            self.page_pool = None
+        if getattr(self, 'browser_window', None) is not None:
+            self.browser_window.close()
+            self.browser_window.deleteLater()
+            self.browser_window = self.web_view = None
+        if self.browser_profile is not None:
+            # Posted after the pages, so deleted after them
+            self.browser_profile.deleteLater()
+            self.browser_profile = None
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def get_page_pool(self):
+        """The hidden page pool, once the Design Review browser has been opened (None before, or when turned off)"""
+        if self.page_pool is None and self.browser_profile is not None:
+            settings = load_settings()
+            size = settings.get("browser_pool_size", DEFAULT_POOL_SIZE)
+            if size <= 0:
+                return None
+            self.page_pool = PagePool(self.browser_profile, size,
+                                      settings.get("browser_pool_timeout", DEFAULT_POOL_TIMEOUT),
+                                      settings.get("browser_pool_recycle_after", DEFAULT_RECYCLE_AFTER), self)
+            self.page_pool.record_ready.connect(self.pool_record_ready)
+            self.page_pool.failed.connect(self.pool_failed)
+        return self.page_pool
+
+    def pool_record_ready(self, tag, pid, record):
+        self.remember_prism_records([record])
+        if tag == "reconcile":
+            self.pool_reconcile_progress(pid, record=record)
+        elif tag == "prefetch":
+            self.prefetch_arrived({pid: record})
+
+    def pool_failed(self, tag, pid, error):
+        if diagnostics.enabled:
+            print(f"[Web Scraping Debug] Pool page for {pid} failed: {error}")
+        if tag == "reconcile":
+            self.pool_reconcile_progress(pid, error=error)
+
+    def set_request_filter_enabled(self, enabled):
+        self.request_filter.enabled = enabled
+        settings = load_settings()
+        settings["browser_block_resources"] = enabled
+        save_settings(settings)
+
+    def page_load_started(self):
+        self.load_stats.start(self.web_view.url().toString())
+
     def inject_dark_css_if_needed(self):
         if QApplication.instance().palette().color(QPalette.Window).lightness() < 128:
             dark_css = """
@@ -620,7 +1850,22 @@ class ExcelAutomationApp(QMainWindow):
                     document.head.appendChild(style);
                 }}
             """
-            self.web_view.page().runJavaScript(js)
+            with diagnostics.timer("js.inject_css"):
+                self.web_view.page().runJavaScript(js)
+
+    def page_url_changed(self, url):
+        self.url_input.setText(url.toString())
+        # A new page should report its status even if it matches the previous one
+        self.bridge.last_key = None
+
+    def page_load_finished(self, ok):
+        summary = self.load_stats.finish(ok, self.request_filter.enabled)
+        if summary is not None:
+            self.load_stats_label.setText(describe_load(summary))
+            if diagnostics.enabled:
+                diagnostics.record("browser.page_load", summary["seconds"])
+        if ok:
+            self.check_status()
 
     def navigate_to_url(self):
         url = self.url_input.text().strip()
@@ -628,49 +1873,90 @@ class ExcelAutomationApp(QMainWindow):
             url = "https://" + url
         self.web_view.setUrl(QUrl(url))
 
+    def scrape_now(self):
+        self.bridge.last_key = None
+        self.check_status()
+
     def check_status(self):
-        print("check_status called")  # Debug print
-        js_code = """
-        (function() {
-            function extractStatus() {
-                const labels = document.querySelectorAll('td.formLabel');
-                let pid = '';
-                let node = '';
-                let status = '';
-                for (const label of labels) {
-                    const labelText = label.textContent.trim();
-                    const valueCell = label.nextElementSibling;
-                    const value = valueCell ? valueCell.textContent.trim() : '';
-                    if (labelText.includes('PID')) {
-                        pid = value;
-                    } else if (labelText.includes('Node')) {
-                        node = value;
-                    } else if (labelText.includes('Design Status')) {
-                        status = value;
-                    }
-                }
-                if (pid && node) {
-                    if (status.toLowerCase().includes('design approved')) {
-                        return `✅ Design Approved | PID: ${pid} | Node: ${node}`;
-                    } else if (status.toLowerCase().includes('in progress')) {
-                        return `⏳ Design In Progress | PID: ${pid} | Node: ${node}`;
-                    } else if (status.toLowerCase().includes('rejected')) {
-                        return `❌ Design Rejected | PID: ${pid} | Node: ${node}`;
-                    }
-                }
-                return 'IN_PROGRESS_FALLBACK';
-            }
-            console.log('JS running, window.bridge is', typeof window.bridge);
-            if (typeof window.bridge !== 'undefined') {
-                window.bridge.receiveStatus(extractStatus());
-            }
-        })();
+        # Pull the rendered page and run the same extraction the headless tools use
+        self.web_view.page().toHtml(self.handle_page_html)
+
+    def handle_page_html(self, html):
+        with diagnostics.timer("bridge.page_html"):
+            self.bridge.receive_records(extract_records(html), self.web_view.url().toString())
+
+    def get_prism_cache(self):
+        if self.prism_cache is None:
+            from nodeaudit.prism_cache import PrismCache
+            self.prism_cache = PrismCache.from_settings(load_settings())
+        return self.prism_cache
+
+    def remember_prism_records(self, records):
+        records = [record for record in records if record.pid and record.node]
+        if records:
+            self.get_prism_cache().put_many(records)
+
+    def apply_prism_records(self, records):
+        """Write the approvals on a PRISM list/search page to the sheet rows holding their PIDs.
+
+        Same as an approval seen in the browser (see update_excel): only approved
+        designs are written, as their node plus the row's folded Build State (see
+        plan_approval), with this page's statuses taking precedence over the cache.
         """
-        self.web_view.page().runJavaScript(js_code)
+        self.remember_prism_records(records)
+        if not self.workbooks:
+            self.status_label.setText(f"PRISM page lists {len(records)} designs – load a workbook to apply them")
+            return
+        by_pid = {normalize_pid(record.pid): record for record in records}
+        if not any(self.workbooks.locate(pid) for pid in by_pid):
+            self.status_label.setText(f"None of the {len(records)} PIDs on this PRISM page are in the sheet")
+            return
+        approved = {pid for pid, record in by_pid.items() if record.status == APPROVED and record.node}
+        known = {pid: record.status for pid, record in by_pid.items() if record.status}
+        cells_by_row = {}
+        for pid in approved:
+            self.plan_approval(pid, by_pid[pid].node, cells_by_row, known)
+        self.write_planned_cells(cells_by_row, kind="prism")
+        current_row = self.current_row
+        if current_row in cells_by_row:
+            # Refresh only what PRISM decides so unsaved typing on the current row survives
+            values = self.workbooks.row(current_row)
+            for pid_input, node_input, node_field in zip(self.pid_inputs, self.node_inputs, NODE_FIELDS):
+                if normalize_pid(pid_input.text()) in approved and values.get(node_field):
+                    node_input.setText(str(values[node_field]))
+            if self.workbooks.schema_at(current_row).column(BUILD_STATE) in cells_by_row[current_row]:
+                self.set_build_state(str(values[BUILD_STATE]))
+        self.status_label.setText(f"✅ PRISM page: {len(records)} designs, {len(cells_by_row)} approved rows updated")
+
+class FirstPaintWatcher(QObject):
+    """Marks time-to-first-paint for --profile-startup and then removes itself"""
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            startup.mark("first paint")
+            # Let the paint finish before printing
+            QTimer.singleShot(0, lambda: startup.report(os.path.join(app_dir(), "startup_profile.jsonl")))
+        return False
 
 # Run the app
 if __name__ == "__main__":
+    # Sheet scans run in worker processes; a frozen build must not start another app in them
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if "--profile-startup" in sys.argv:
+        sys.argv.remove("--profile-startup")
+        startup.enabled = True
+    if "--diagnostics" in sys.argv:
+        sys.argv.remove("--diagnostics")
+        diagnostics.enabled = True
+    # Lets QtWebEngine be imported after the QApplication exists
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    startup.mark("QApplication created")
     window = ExcelAutomationApp()
+    startup.mark("main window built")
+    if startup.enabled:
+        first_paint_watcher = FirstPaintWatcher()
+        window.installEventFilter(first_paint_watcher)
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
@@ -0,0 +1 @@
+"""Qt-free building blocks used by the NodeAudit GUI (main.py) and headless tools."""
@@ -0,0 +1,129 @@
+"""Audit progress: how many rows are in each Build State and each Config.
+
+Counted once per sheet from the load scan's columns. Build State and Config
+are categorical columns (see nodeaudit.columnar), so the count is over one
+small integer code per row, not over cell values. After that every write
+moves one row from its old value to its new one in ``update``, so the
+numbers stay current without recounting.
+"""
+import csv
+import json
+from collections import Counter
+
+from nodeaudit.column_schema import BUILD_STATE, CONFIG
+from nodeaudit.columnar import CategoricalColumn
+
+SUMMARY_FIELDS = (BUILD_STATE, CONFIG)
+# Values always listed, in this order, even at zero; anything else follows by count
+KNOWN_VALUES = {
+    BUILD_STATE: ("Design Approved", "In Progress", "In Design", "Does Not Exist", "PRO-I"),
+    CONFIG: ("1x1", "2x2", "4x4", "N/A"),
+}
+BLANK = "(blank)"
+CSV_FIELDS = ("scope", "field", "value", "count", "percent")
+
+
+def summary_label(value):
+    text = "" if value is None else str(value).strip()
+    return text or BLANK
+
+
+def _count(values):
+    if isinstance(values, CategoricalColumn):
+        counts = Counter()
+        for code, n in Counter(values.codes).items():
+            counts[summary_label(values.categories[code])] += n
+        return counts
+    return Counter(summary_label(value) for value in values)
+
+
+class AuditSummary:
+    """Per-value row counts for the Build State and Config columns of one sheet.
+
+    ``columns`` is a navigator's field -> column mapping; fields the sheet
+    has no column for are left out. Callers serialise ``update`` and
+    ``grow`` with their writes to the columns.
+    """
+
+    def __init__(self, columns, max_row):
+        self.rows = max_row - 1
+        self.counts = {field: _count(columns[field]) for field in SUMMARY_FIELDS if field in columns}
+
+    def update(self, field, old, new):
+        counts = self.counts.get(field)
+        if counts is None:
+            return
+        old, new = summary_label(old), summary_label(new)
+        if old != new:
+            counts[old] -= 1
+            if counts[old] <= 0:
+                del counts[old]
+            counts[new] += 1
+
+    def grow(self, rows):
+        """Rows appended past the end start out blank."""
+        self.rows += rows
+        for counts in self.counts.values():
+            counts[BLANK] += rows
+
+    def to_dict(self):
+        return {"rows": self.rows,
+                "fields": {field: dict(ordered_counts(field, counts)) for field, counts in self.counts.items()}}
+
+
+def merge_summaries(summaries):
+    """Add up AuditSummary.to_dict() results (e.g. one per sheet)."""
+    rows = 0
+    fields = {}
+    incomplete = None
+    for summary in summaries:
+        rows += summary["rows"]
+        for field, counts in summary["fields"].items():
+            fields.setdefault(field, Counter()).update(counts)
+        if "incomplete" in summary:
+            incomplete = (incomplete or 0) + summary["incomplete"]
+    merged = {"rows": rows, "fields": {field: dict(ordered_counts(field, counts)) for field, counts in fields.items()}}
+    if incomplete is not None:
+        merged["incomplete"] = incomplete
+    return merged
+
+
+def ordered_counts(field, counts):
+    """[(value, count)]: the known values first (zeros included), then the rest by count, blanks last."""
+    known = KNOWN_VALUES.get(field, ())
+    others = sorted((value for value in counts if value not in known and value != BLANK),
+                    key=lambda value: (-counts[value], value))
+    ordered = [(value, counts.get(value, 0)) for value in known]
+    ordered += [(value, counts[value]) for value in others]
+    if counts.get(BLANK):
+        ordered.append((BLANK, counts[BLANK]))
+    return ordered
+
+
+def summary_rows(report):
+    """Flat CSV rows for a report: ``{"total": summary, "parts": [summary with "label"]}``."""
+    scopes = [("All", report["total"])]
+    if len(report["parts"]) > 1:
+        scopes += [(part["label"], part) for part in report["parts"]]
+    for scope, summary in scopes:
+        rows = summary["rows"]
+        for field, counts in summary["fields"].items():
+            for value, count in ordered_counts(field, counts):
+                yield {"scope": scope, "field": field, "value": value, "count": count,
+                       "percent": round(100.0 * count / rows, 1) if rows else 0.0}
+        if "incomplete" in summary:
+            yield {"scope": scope, "field": "INCOMPLETE", "value": "rows needing work",
+                   "count": summary["incomplete"],
+                   "percent": round(100.0 * summary["incomplete"] / rows, 1) if rows else 0.0}
+
+
+def write_report(report, path):
+    """Write a report to ``path``: CSV for a .csv path, otherwise JSON."""
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(summary_rows(report))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
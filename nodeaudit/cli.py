@@ -0,0 +1,251 @@
+"""Headless NodeAudit commands. Never imports PyQt5, so it runs without a display.
+
+    python -m nodeaudit apply updates.csv audit.xlsx
+    python -m nodeaudit reconcile audit.xlsx --url-template "https://prism/design?pid={pid}"
+    python -m nodeaudit summary audit.xlsx -o summary.csv
+"""
+import os
+import sys
+import csv
+import json
+import math
+import time
+import shutil
+import argparse
+from openpyxl import load_workbook
+
+from nodeaudit.column_schema import (ALIASES, FALLBACK_ALIASES, PID_FIELDS, clean_value, normalize_header,
+                                     normalize_pid, schema_for)
+from nodeaudit.workbook_session import WorkbookSession
+
+# Normalized update-file header -> sheet field; "ROW" and "PID" pick the row to update
+_UPDATE_KEYS = {alias: field for field, aliases in ALIASES.items()
+                for alias in aliases + FALLBACK_ALIASES.get(field, ()) + (field,)}
+ROW_KEY = "ROW"
+PID_KEY = "PID"
+
+
+class UpdateError(Exception):
+    """Raised for update files that can't be applied as a whole."""
+
+
+def read_updates(path):
+    """Yield raw update dicts from a .csv (header row) or .jsonl (one object per line) file."""
+    if path.lower().endswith((".jsonl", ".json")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise UpdateError(f"{path}:{line_no}: {e}")
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+def normalize_update(raw):
+    """Turn one raw update into (row, pid, {field: value}); exactly one of row / pid is set."""
+    row = pid = None
+    values = {}
+    for key, value in raw.items():
+        name = normalize_header(key)
+        if value is None:
+            continue
+        text = clean_value(str(value))
+        if name == ROW_KEY:
+            row = int(text) if text else None
+        elif name == PID_KEY:
+            pid = normalize_pid(text) or None
+        elif name in _UPDATE_KEYS:
+            values[_UPDATE_KEYS[name]] = text
+        else:
+            raise UpdateError(f"Unknown column in update file: {key!r}")
+    if row is None and pid is None:
+        raise UpdateError(f"Update has neither a row nor a PID: {raw!r}")
+    if row is not None and row < 2:
+        raise UpdateError(f"Row {row} is the header or out of range")
+    return row, pid, values
+
+
+class ApplyReport:
+    def __init__(self, rows_scanned, rows_updated, rows_appended, unmatched, elapsed):
+        self.rows_scanned = rows_scanned
+        self.rows_updated = rows_updated
+        self.rows_appended = rows_appended
+        self.unmatched = unmatched
+        self.elapsed = elapsed
+
+    @property
+    def rows_per_second(self):
+        return self.rows_scanned / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"{self.rows_scanned} rows in {self.elapsed:.2f}s ({self.rows_per_second:.0f} rows/s) – "
+                f"updated: {self.rows_updated}, appended: {self.rows_appended}, unmatched PIDs: {len(self.unmatched)}")
+
+
+def apply_updates(workbook_path, updates, output_path=None):
+    """Apply updates to the active sheet: one streaming read pass, then a patch of the changed cells.
+
+    Rows are matched by explicit sheet row number or by any PID 1..4 cell.
+    The cells are written the way the app saves rows (see
+    nodeaudit.workbook_session), so only they change and styles, column
+    widths, merges, validation and conditional formatting are kept. The
+    result is written to ``output_path`` (default: replace the workbook
+    atomically).
+    """
+    started = time.perf_counter()
+    by_row = {}
+    by_pid = {}
+    for raw in updates:
+        row, pid, values = normalize_update(raw)
+        if row is not None:
+            by_row.setdefault(row, {}).update(values)
+        else:
+            by_pid.setdefault(pid, {}).update(values)
+
+    changes = {}
+    source = load_workbook(workbook_path, read_only=True)
+    try:
+        sheet = source.active
+        sheet_name = sheet.title
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, ())
+        schema = schema_for(header)
+        wanted = set()
+        for update in list(by_row.values()) + list(by_pid.values()):
+            wanted.update(update)
+        missing = sorted(field for field in wanted if field not in schema)
+        if missing:
+            raise UpdateError("The sheet has no column for: " + ", ".join(missing))
+        pid_cols = [schema.column(field) for field in PID_FIELDS if field in schema]
+
+        def apply(row, update):
+            cells = changes.setdefault(row, {})
+            for field, value in update.items():
+                cells[schema.column(field)] = value
+
+        rows_scanned = 0
+        matched_pids = set()
+        row_idx = 1
+        for row_idx, values in enumerate(rows, start=2):
+            for col_idx in pid_cols:
+                pid = normalize_pid(values[col_idx - 1]) if col_idx <= len(values) else ""
+                if pid in by_pid:
+                    apply(row_idx, by_pid[pid])
+                    matched_pids.add(pid)
+            if row_idx in by_row:
+                apply(row_idx, by_row[row_idx])
+            rows_scanned += 1
+    finally:
+        source.close()
+    rows_updated = len(changes)
+
+    # Row numbers past the end of the sheet become new rows
+    appended = sorted(row for row in by_row if row > row_idx)
+    for row in appended:
+        apply(row, by_row[row])
+
+    path = workbook_path
+    if output_path and os.path.abspath(output_path) != os.path.abspath(workbook_path):
+        shutil.copyfile(workbook_path, output_path)
+        path = output_path
+    session = WorkbookSession(path, sheet_name, flush_every=sys.maxsize, flush_interval=math.inf)
+    try:
+        for row, cells in changes.items():
+            for column, value in cells.items():
+                session.write_cell(row, column, value)
+        session.flush()
+    finally:
+        session.close(flush=False)
+
+    unmatched = sorted(set(by_pid) - matched_pids)
+    return ApplyReport(rows_scanned, rows_updated, len(appended), unmatched, time.perf_counter() - started)
+
+
+def cmd_apply(args):
+    report = apply_updates(args.workbook, read_updates(args.updates), args.output)
+    print(report)
+    for pid in report.unmatched:
+        print(f"  no row has PID {pid}", file=sys.stderr)
+    return 1 if report.unmatched else 0
+
+
+def cmd_reconcile(args):
+    from nodeaudit import prism_batch
+    return prism_batch.main(args.reconcile_args)
+
+
+def audit_summary(paths, sheets=None, all_sheets=False):
+    """The dashboard's report for some workbooks, from one streaming scan per sheet (no GUI, no writes)."""
+    from nodeaudit.audit_summary import AuditSummary, merge_summaries
+    from nodeaudit.completeness import CompletenessIndex
+    from nodeaudit.workbook_set import expand_sources, scan_parts
+    sources = expand_sources(paths, sheets, all_sheets)
+    if not sources:
+        raise UpdateError("None of the workbooks has the requested sheets")
+    parts = []
+    for (path, _), scan in zip(sources, scan_parts(sources)):
+        summary = AuditSummary(scan.columns, scan.max_row).to_dict()
+        summary["incomplete"] = len(CompletenessIndex(scan.columns, scan.max_row))
+        summary["label"] = f"{os.path.basename(path)} / {scan.title}"
+        parts.append(summary)
+    return {"total": merge_summaries(parts), "parts": parts}
+
+
+def cmd_summary(args):
+    from nodeaudit.audit_summary import CSV_FIELDS, summary_rows, write_report
+    report = audit_summary(args.workbooks, args.sheet, args.all_sheets)
+    if args.output:
+        write_report(report, args.output)
+    elif args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(summary_rows(report))
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m nodeaudit", description="Headless NodeAudit tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    apply_parser = commands.add_parser(
+        "apply", help="apply PID/Node/Scope/Magellan/config/build-state updates from a CSV or JSONL file")
+    apply_parser.add_argument("updates", help=".csv with a header row, or .jsonl with one object per line; "
+                                              "each update needs a 'row' or a 'PID' key plus sheet column names")
+    apply_parser.add_argument("workbook")
+    apply_parser.add_argument("-o", "--output", help="write the result here instead of replacing the workbook")
+    apply_parser.set_defaults(func=cmd_apply)
+
+    reconcile_parser = commands.add_parser("reconcile", help="look up every PID on PRISM (see prism_batch --help)",
+                                           add_help=False)
+    reconcile_parser.add_argument("reconcile_args", nargs=argparse.REMAINDER)
+    reconcile_parser.set_defaults(func=cmd_reconcile)
+
+    summary_parser = commands.add_parser(
+        "summary", help="count rows per Build State and Config (the app's dashboard) as JSON or CSV")
+    summary_parser.add_argument("workbooks", nargs="+")
+    summary_parser.add_argument("--sheet", action="append", help="sheet to include (repeatable; default: active sheet)")
+    summary_parser.add_argument("--all-sheets", action="store_true", help="every sheet with a PID column")
+    summary_parser.add_argument("--format", choices=("json", "csv"), default="json", help="stdout format")
+    summary_parser.add_argument("-o", "--output", help="write to this .json or .csv file instead of stdout")
+    summary_parser.set_defaults(func=cmd_summary)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except UpdateError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
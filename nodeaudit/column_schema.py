@@ -0,0 +1,118 @@
+import re
+from functools import lru_cache
+
+from nodeaudit.diagnostics import diagnostics
+
+# Characters that sneak into headers and values when text is pasted from PRISM or Outlook
+ZERO_WIDTH = "\u200B\u200C\u200D\u2060\uFEFF"
+_ZERO_WIDTH_RE = re.compile(f"[{ZERO_WIDTH}]")
+_SPACES_RE = re.compile(r"\s+")
+
+GROUPS = ["PID", "NODE", "SCOPE", "MAGELLAN"]
+SLOTS = 4
+
+PID_FIELDS = [f"PID {i + 1}" for i in range(SLOTS)]
+NODE_FIELDS = [f"NODE {i + 1}" for i in range(SLOTS)]
+SCOPE_FIELDS = [f"SCOPE {i + 1}" for i in range(SLOTS)]
+MAGELLAN_FIELDS = [f"MAGELLAN {i + 1}" for i in range(SLOTS)]
+
+CONFIG = "CONFIG"
+BUILD_STATE = "BUILD STATE"
+
+# Header names accepted for each field, in order of preference
+ALIASES = {f"{group} {i + 1}": (f"{group} {i + 1}",) for group in GROUPS for i in range(SLOTS)}
+ALIASES[CONFIG] = ("AOI NODE", "CONFIG", "NODE CONFIG")
+ALIASES[BUILD_STATE] = ("BUILD STATE",)
+# Looser names only used when none of a field's aliases is in the header, first one found wins:
+# older sheets keep the Build State under "Notes", and a bare "State" could be anything
+FALLBACK_ALIASES = {BUILD_STATE: ("NOTES", "STATE")}
+
+FIELDS = list(ALIASES)
+
+
+def clean_value(text):
+    """Same cleanup the entry form has always applied before writing a value."""
+    return text.strip().replace('\u00A0', '').replace('\u200B', '')
+
+
+def normalize_header(value):
+    """Fold NBSP, zero-width characters, repeated whitespace and case so "SCOPE  1" matches "Scope 1"."""
+    if value is None:
+        return ""
+    text = str(value).replace('\u00A0', ' ')
+    text = _ZERO_WIDTH_RE.sub('', text)
+    return _SPACES_RE.sub(' ', text).strip().upper()
+
+
+def normalize_pid(value):
+    """Key used to match PIDs between the sheet, PRISM and update files ("" for empty cells)."""
+    if value is None:
+        return ""
+    # Numeric PIDs come back from openpyxl as floats like 12345.0
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return _ZERO_WIDTH_RE.sub('', clean_value(str(value)))
+
+
+class ColumnSchema:
+    """Field -> column map for one header row.
+
+    ``columns`` maps each field in FIELDS to a 1-based column index. Fields
+    with no matching header are listed in ``unmapped``; fields matched by more
+    than one header are listed in ``ambiguous`` (the preferred alias, then the
+    leftmost column, wins). FALLBACK_ALIASES are only tried for fields none of
+    whose aliases matched.
+    """
+
+    def __init__(self, header_row):
+        self.headers = tuple(header_row)
+        self.columns = {}
+        self.unmapped = []
+        self.ambiguous = {}
+
+        positions = {}
+        for idx, value in enumerate(self.headers, start=1):
+            key = normalize_header(value)
+            if key:
+                positions.setdefault(key, []).append((idx, value))
+
+        for field in FIELDS:
+            matches = []
+            for alias in ALIASES[field]:
+                matches.extend(positions.get(alias, []))
+            for alias in FALLBACK_ALIASES.get(field, ()):
+                if matches:
+                    break
+                matches = list(positions.get(alias, []))
+            if not matches:
+                self.unmapped.append(field)
+                continue
+            self.columns[field] = matches[0][0]
+            if len(matches) > 1:
+                self.ambiguous[field] = [str(value) for _, value in matches]
+
+    def column(self, field):
+        return self.columns.get(field)
+
+    def __contains__(self, field):
+        return field in self.columns
+
+    def problems(self):
+        """Human-readable summary of unmapped and ambiguous fields, or "" if there are none."""
+        lines = []
+        if self.unmapped:
+            lines.append("Missing columns: " + ", ".join(self.unmapped))
+        for field, headers in self.ambiguous.items():
+            lines.append(f"{field} matches several columns ({', '.join(repr(h) for h in headers)}); using {headers[0]!r}")
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=32)
+@diagnostics.timed("header.resolve")
+def _schema_for(header_row):
+    return ColumnSchema(header_row)
+
+
+def schema_for(header_row):
+    """Cached ColumnSchema for a header row; sheets with identical headers share one."""
+    return _schema_for(tuple(header_row))
@@ -0,0 +1,103 @@
+"""Compact column storage for the fields NodeAudit reads and edits.
+
+Text fields (PID, NODE, SCOPE, MAGELLAN) are plain lists of cell values.
+CONFIG and BUILD STATE only ever hold a handful of values, so they are
+stored as one small integer per row pointing into a table of distinct
+values, with every distinct value kept once. Rows are read through
+``RowView``, which holds no data of its own.
+"""
+from array import array
+
+from nodeaudit.column_schema import CONFIG, BUILD_STATE
+
+CATEGORICAL_FIELDS = (CONFIG, BUILD_STATE)
+
+
+class CategoricalColumn:
+    """List-like column of repeated values: one code per row plus a table of distinct values."""
+    __slots__ = ("categories", "codes", "_index")
+
+    def __init__(self, values=()):
+        self.categories = [None]
+        self.codes = array("B")
+        self._index = {None: 0}
+        self.extend(values)
+
+    def _code(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+            # Widen the codes once there are more distinct values than a byte holds
+            if code > 0xFF and self.codes.typecode == "B":
+                self.codes = array("I", self.codes)
+        return code
+
+    def append(self, value):
+        self.codes.append(self._code(value))
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def __getitem__(self, i):
+        return self.categories[self.codes[i]]
+
+    def __setitem__(self, i, value):
+        self.codes[i] = self._code(value)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        categories = self.categories
+        return (categories[code] for code in self.codes)
+
+    def __getstate__(self):
+        return self.categories, self.codes
+
+    def __setstate__(self, state):
+        self.categories, self.codes = state
+        self._index = {value: code for code, value in enumerate(self.categories)}
+
+
+def new_column(field):
+    return CategoricalColumn() if field in CATEGORICAL_FIELDS else []
+
+
+class RowView:
+    """Read-only, dict-like view of one row of a field -> column mapping.
+
+    Reads go straight to the columns, so a view always shows the current
+    values and costs two references however many fields there are.
+    """
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, field):
+        return self._columns[field][self._index]
+
+    def get(self, field, default=None):
+        values = self._columns.get(field)
+        return default if values is None else values[self._index]
+
+    def __contains__(self, field):
+        return field in self._columns
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def keys(self):
+        return self._columns.keys()
+
+    def items(self):
+        return [(field, values[self._index]) for field, values in self._columns.items()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"RowView({self.to_dict()!r})"
@@ -0,0 +1,97 @@
+"""Which rows still need work: a PID, a Node for each PID, or a Build State.
+
+Built once over the columns the sheet scan already collected (the file is
+not read again) and kept current as cells are written, so "Next incomplete"
+is a bisect over the rows still missing something instead of a sheet scan.
+"""
+import bisect
+from array import array
+
+from nodeaudit.column_schema import PID_FIELDS, NODE_FIELDS, BUILD_STATE
+
+MISSING_PID = 1
+MISSING_NODE = 2
+MISSING_BUILD_STATE = 4
+FLAG_NAMES = ((MISSING_PID, "PID"), (MISSING_NODE, "Node"), (MISSING_BUILD_STATE, "Build State"))
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def describe_missing(flags):
+    """"PID, Node" for a flags value."""
+    return ", ".join(name for flag, name in FLAG_NAMES if flags & flag)
+
+
+class CompletenessIndex:
+    """Missing-field flags per row, plus the sorted rows that have any flag set.
+
+    ``columns`` is a navigator's field -> column mapping and rows run
+    2..max_row like the navigator's. Only fields the sheet has a column for
+    are checked, and rows with nothing in any column are not counted (blank
+    rows at the end of a sheet aren't work). Callers serialise ``update``
+    and ``extend`` with their own writes to the columns.
+    """
+
+    def __init__(self, columns, max_row):
+        self.columns = columns
+        self._pairs = [(columns[pid], columns.get(node)) for pid, node in zip(PID_FIELDS, NODE_FIELDS) if pid in columns]
+        self._nodes = [columns[node] for node in NODE_FIELDS if node in columns]
+        self._state = columns.get(BUILD_STATE)
+        self.flags = array("B")
+        self.rows = []
+        self.extend(max_row)
+
+    def _row_flags(self, i):
+        flags = 0
+        if self._pairs:
+            has_pid = False
+            for pids, nodes in self._pairs:
+                if not _blank(pids[i]):
+                    has_pid = True
+                    if nodes is not None and _blank(nodes[i]):
+                        flags |= MISSING_NODE
+            if not has_pid:
+                flags |= MISSING_PID
+                if all(_blank(nodes[i]) for nodes in self._nodes):
+                    flags |= MISSING_NODE
+        if self._state is not None and _blank(self._state[i]):
+            flags |= MISSING_BUILD_STATE
+        if flags and all(_blank(values[i]) for values in self.columns.values()):
+            return 0
+        return flags
+
+    def extend(self, max_row):
+        """Index rows added since the last call, up to ``max_row``."""
+        for i in range(len(self.flags), max_row - 1):
+            flags = self._row_flags(i)
+            self.flags.append(flags)
+            if flags:
+                self.rows.append(i + 2)
+
+    def update(self, row):
+        """Recheck one row after its cells changed."""
+        i = row - 2
+        if i >= len(self.flags):
+            self.extend(row)
+            return
+        old, new = self.flags[i], self._row_flags(i)
+        if bool(old) != bool(new):
+            if new:
+                bisect.insort(self.rows, row)
+            else:
+                del self.rows[bisect.bisect_left(self.rows, row)]
+        self.flags[i] = new
+
+    def missing(self, row):
+        i = row - 2
+        return self.flags[i] if 0 <= i < len(self.flags) else 0
+
+    def next_after(self, row):
+        """First incomplete row after ``row``, or None."""
+        i = bisect.bisect_right(self.rows, row)
+        return self.rows[i] if i < len(self.rows) else None
+
+    def __len__(self):
+        return len(self.rows)
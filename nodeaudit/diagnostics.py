@@ -0,0 +1,152 @@
+"""Named timers around NodeAudit's hot paths, aggregated into histograms.
+
+    from nodeaudit.diagnostics import diagnostics
+    with diagnostics.timer("workbook.save"):
+        workbook.save(path)
+
+Timing is off until ``enabled`` is set (``main.py --diagnostics`` or the
+diagnostics panel). While off, ``timer`` hands back one shared no-op context
+manager, so an instrumented call costs an attribute check and nothing else.
+Timers may be used from any thread.
+"""
+import csv
+import json
+import time
+import bisect
+import functools
+import threading
+from contextlib import nullcontext
+
+# Upper bucket bounds in milliseconds; a final bucket takes everything slower
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+CSV_FIELDS = ("name", "count", "total_ms", "mean_ms", "min_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+
+_DISABLED = nullcontext()
+
+
+class Histogram:
+    """Count, total, min/max and bucketed distribution of one timer's durations."""
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th quantile, capped at the slowest sample."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self, name):
+        buckets = {f"<={bound}": n for bound, n in zip(BUCKETS_MS, self.buckets)}
+        buckets[f">{BUCKETS_MS[-1]}"] = self.buckets[-1]
+        return {
+            "name": name,
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min or 0.0, 3),
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p90_ms": round(self.percentile(0.9), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class _Timer:
+    __slots__ = ("diagnostics", "name", "started")
+
+    def __init__(self, diagnostics, name):
+        self.diagnostics = diagnostics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.diagnostics.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Diagnostics:
+    def __init__(self):
+        self.enabled = False
+        self.started = time.time()
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def timer(self, name):
+        """Context manager that adds the time spent in its block to the ``name`` histogram."""
+        if not self.enabled:
+            return _DISABLED
+        return _Timer(self, name)
+
+    def timed(self, name):
+        """Decorator form of ``timer`` for plain functions (not Qt slots: the wrapper takes *args)."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(seconds * 1000)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """[stats dict] for every timer seen so far, sorted by name."""
+        with self._lock:
+            return [histogram.to_dict(name) for name, histogram in sorted(self._histograms.items())]
+
+    def to_dict(self):
+        return {"timestamp": time.time(), "since": self.started, "timers": self.snapshot()}
+
+    def dump(self, path):
+        """Write the current stats to ``path``: CSV for a .csv path, otherwise JSON."""
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(self.snapshot())
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+
+    def append_log(self, path):
+        """Append the current stats as one JSON line, so sessions can be compared."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict()) + "\n")
+
+
+diagnostics = Diagnostics()
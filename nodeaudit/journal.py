@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import threading
+
+from nodeaudit.diagnostics import diagnostics
+
+
+class Journal:
+    """Append-only log of row writes that have not reached the workbook yet.
+
+    Every Save & Next or PRISM approval is appended as one JSON line before it
+    is handed to the workbook session, so a crash between saves loses nothing.
+    Once a flush has written the entries into the workbook, ``checkpoint``
+    drops them from the file. Entries are replayed by ``replay`` the next time
+    the workbook is opened.
+
+    Lines look like ``{"seq": 3, "ts": 1700000000.0, "kind": "row", "row": 12,
+    "cells": {"4": "NODE-1"}}`` with cells keyed by 1-based column index, plus
+    ``"sheet"`` when the write is not for the session's default sheet. The
+    first line is a ``"base"`` record holding the workbook's mtime and size as
+    of our last flush, so replay can tell whether the file changed elsewhere.
+    """
+
+    def __init__(self, path, workbook_path, fsync=False):
+        self.path = path
+        self.workbook_path = workbook_path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._applied = 0
+        lines = self._read_lines()
+        if not lines:
+            self._write_lines([self._base_line()])
+            lines = self._read_lines()
+        entries = [line for line in lines if line.get("kind") != "base"]
+        self._seq = entries[-1]["seq"] if entries else 0
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @classmethod
+    def for_workbook(cls, workbook_path, fsync=False):
+        """The journal lives next to its workbook as a hidden .journal.jsonl file."""
+        directory, name = os.path.split(os.path.abspath(workbook_path))
+        return cls(os.path.join(directory, f".{name}.journal.jsonl"), workbook_path, fsync)
+
+    def _workbook_stamp(self):
+        st = os.stat(self.workbook_path)
+        return [st.st_mtime_ns, st.st_size]
+
+    def _base_line(self):
+        return {"kind": "base", "stamp": self._workbook_stamp()}
+
+    def _read_lines(self):
+        lines = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        lines.append(json.loads(line))
+                    except ValueError:
+                        break
+        except FileNotFoundError:
+            pass
+        return lines
+
+    def _write_lines(self, lines):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line) + "\n")
+        os.replace(tmp_path, self.path)
+
+    @diagnostics.timed("journal.append")
+    def append(self, kind, row, cells, sheet=None):
+        """Record a write; returns its sequence number."""
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "ts": time.time(), "kind": kind, "row": row,
+                     "cells": {str(col): value for col, value in cells.items()}}
+            if sheet:
+                entry["sheet"] = sheet
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            return self._seq
+
+    def entries(self):
+        """All readable write entries in order; a torn last line from a crash is ignored."""
+        return [line for line in self._read_lines() if line.get("kind") != "base"]
+
+    def mark_applied(self, seq):
+        """Entries up to ``seq`` are in the in-memory workbook and go out with the next flush."""
+        with self._lock:
+            self._applied = max(self._applied, seq)
+
+    def checkpoint(self):
+        """Drop entries that the last flush wrote to disk."""
+        with self._lock:
+            keep = [entry for entry in self.entries() if entry["seq"] > self._applied]
+            self._file.close()
+            # Called right after our own save, so the file's current stamp is the new base
+            self._write_lines([self._base_line()] + keep)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def replay(self, session):
+        """Re-apply journaled writes that never reached the workbook, and flush them.
+
+        Returns (replayed, stale) entry counts. If the file is exactly as our
+        last flush left it, every entry is replayed. If it was saved elsewhere
+        since, only entries newer than the file are replayed; older ones are
+        treated as superseded and dropped rather than clobbering that save.
+        """
+        lines = self._read_lines()
+        entries = [line for line in lines if line.get("kind") != "base"]
+        if not entries:
+            return 0, 0
+        base = lines[0].get("stamp") if lines and lines[0].get("kind") == "base" else None
+        if base == self._workbook_stamp():
+            fresh = entries
+        else:
+            file_mtime = os.stat(session.path).st_mtime
+            fresh = [entry for entry in entries if entry["ts"] > file_mtime]
+        replayed = 0
+        for entry in fresh:
+            try:
+                target = session.view(entry["sheet"]) if entry.get("sheet") else session
+            except KeyError:
+                # The sheet was renamed or deleted since; nothing to write it to
+                continue
+            for col, value in entry["cells"].items():
+                target.write_cell(entry["row"], int(col), value)
+            replayed += 1
+        if session.pending:
+            session.flush()
+        self.mark_applied(entries[-1]["seq"])
+        self.checkpoint()
+        return replayed, len(entries) - replayed
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        # Nothing left to recover: don't leave an empty journal next to the workbook
+        if not self.entries() and os.path.exists(self.path):
+            os.remove(self.path)
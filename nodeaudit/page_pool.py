@@ -0,0 +1,91 @@
+"""Work queue and slot bookkeeping for main.py's pool of hidden PRISM pages.
+
+Qt-free: the pool owns the QWebEnginePages and asks the scheduler which job
+to load in which slot, and when a slot's page has done enough loads to be
+replaced with a fresh one (Chromium renderers only grow).
+"""
+from collections import deque
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_RECYCLE_AFTER = 50
+# After a page finishes loading without naming its PID, how long to wait for
+# the observer before calling it "no design"
+SETTLE_SECONDS = 3
+
+
+class PageJob:
+    __slots__ = ("tag", "pid", "url")
+
+    def __init__(self, tag, pid, url):
+        self.tag = tag
+        self.pid = pid
+        self.url = url
+
+
+class PoolScheduler:
+    """FIFO of PageJobs spread over ``size`` slots.
+
+    Jobs carry a ``tag`` naming who asked for them (e.g. "reconcile",
+    "prefetch"), so one caller can ``cancel`` its queued jobs without
+    touching anyone else's. A PID already queued or loading under the same
+    tag is not queued twice.
+    """
+
+    def __init__(self, size, recycle_after):
+        self.size = size
+        self.recycle_after = recycle_after
+        self.queue = deque()
+        self.busy = {}
+        self.loads = [0] * size
+
+    def _known(self, tag):
+        return {job.pid for job in self.queue if job.tag == tag} | {job.pid for job in self.busy.values() if job.tag == tag}
+
+    def submit(self, tag, jobs):
+        """Queue [(pid, url)] under ``tag``. Returns how many were queued."""
+        known = self._known(tag)
+        queued = 0
+        for pid, url in jobs:
+            if pid not in known:
+                known.add(pid)
+                self.queue.append(PageJob(tag, pid, url))
+                queued += 1
+        return queued
+
+    def cancel(self, tag):
+        """Drop the queued jobs for ``tag`` and return their PIDs; loads in progress still finish."""
+        cancelled = [job.pid for job in self.queue if job.tag == tag]
+        self.queue = deque(job for job in self.queue if job.tag != tag)
+        return cancelled
+
+    def assign(self):
+        """[(slot, job)] for every free slot that can take a queued job."""
+        assignments = []
+        for slot in range(self.size):
+            if not self.queue:
+                break
+            if slot not in self.busy:
+                job = self.busy[slot] = self.queue.popleft()
+                assignments.append((slot, job))
+        return assignments
+
+    def job(self, slot):
+        return self.busy.get(slot)
+
+    def finish(self, slot):
+        """Free a slot. Returns (its job, whether its page should now be recycled)."""
+        job = self.busy.pop(slot)
+        self.loads[slot] += 1
+        recycle = bool(self.recycle_after) and self.loads[slot] >= self.recycle_after
+        if recycle:
+            self.loads[slot] = 0
+        return job, recycle
+
+    def pending(self, tag=None):
+        jobs = list(self.queue) + list(self.busy.values())
+        return sum(1 for job in jobs if tag is None or job.tag == tag)
+
+    @property
+    def idle(self):
+        return not self.queue and not self.busy
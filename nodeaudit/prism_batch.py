@@ -0,0 +1,239 @@
+import sys
+import time
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from nodeaudit.column_schema import NODE_FIELDS, BUILD_STATE
+from nodeaudit.prism_extract import extract_record, APPROVED, IN_PROGRESS, REJECTED
+from nodeaudit.settings import load_settings
+
+DEFAULT_CONCURRENCY = 8
+# Look-ahead while working through the sheet: rows past the current one, requests in flight
+DEFAULT_PREFETCH_ROWS = 10
+DEFAULT_PREFETCH_CONCURRENCY = 4
+
+
+class PrismFetcher:
+    """Downloads a PRISM design page for a PID and runs the formLabel extraction on it.
+
+    ``url_template`` contains a ``{pid}`` placeholder. ``headers`` can carry
+    the SSO cookie copied from the browser. With a PrismCache, fresh cached
+    results are returned without a request and new results are stored.
+    """
+
+    def __init__(self, url_template, headers=None, timeout=30, cache=None):
+        self.url_template = url_template
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.cache = cache
+        self.cache_hits = 0
+        self._hits_lock = threading.Lock()
+
+    def url_for(self, pid):
+        return self.url_template.format(pid=urllib.parse.quote(pid, safe=""))
+
+    def fetch(self, pid):
+        # urllib.request pulls in http.client and email; keep it off the GUI's startup path
+        import urllib.request
+        request = urllib.request.Request(self.url_for(pid), headers=self.headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def fetch_record(self, pid):
+        if self.cache is not None:
+            record = self.cache.get(pid)
+            if record is not None:
+                with self._hits_lock:
+                    self.cache_hits += 1
+                return record
+        record = extract_record(self.fetch(pid))
+        if self.cache is not None and record.pid:
+            self.cache.put(record)
+        return record
+
+
+def is_design_url(url, url_template):
+    """True if ``url`` is a design page of ``url_template``: same host, and the same path (and query) up to ``{pid}``."""
+    if not url or not url_template or "{pid}" not in url_template:
+        return False
+    head_text = url_template.split("{pid}", 1)[0]
+    head = urllib.parse.urlsplit(head_text)
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme.lower() not in ("http", "https") or parts.netloc.lower() != head.netloc.lower():
+        return False
+    if "?" in head_text:
+        # PID in the query string: same path, query starting the same way
+        return parts.path == head.path and parts.query.startswith(head.query)
+    return parts.path.startswith(head.path) and len(parts.path) > len(head.path)
+
+
+def fetch_statuses(pids, fetcher, concurrency=DEFAULT_CONCURRENCY, progress=None, cancelled=None):
+    """Fetch and extract every PID with at most ``concurrency`` requests in flight.
+
+    Returns (records, errors) keyed by PID. ``progress(done, total)`` is called
+    after each PID; ``cancelled()`` returning True stops submitting new work.
+    """
+    pids = list(pids)
+    records = {}
+    errors = {}
+    pending = {}
+    queue = iter(pids)
+    done = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while True:
+            # Keep the pool fed without queueing a future for every PID up front
+            while len(pending) < concurrency and not (cancelled and cancelled()):
+                pid = next(queue, None)
+                if pid is None:
+                    break
+                pending[pool.submit(fetcher.fetch_record, pid)] = pid
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pid = pending.pop(future)
+                try:
+                    records[pid] = future.result()
+                except Exception as e:
+                    errors[pid] = str(e)
+                done += 1
+                if progress:
+                    progress(done, len(pids))
+    return records, errors
+
+
+def row_build_state(statuses):
+    """Fold the statuses of all PIDs on one row into the row's BUILD STATE."""
+    if REJECTED in statuses:
+        return REJECTED
+    if statuses and all(status == APPROVED for status in statuses):
+        return APPROVED
+    return IN_PROGRESS
+
+
+def plan_results(schema, locations, records):
+    """{row: {column: value}} with the nodes and build states the records imply."""
+    state_col = schema.column(BUILD_STATE)
+    cells_by_row = {}
+    row_statuses = {}
+    for pid, record in records.items():
+        for row, slot in locations.get(pid, []):
+            cells = cells_by_row.setdefault(row, {})
+            node_col = schema.column(NODE_FIELDS[slot])
+            if node_col and record.node:
+                cells[node_col] = record.node
+            # Pages without a usable Design Status fall back to In Progress, same as the browser scraper
+            row_statuses.setdefault(row, []).append(record.status or IN_PROGRESS)
+    if state_col:
+        for row, statuses in row_statuses.items():
+            cells_by_row[row][state_col] = row_build_state(statuses)
+    return cells_by_row
+
+
+def plan_workbook_results(workbooks, locations, records):
+    """plan_results over a WorkbookSet, whose parts may each have their own columns."""
+    cells_by_row = {}
+    for part, part_locations in workbooks.split_locations(locations).items():
+        for row, cells in plan_results(part.schema, part_locations, records).items():
+            cells_by_row[part.to_global(row)] = cells
+    return cells_by_row
+
+
+def upcoming_pids(workbooks, row, count):
+    """PIDs on ``row`` and the ``count`` rows after it, in row order, each once."""
+    pids = {}
+    for upcoming in range(max(row, 2), min(row + count, workbooks.max_row) + 1):
+        for _, pid in workbooks.row_pids(upcoming):
+            pids[pid] = None
+    return list(pids)
+
+
+def apply_results(workbooks, locations, records):
+    """Write nodes and build states for every fetched PID into the workbooks. Returns rows touched."""
+    cells_by_row = plan_workbook_results(workbooks, locations, records)
+    for row, cells in cells_by_row.items():
+        for col_idx, value in cells.items():
+            workbooks.write_cell(row, col_idx, value)
+    return len(cells_by_row)
+
+
+class ReconcileReport:
+    def __init__(self, pids, records, errors, rows_updated, elapsed, cache_hits=0):
+        self.pids = pids
+        self.records = records
+        self.errors = errors
+        self.rows_updated = rows_updated
+        self.elapsed = elapsed
+        self.cache_hits = cache_hits
+
+    @property
+    def pids_per_minute(self):
+        return self.pids / self.elapsed * 60 if self.elapsed else 0.0
+
+    def counts(self):
+        counts = {APPROVED: 0, IN_PROGRESS: 0, REJECTED: 0}
+        for record in self.records.values():
+            status = record.status or IN_PROGRESS
+            counts[status] += 1
+        return counts
+
+    def __str__(self):
+        counts = ", ".join(f"{name}: {n}" for name, n in self.counts().items())
+        return (f"{self.pids} PIDs in {self.elapsed:.1f}s ({self.pids_per_minute:.0f} PIDs/min) – "
+                f"{counts}, cached: {self.cache_hits}, failed: {len(self.errors)}, rows updated: {self.rows_updated}")
+
+
+def reconcile(workbooks, fetcher, concurrency=DEFAULT_CONCURRENCY, progress=None):
+    """Fetch every PID in a WorkbookSet and write all results back with one flush per file."""
+    started = time.perf_counter()
+    locations = workbooks.pid_locations()
+    records, errors = fetch_statuses(locations, fetcher, concurrency, progress)
+    rows_updated = apply_results(workbooks, locations, records)
+    workbooks.flush()
+    return ReconcileReport(len(locations), records, errors, rows_updated, time.perf_counter() - started,
+                           fetcher.cache_hits)
+
+
+def main(argv=None):
+    import argparse
+    from nodeaudit.workbook_set import WorkbookSet, expand_sources
+    from nodeaudit.prism_cache import PrismCache
+
+    settings = load_settings()
+    parser = argparse.ArgumentParser(description="Reconcile every PID in one or more workbooks against PRISM.")
+    parser.add_argument("workbooks", nargs="+", metavar="workbook")
+    parser.add_argument("--sheet", action="append", dest="sheets",
+                        help="sheet to reconcile in every workbook (repeatable; default: the active sheet)")
+    parser.add_argument("--all-sheets", action="store_true", help="reconcile every sheet that has a PID column")
+    parser.add_argument("--url-template", default=settings.get("prism_url_template"),
+                        help="PRISM design page URL with a {pid} placeholder")
+    parser.add_argument("--concurrency", type=int, default=settings.get("prism_concurrency", DEFAULT_CONCURRENCY))
+    parser.add_argument("--cookie", help="Cookie header copied from a logged-in browser session")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--no-cache", action="store_true", help="ignore and don't update the local PRISM cache")
+    args = parser.parse_args(argv)
+    if not args.url_template:
+        parser.error("--url-template is required (or set prism_url_template in settings.json)")
+
+    headers = {"Cookie": args.cookie} if args.cookie else None
+    cache = None if args.no_cache else PrismCache.from_settings(settings)
+    fetcher = PrismFetcher(args.url_template, headers, args.timeout, cache)
+    sources = expand_sources(args.workbooks, args.sheets, args.all_sheets)
+    if not sources:
+        parser.error("none of the workbooks has the requested sheet(s)")
+    workbooks = WorkbookSet.open(sources, journal=False, flush_every=sys.maxsize, flush_interval=float("inf"))
+    try:
+        report = reconcile(workbooks, fetcher, args.concurrency)
+    finally:
+        workbooks.close(flush=False)
+        if cache is not None:
+            cache.close()
+    print(report)
+    for pid, error in sorted(report.errors.items()):
+        print(f"  {pid}: {error}", file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
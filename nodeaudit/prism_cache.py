@@ -0,0 +1,108 @@
+import os
+import time
+import sqlite3
+import threading
+
+from nodeaudit.column_schema import normalize_pid
+from nodeaudit.prism_extract import PrismRecord
+from nodeaudit.settings import app_dir
+
+CACHE_PATH = os.path.join(app_dir(), "prism_cache.sqlite3")
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 100000
+
+
+def cache_key(pid):
+    """normalize_pid, case-folded: PRISM pages and hand-typed sheets don't agree on case."""
+    return normalize_pid(pid).upper()
+
+
+class PrismCache:
+    """PID -> last PRISM result, persisted in SQLite next to settings.json.
+
+    Entries older than ``ttl`` seconds are treated as missing and removed on
+    access. When the table grows past ``max_entries`` the oldest fetches are
+    evicted. One connection is shared between threads behind a lock, since the
+    batch fetcher and the UI both use the cache. PIDs are stored by cache_key,
+    so the raw PID from a PRISM page finds the sheet's PID and vice versa.
+    ``clock`` gives the current time for fetch stamps and expiry.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS prism_cache ("
+            " pid TEXT PRIMARY KEY, node TEXT, design_status TEXT, status TEXT, fetched_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS prism_cache_fetched_at ON prism_cache (fetched_at)")
+        self._conn.commit()
+        self._writes_since_evict = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(ttl=settings.get("prism_cache_ttl_hours", DEFAULT_TTL / 3600) * 3600,
+                   max_entries=settings.get("prism_cache_max_entries", DEFAULT_MAX_ENTRIES))
+
+    def get(self, pid):
+        """Cached PrismRecord for a PID, or None if missing or expired."""
+        key = cache_key(pid)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT node, design_status, status, fetched_at FROM prism_cache WHERE pid = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            node, design_status, status, fetched_at = row
+            if self.clock() - fetched_at > self.ttl:
+                self._conn.execute("DELETE FROM prism_cache WHERE pid = ?", (key,))
+                self._conn.commit()
+                return None
+        return PrismRecord(pid, node, design_status, status)
+
+    def get_many(self, pids):
+        """{pid: PrismRecord} for the PIDs that have a fresh entry."""
+        found = {}
+        for pid in pids:
+            record = self.get(pid)
+            if record is not None:
+                found[pid] = record
+        return found
+
+    def put(self, record, fetched_at=None):
+        self.put_many([record], fetched_at)
+
+    def put_many(self, records, fetched_at=None):
+        fetched_at = self.clock() if fetched_at is None else fetched_at
+        rows = [(cache_key(r.pid), r.node, r.design_status, r.status, fetched_at) for r in records if cache_key(r.pid)]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO prism_cache VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+            self._writes_since_evict += len(rows)
+            # Size eviction is a table scan; don't pay for it on every single put
+            if self._writes_since_evict >= 1000:
+                self._evict()
+
+    def evict(self):
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        self._writes_since_evict = 0
+        self._conn.execute("DELETE FROM prism_cache WHERE fetched_at < ?", (self.clock() - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM prism_cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM prism_cache WHERE pid IN "
+                "(SELECT pid FROM prism_cache ORDER BY fetched_at LIMIT ?)", (count - self.max_entries,))
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._conn.close()
@@ -0,0 +1,346 @@
+"""PID / Node / Design Status extraction from PRISM design pages, without a browser.
+
+This is the Python implementation of the old extractStatus() script: every
+``td.formLabel`` cell is a label and the cell right after it is the value.
+Labels containing "PID", "Node" or "Design Status" fill the record; a later
+label overrides an earlier one, exactly like the script did.
+
+Search and list pages show many designs as a result table instead. A table
+row (without formLabel cells) whose cells are labelled "PID" and "Design
+Status" is taken as that table's header, and every following row with a PID
+becomes a record of its own; see ``extract_records``.
+
+Rows belong to the innermost open table: a table nested in a cell has its own
+rows, and its text is also part of the cell holding it. Cell text has
+zero-width characters removed and NBSP and runs of whitespace folded to one
+space.
+
+Usable from scripts::
+
+    python -m nodeaudit.prism_extract saved_pages/*.html
+"""
+import re
+import sys
+import json
+import time
+import codecs
+from html.parser import HTMLParser
+
+from nodeaudit.column_schema import ZERO_WIDTH
+
+APPROVED = "Design Approved"
+IN_PROGRESS = "In Progress"
+REJECTED = "Rejected"
+
+# Status codes used in records sent from the browser page to the Bridge
+STATUS_CODES = {"APPROVED": APPROVED, "IN_PROGRESS": IN_PROGRESS, "REJECTED": REJECTED}
+NOT_FOUND = "NOT_FOUND"
+_CODE_FOR_STATUS = {status: code for code, status in STATUS_CODES.items()}
+
+_SNIFF_BYTES = 4096
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_DROP_ZERO_WIDTH = {ord(char): None for char in ZERO_WIDTH}
+
+
+def cell_text(text):
+    """A cell's text as the page shows it: no zero-width characters, NBSP and runs of whitespace as one space."""
+    if not text.isascii():
+        text = text.translate(_DROP_ZERO_WIDTH)
+    # str.split() without arguments splits on NBSP too
+    return " ".join(text.split())
+
+
+def classify_status(text):
+    """Map PRISM's free-text Design Status to one of our build states, or None."""
+    lowered = text.lower()
+    if "design approved" in lowered:
+        return APPROVED
+    if "in progress" in lowered:
+        return IN_PROGRESS
+    if "rejected" in lowered:
+        return REJECTED
+    return None
+
+
+class PrismRecord:
+    """What one PRISM design page says about a PID."""
+    __slots__ = ("pid", "node", "design_status", "status")
+
+    def __init__(self, pid="", node="", design_status="", status=None):
+        self.pid = pid
+        self.node = node
+        self.design_status = design_status
+        self.status = status
+
+    @property
+    def found(self):
+        """True when the page had a PID, a Node and a recognised Design Status."""
+        return self.status is not None
+
+    def to_dict(self):
+        return {"pid": self.pid, "node": self.node, "design_status": self.design_status, "status": self.status}
+
+    def __eq__(self, other):
+        return isinstance(other, PrismRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"PrismRecord(pid={self.pid!r}, node={self.node!r}, status={self.status!r})"
+
+
+def format_status(record):
+    """The status line the Design Review window has always shown for a record."""
+    if record.status == APPROVED:
+        return f"✅ Design Approved | PID: {record.pid} | Node: {record.node}"
+    if record.status == IN_PROGRESS:
+        return f"⏳ Design In Progress | PID: {record.pid} | Node: {record.node}"
+    if record.status == REJECTED:
+        return f"❌ Design Rejected | PID: {record.pid} | Node: {record.node}"
+    return "⚠️ Design tab not found"
+
+
+def record_to_message(record, url="", ts=None):
+    """The structured record the browser page sends to the Bridge for one design."""
+    return {"pid": record.pid, "node": record.node, "designStatus": record.design_status,
+            "status": _CODE_FOR_STATUS.get(record.status, NOT_FOUND), "url": url,
+            "ts": time.time() if ts is None else ts}
+
+
+def record_from_message(message):
+    """PrismRecord for a record received from the page; unknown status codes mean not found."""
+    return PrismRecord(message.get("pid") or "", message.get("node") or "",
+                       message.get("designStatus") or "", STATUS_CODES.get(message.get("status")))
+
+
+def sniff_encoding(head, default="utf-8"):
+    """Guess a page's encoding from its BOM or <meta charset> in the first bytes."""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    match = _META_CHARSET_RE.search(head[:_SNIFF_BYTES])
+    if match:
+        name = match.group(1).decode("ascii", errors="ignore")
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            pass
+    return default
+
+
+class PrismPageParser(HTMLParser):
+    """Incremental parser: feed() str or bytes chunks as they arrive, then call record().
+
+    Only the text of table cells is buffered, so memory does not grow with
+    the size of the page.
+    """
+
+    def __init__(self, encoding=None):
+        super().__init__(convert_charrefs=True)
+        self.encoding = encoding
+        self._decoder = None
+        self._head = b""
+        self._row = None
+        self._cell = None
+        self._pid = self._node = self._design_status = ""
+        # One entry per open <table>: None until a result header row has been seen
+        self._tables = []
+        # (row, cell) of the enclosing table for each open <table>, restored when it closes,
+        # and the text of the cells that hold a nested table
+        self._outer = []
+        self._outer_texts = []
+        self._table_records = {}
+
+    def feed(self, data):
+        if isinstance(data, bytes):
+            if self._decoder is None:
+                # Hold back the first bytes until there is enough to find a <meta charset>
+                self._head += data
+                if len(self._head) < _SNIFF_BYTES:
+                    return
+                data = self._start_decoding()
+            data = self._decoder.decode(data)
+        super().feed(data)
+
+    def close(self):
+        if self._decoder is None and self._head:
+            head = self._start_decoding()
+            super().feed(self._decoder.decode(head, final=True))
+        elif self._decoder is not None:
+            super().feed(self._decoder.decode(b"", final=True))
+        super().close()
+        self._close_row()
+
+    def _start_decoding(self):
+        encoding = self.encoding or sniff_encoding(self._head)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        head, self._head = self._head, b""
+        return head
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._tables.append(None)
+            self._outer.append((self._row, self._cell))
+            if self._cell is not None:
+                self._outer_texts.append(self._cell[1])
+            self._row = self._cell = None
+        elif tag == "tr":
+            self._close_row()
+            self._row = []
+        elif tag in ("td", "th"):
+            self._close_cell()
+            if self._row is None:
+                self._row = []
+            is_label = False
+            for name, value in attrs:
+                if name == "class" and value and "formLabel" in value.split():
+                    is_label = True
+            self._cell = (is_label, [])
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th"):
+            self._close_cell()
+        elif tag == "tr":
+            self._close_row()
+        elif tag == "table":
+            self._close_row()
+            if self._tables:
+                self._tables.pop()
+            if self._outer:
+                self._row, self._cell = self._outer.pop()
+                if self._cell is not None:
+                    self._outer_texts.pop()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell[1].append(data)
+        # A nested table's text also belongs to the cells it sits in
+        for text in self._outer_texts:
+            text.append(data)
+
+    def _close_cell(self):
+        if self._cell is not None and self._row is not None:
+            self._row.append((self._cell[0], cell_text("".join(self._cell[1]))))
+            for text in self._outer_texts:
+                text.append(" ")
+        self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row:
+            columns = self._tables[-1] if self._tables else None
+            if columns is not None:
+                self._result_row(columns)
+            elif not (self._tables and self._header_row()):
+                for i, (is_label, text) in enumerate(self._row):
+                    if is_label:
+                        value = self._row[i + 1][1] if i + 1 < len(self._row) else ""
+                        self._label(text, value)
+        self._row = None
+
+    def _header_row(self):
+        """Remember the row as the current table's header if it names PID and Design Status columns."""
+        columns = {}
+        for i, (is_label, text) in enumerate(self._row):
+            if is_label:
+                return False
+            field = _label_field(text)
+            if field and field not in columns:
+                columns[field] = i
+        if "pid" not in columns or "design_status" not in columns:
+            return False
+        self._tables[-1] = columns
+        return True
+
+    def _result_row(self, columns):
+        def cell(field):
+            i = columns.get(field)
+            return self._row[i][1] if i is not None and i < len(self._row) else ""
+        pid = cell("pid")
+        if pid:
+            node, design_status = cell("node"), cell("design_status")
+            status = classify_status(design_status) if node else None
+            self._table_records[pid] = PrismRecord(pid, node, design_status, status)
+
+    def _label(self, label, value):
+        field = _label_field(label)
+        if field == "pid":
+            self._pid = value
+        elif field == "node":
+            self._node = value
+        elif field == "design_status":
+            self._design_status = value
+
+    def record(self):
+        status = classify_status(self._design_status) if self._pid and self._node else None
+        return PrismRecord(self._pid, self._node, self._design_status, status)
+
+    def records(self):
+        """Every design on the page: result table rows, then the form record if it names a PID."""
+        records = dict(self._table_records)
+        form = self.record()
+        if form.pid:
+            records[form.pid] = form
+        return list(records.values())
+
+
+def _label_field(label):
+    if "PID" in label:
+        return "pid"
+    if "Node" in label:
+        return "node"
+    if "Design Status" in label:
+        return "design_status"
+    return None
+
+
+def extract_record(html, encoding=None):
+    """Parse a whole page (str or raw bytes) and return its PrismRecord."""
+    parser = PrismPageParser(encoding)
+    parser.feed(html)
+    parser.close()
+    return parser.record()
+
+
+def extract_records(html, encoding=None):
+    """Parse a whole page and return a PrismRecord for every design it lists."""
+    parser = PrismPageParser(encoding)
+    parser.feed(html)
+    parser.close()
+    return parser.records()
+
+
+def parse_file(path, chunk_size=65536):
+    """Stream a saved page from disk through the parser and return the closed parser."""
+    parser = PrismPageParser()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            parser.feed(chunk)
+    parser.close()
+    return parser
+
+
+def extract_file(path, chunk_size=65536):
+    return parse_file(path, chunk_size).record()
+
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("usage: python -m nodeaudit.prism_extract PAGE.html [PAGE.html ...]", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    count = 0
+    for path in paths:
+        parser = parse_file(path)
+        # Result pages yield one line per design; a page with nothing still gets its (empty) record
+        for record in parser.records() or [parser.record()]:
+            print(json.dumps(dict(record.to_dict(), file=path)))
+            count += 1
+    elapsed = time.perf_counter() - started
+    rate = len(paths) / elapsed if elapsed else 0.0
+    print(f"{len(paths)} page(s), {count} record(s) in {elapsed:.3f}s ({rate:.0f} pages/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
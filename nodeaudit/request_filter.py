@@ -0,0 +1,139 @@
+"""Which Design Review browser requests to let through, and what blocking them saved.
+
+Qt-free so the rules can be checked without QtWebEngine; main.py's request
+interceptor maps Qt's resource types to the names used here.
+"""
+import time
+import fnmatch
+import threading
+import urllib.parse
+from collections import Counter
+
+DEFAULT_BLOCK_TYPES = ("image", "font", "media", "favicon", "ping", "prefetch", "csp_report")
+DEFAULT_BLOCK_PATTERNS = (
+    "*://*google-analytics.com/*", "*://*googletagmanager.com/*", "*://*doubleclick.net/*",
+    "*://*hotjar.com/*", "*://*newrelic.com/*", "*://*nr-data.net/*", "*://*segment.io/*",
+)
+# Page navigations (including SSO redirects) are never blocked
+NAVIGATION_TYPES = ("main_frame", "navigation_preload_main_frame")
+# Qt doesn't report the size of a request it never made; these typical transfer
+# sizes give the "saved" estimate
+TYPICAL_BYTES = {
+    "image": 30000, "font": 50000, "media": 500000, "favicon": 5000, "script": 60000,
+    "stylesheet": 20000, "sub_frame": 50000, "xhr": 5000, "ping": 500, "prefetch": 30000,
+}
+DEFAULT_TYPICAL_BYTES = 10000
+
+
+def _host(url):
+    return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+
+class RequestFilter:
+    """Blocks requests by resource type, by URL pattern, and on PRISM pages by host.
+
+    ``allowed_hosts`` lists the PRISM hosts (a subdomain matches its parent).
+    While the page being shown is on one of them, subresources from any other
+    host are blocked; other sites are only subject to the type and pattern
+    rules. ``enabled`` can be flipped at any time.
+    """
+
+    def __init__(self, allowed_hosts=(), block_types=DEFAULT_BLOCK_TYPES, block_patterns=DEFAULT_BLOCK_PATTERNS):
+        self.enabled = True
+        self.allowed_hosts = tuple(host.lower().lstrip(".") for host in allowed_hosts if host)
+        self.block_types = frozenset(block_types)
+        self.block_patterns = tuple(block_patterns)
+
+    @classmethod
+    def from_settings(cls, settings):
+        hosts = list(settings.get("browser_allowed_hosts", []))
+        # The host of the configured design page URL is always a PRISM host
+        template = settings.get("prism_url_template")
+        if template:
+            hosts.append(_host(template.replace("{pid}", "")))
+        request_filter = cls(hosts, settings.get("browser_block_types", DEFAULT_BLOCK_TYPES),
+                             settings.get("browser_block_patterns", DEFAULT_BLOCK_PATTERNS))
+        request_filter.enabled = settings.get("browser_block_resources", True)
+        return request_filter
+
+    def is_allowed_host(self, host):
+        return any(host == allowed or host.endswith("." + allowed) for allowed in self.allowed_hosts)
+
+    def should_block(self, url, resource_type, first_party_url=""):
+        if not self.enabled or resource_type in NAVIGATION_TYPES:
+            return False
+        if resource_type in self.block_types:
+            return True
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in self.block_patterns):
+            return True
+        return (bool(self.allowed_hosts) and self.is_allowed_host(_host(first_party_url))
+                and not self.is_allowed_host(_host(url)))
+
+
+class LoadStats:
+    """Requests allowed and blocked during each page load, with a per-host load-time baseline.
+
+    ``record`` is called from Qt's network thread, everything else from the
+    UI thread. Loads made with the filter off set the host's baseline, so a
+    filtered load can be compared with what the same host took unfiltered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.url = ""
+        self.started = None
+        self.allowed = 0
+        self.blocked = Counter()
+        self._baseline = {}
+        self.last = None
+
+    def start(self, url):
+        with self._lock:
+            self.url = url
+            self.started = time.perf_counter()
+            self.allowed = 0
+            self.blocked = Counter()
+
+    def record(self, resource_type, blocked):
+        with self._lock:
+            if blocked:
+                self.blocked[resource_type] += 1
+            else:
+                self.allowed += 1
+
+    def finish(self, ok, filtered):
+        """Close the current load and return its summary dict (None if no load was started)."""
+        with self._lock:
+            if self.started is None:
+                return None
+            seconds = time.perf_counter() - self.started
+            self.started = None
+            host = _host(self.url)
+            baseline = self._baseline.get(host)
+            if ok and not filtered:
+                count, total = baseline or (0, 0.0)
+                self._baseline[host] = (count + 1, total + seconds)
+            self.last = {
+                "url": self.url,
+                "ok": ok,
+                "seconds": round(seconds, 3),
+                "allowed": self.allowed,
+                "blocked": dict(self.blocked),
+                "bytes_saved_estimate": sum(TYPICAL_BYTES.get(resource_type, DEFAULT_TYPICAL_BYTES) * n
+                                            for resource_type, n in self.blocked.items()),
+                "unfiltered_seconds": round(baseline[1] / baseline[0], 3) if baseline and filtered else None,
+            }
+            return self.last
+
+
+def describe_load(summary):
+    """One status line for a LoadStats summary."""
+    blocked = sum(summary["blocked"].values())
+    text = f"Load {summary['seconds']:.2f}s, {summary['allowed']} requests"
+    if blocked:
+        kinds = ", ".join(f"{name} {n}" for name, n in sorted(summary["blocked"].items(), key=lambda item: -item[1]))
+        text += f", {blocked} blocked ({kinds}), ~{summary['bytes_saved_estimate'] / 1024:.0f} KB saved"
+    baseline = summary["unfiltered_seconds"]
+    if baseline is not None:
+        text += f", {baseline - summary['seconds']:.2f}s saved vs unfiltered avg {baseline:.2f}s"
+    return text
@@ -0,0 +1,182 @@
+import threading
+from openpyxl import load_workbook
+
+from nodeaudit.column_schema import PID_FIELDS, normalize_pid, schema_for
+from nodeaudit.columnar import RowView, new_column
+from nodeaudit.completeness import CompletenessIndex
+from nodeaudit.search_index import SearchIndex, DEFAULT_LIMIT
+from nodeaudit.audit_summary import AuditSummary
+from nodeaudit.diagnostics import diagnostics
+
+
+class SheetScan:
+    """What one streaming pass over a sheet collects: the mapped columns and the PID index.
+
+    Plain data only, so a scan made in a worker process can be sent back.
+    """
+
+    def __init__(self, title, header, columns, pid_index, max_row):
+        self.title = title
+        self.header = header
+        self.columns = columns
+        self.pid_index = pid_index
+        self.max_row = max_row
+
+
+@diagnostics.timed("workbook.scan")
+def scan_sheet(path, sheet=None, progress=None, progress_every=5000):
+    """Stream a sheet (default: the active one) once with openpyxl's read-only mode."""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, ())
+        schema = schema_for(header)
+        fields = list(schema.columns.items())
+        columns = {field: new_column(field) for field, _ in fields}
+        pid_cols = [(slot, schema.column(field)) for slot, field in enumerate(PID_FIELDS) if field in schema]
+        pid_index = {}
+        count = 0
+        for row_idx, values in enumerate(rows, start=2):
+            width = len(values)
+            for field, col_idx in fields:
+                columns[field].append(values[col_idx - 1] if col_idx <= width else None)
+            for slot, col_idx in pid_cols:
+                pid = normalize_pid(values[col_idx - 1]) if col_idx <= width else ""
+                if pid:
+                    pid_index.setdefault(pid, []).append((row_idx, slot))
+            count += 1
+            if progress and count % progress_every == 0:
+                progress(count)
+        # Row 1 is the header, so data rows run 2..max_row
+        return SheetScan(worksheet.title, tuple(header), columns, pid_index, count + 1)
+    finally:
+        workbook.close()
+
+
+class RowNavigator:
+    """Random access to the fields NodeAudit uses, for Back / Go to Row.
+
+    The sheet (default: the active one) is streamed once by ``scan_sheet``
+    and only the mapped columns are kept, one column per field (see
+    nodeaudit.columnar; CONFIG and BUILD STATE are stored as categorical
+    codes). A ready-made ``scan`` can be passed instead, e.g. one made in a
+    worker process. ``row`` returns a RowView over the columns, so reading a
+    row copies nothing.
+
+    The same scan builds ``pid_index``, normalized PID -> [(row, slot), ...]
+    over the PID 1..4 columns, so a PRISM result can be matched to its rows
+    without a sheet scan. ``completeness`` (see nodeaudit.completeness) tracks
+    the rows still missing a PID, Node or Build State, and ``search_index``
+    (see nodeaudit.search_index) answers searches over the PID, Node and
+    Magellan columns. ``summary`` (see nodeaudit.audit_summary) counts rows
+    per Build State and Config. ``set_value`` keeps all of them current.
+
+    Reads and writes may come from different threads (the UI and the
+    workbook I/O thread), so column and index updates take a lock.
+    ``progress(rows)`` is called every ``progress_every`` rows during the scan.
+    """
+
+    def __init__(self, path, sheet=None, progress=None, progress_every=5000, scan=None):
+        self.path = path
+        self._lock = threading.Lock()
+        if scan is None:
+            scan = scan_sheet(path, sheet, progress, progress_every)
+        self.sheet = scan.title
+        self.schema = schema_for(scan.header)
+        self.columns = scan.columns
+        self.pid_index = scan.pid_index
+        self.max_row = scan.max_row
+        with diagnostics.timer("completeness.build"):
+            self.completeness = CompletenessIndex(self.columns, self.max_row)
+        with diagnostics.timer("search.build"):
+            self.search_index = SearchIndex(self.columns)
+        self.summary = AuditSummary(self.columns, self.max_row)
+        self._field_by_column = {col_idx: field for field, col_idx in self.schema.columns.items()}
+        self._pid_slots = {field: slot for slot, field in enumerate(PID_FIELDS) if field in self.schema}
+
+    def row(self, row):
+        """Field -> value view of a sheet row (2..max_row); empty cells are None."""
+        if row < 2 or row > self.max_row:
+            raise IndexError(f"row {row} out of range 2..{self.max_row}")
+        return RowView(self.columns, row - 2)
+
+    def value(self, row, field):
+        values = self.columns.get(field)
+        if values is None or row < 2 or row > self.max_row:
+            return None
+        return values[row - 2]
+
+    def set_value(self, row, field, value):
+        values = self.columns.get(field)
+        if values is None or row < 2:
+            return
+        with self._lock:
+            if row > self.max_row:
+                # Appending past the end grows every column together
+                for column in self.columns.values():
+                    column.extend([None] * (row - self.max_row))
+                self.summary.grow(row - self.max_row)
+                self.max_row = row
+            slot = self._pid_slots.get(field)
+            if slot is not None:
+                self._reindex(row, slot, values[row - 2], value)
+            self.summary.update(field, values[row - 2], value)
+            values[row - 2] = value
+            self.completeness.update(row)
+            self.search_index.update(row, field, value)
+
+    def cell_written(self, row, column, value):
+        """WorkbookSession listener: mirror a written cell into the column store."""
+        field = self._field_by_column.get(column)
+        if field:
+            self.set_value(row, field, value)
+
+    def _reindex(self, row, slot, old, new):
+        old, new = normalize_pid(old), normalize_pid(new)
+        if old == new:
+            return
+        if old:
+            places = self.pid_index.get(old, [])
+            if (row, slot) in places:
+                places.remove((row, slot))
+            if not places:
+                self.pid_index.pop(old, None)
+        if new:
+            self.pid_index.setdefault(new, []).append((row, slot))
+
+    def locate(self, pid):
+        """[(row, slot), ...] for every PID cell holding this PID."""
+        with self._lock:
+            return list(self.pid_index.get(normalize_pid(pid), ()))
+
+    def row_pids(self, row):
+        """[(slot, pid), ...] for the filled PID cells of a row."""
+        pids = []
+        for field, slot in self._pid_slots.items():
+            pid = normalize_pid(self.value(row, field))
+            if pid:
+                pids.append((slot, pid))
+        return pids
+
+    def summary_dict(self):
+        """AuditSummary.to_dict() plus the number of rows still needing work."""
+        with self._lock:
+            summary = self.summary.to_dict()
+            summary["incomplete"] = len(self.completeness)
+            return summary
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """[(rank, row, field, value)] for PID, Node and Magellan cells matching ``query``; see SearchIndex."""
+        with self._lock:
+            return self.search_index.search(query, limit)
+
+    def duplicates(self):
+        """{pid: [rows]} for PIDs that appear on more than one row."""
+        with self._lock:
+            found = {}
+            for pid, places in self.pid_index.items():
+                rows = sorted({row for row, _ in places})
+                if len(rows) > 1:
+                    found[pid] = rows
+            return found
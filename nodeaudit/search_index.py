@@ -0,0 +1,170 @@
+"""Prefix and substring search over the PID, Node and Magellan columns.
+
+All searchable values of a sheet are lowercased, sorted and joined into
+one newline-separated string. Each value's line has a start offset and a
+(row, field) code in two parallel arrays. Prefix matches are a binary
+search over the sorted lines; substring matches are ``str.find`` calls
+running in C over the whole string instead of a Python loop over every
+cell.
+
+Cells written later are appended to a small ``delta`` text with the same
+layout in write order, which is searched with ``str.find`` too, so searches
+don't slow down as writes pile up. Every hit is checked against the live
+column value, so lines for overwritten values simply stop matching. The
+main text is rebuilt once the delta grows past ``rebuild_after`` entries.
+"""
+import bisect
+from array import array
+
+from nodeaudit.column_schema import PID_FIELDS, NODE_FIELDS, MAGELLAN_FIELDS
+
+SEARCH_FIELDS = PID_FIELDS + NODE_FIELDS + MAGELLAN_FIELDS
+DEFAULT_LIMIT = 50
+EXACT, PREFIX, SUBSTRING = 0, 1, 2
+
+
+def search_key(value):
+    """Lowercased, stripped text of a cell ("" for blanks); newlines would split a line."""
+    if value is None:
+        return ""
+    return str(value).strip().lower().replace("\n", " ")
+
+
+def _rank(key, query):
+    if key == query:
+        return EXACT
+    return PREFIX if key.startswith(query) else SUBSTRING
+
+
+class _Lines:
+    """Sorted [(key, code)] entries as one newline-separated string plus offset and code arrays."""
+
+    def __init__(self, entries):
+        offsets = array("I")
+        position = 1
+        for key, _ in entries:
+            offsets.append(position)
+            position += len(key) + 1
+        # One past the last line, so line j is text[offsets[j]:offsets[j + 1] - 1]
+        offsets.append(position)
+        self.text = "\n" + "".join(key + "\n" for key, _ in entries)
+        self.offsets = offsets
+        self.codes = array("Q", [code for _, code in entries])
+
+    def prefixed(self, query):
+        """Codes of the lines starting with ``query``, in sorted order."""
+        text, offsets, codes = self.text, self.offsets, self.codes
+        # The lines are sorted, so matches start at the first line >= query
+        lo, hi = 0, len(codes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[offsets[mid]:offsets[mid + 1] - 1] < query:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < len(codes) and text.startswith(query, offsets[lo]):
+            yield codes[lo]
+            lo += 1
+
+    def containing(self, query):
+        """Codes of the lines containing ``query`` anywhere but at their start."""
+        text, offsets, codes = self.text, self.offsets, self.codes
+        start = text.find(query)
+        while start != -1:
+            line = bisect.bisect_right(offsets, start) - 1
+            if offsets[line] != start:
+                yield codes[line]
+            start = text.find(query, start + 1)
+
+
+class _Delta(_Lines):
+    """Lines in write order for the cells written since the last rebuild."""
+
+    def __init__(self):
+        super().__init__([])
+
+    def __len__(self):
+        return len(self.codes)
+
+    def add(self, key, code):
+        # Copies the text, which is fine at delta sizes
+        self.text += key + "\n"
+        self.offsets.append(self.offsets[-1] + len(key) + 1)
+        self.codes.append(code)
+
+    def prefixed(self, query):
+        """Codes of the lines starting with ``query``, in write order."""
+        text, offsets, codes = self.text, self.offsets, self.codes
+        needle = "\n" + query
+        start = text.find(needle)
+        while start != -1:
+            yield codes[bisect.bisect_right(offsets, start + 1) - 1]
+            start = text.find(needle, start + 1)
+
+
+class SearchIndex:
+    """Search over one navigator's ``columns`` (rows 2..n, like the navigator's).
+
+    ``search`` returns [(rank, row, field, value)] with exact matches first,
+    then prefix, then substring matches, each group in row order. Callers
+    serialise ``update`` with their writes to the columns and with searches.
+    """
+
+    def __init__(self, columns, rebuild_after=5000):
+        self.columns = columns
+        self.rebuild_after = rebuild_after
+        self.fields = [field for field in SEARCH_FIELDS if field in columns]
+        self.rebuild()
+
+    def rebuild(self):
+        entries = []
+        for code_field, field in enumerate(self.fields):
+            for i, value in enumerate(self.columns[field]):
+                key = search_key(value)
+                if key:
+                    entries.append((key, (i + 2) << 4 | code_field))
+        entries.sort()
+        self.lines = _Lines(entries)
+        self.delta = _Delta()
+
+    def update(self, row, field, value):
+        """Make a newly written cell searchable."""
+        if field not in self.fields:
+            return
+        key = search_key(value)
+        if key:
+            self.delta.add(key, row << 4 | self.fields.index(field))
+            if len(self.delta) > self.rebuild_after:
+                self.rebuild()
+
+    def _live(self, code):
+        row, field = code >> 4, self.fields[code & 0xF]
+        values = self.columns[field]
+        i = row - 2
+        value = values[i] if i < len(values) else None
+        return row, field, value
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        query = search_key(query)
+        if not query:
+            return []
+        seen = set()
+        hits = []
+
+        # Prefix matches first, so they aren't crowded out by substrings;
+        # newer cells before older ones within each
+        matches = (self.delta.prefixed(query), self.lines.prefixed(query),
+                   self.delta.containing(query), self.lines.containing(query))
+        for codes in matches:
+            for code in codes:
+                if len(hits) >= limit:
+                    break
+                if code in seen:
+                    continue
+                row, field, value = self._live(code)
+                key = search_key(value)
+                if query in key:
+                    seen.add(code)
+                    hits.append((_rank(key, query), row, field, value))
+        hits.sort()
+        return hits
@@ -0,0 +1,52 @@
+import os
+import sys
+import json
+
+
+def app_dir():
+    """Folder holding settings.json: next to the executable when frozen, else next to main.py."""
+    if getattr(sys, "frozen", False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+SETTINGS_PATH = os.path.join(app_dir(), "settings.json")
+
+
+def load_settings(path=SETTINGS_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_settings(settings, path=SETTINGS_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Workbook sessions kept in settings.json, most recent first
+MAX_SESSIONS = 20
+
+
+def remember_session(settings, files, current_row, all_sheets=False):
+    """Record where the operator is in a set of workbooks; the first file names the session.
+
+    ``all_sheets`` records whether every sheet was open, since row numbers depend on it.
+    """
+    files = [os.path.abspath(path) for path in files]
+    sessions = settings.get("sessions", {})
+    sessions.pop(files[0], None)
+    sessions = {files[0]: {"files": files, "current_row": current_row, "all_sheets": all_sheets}, **sessions}
+    settings["sessions"] = dict(list(sessions.items())[:MAX_SESSIONS])
+    settings["last_session"] = files[0]
+    return settings
+
+
+def find_session(settings, path=None):
+    """The saved session for ``path`` (default: the last one used), or None."""
+    path = os.path.abspath(path) if path else settings.get("last_session")
+    return settings.get("sessions", {}).get(path) if path else None
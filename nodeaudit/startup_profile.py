@@ -0,0 +1,59 @@
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """Wall-clock costs of imports and startup milestones for --profile-startup.
+
+    Steps are always recorded (two perf_counter calls each); nothing is
+    printed or written unless ``enabled`` is set.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self.steps = []
+        self.marks = []
+        self.reported = False
+
+    @contextmanager
+    def step(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self.steps.append((name, elapsed))
+            # Lazy imports happen after the report; show them as they come
+            if self.enabled and self.reported:
+                print(f"[startup] {name}: {elapsed * 1000:.1f} ms (on first use)", file=sys.stderr)
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.started))
+
+    def to_dict(self):
+        return {
+            "timestamp": time.time(),
+            "steps_ms": {name: round(elapsed * 1000, 2) for name, elapsed in self.steps},
+            "marks_ms": {name: round(elapsed * 1000, 2) for name, elapsed in self.marks},
+        }
+
+    def report(self, log_path=None):
+        """Print the profile once, and append it as a JSON line to ``log_path`` if given."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        lines = ["[startup] profile:"]
+        for name, elapsed in self.steps:
+            lines.append(f"  {name:<32} {elapsed * 1000:8.1f} ms")
+        for name, elapsed in self.marks:
+            lines.append(f"  @ {name:<30} {elapsed * 1000:8.1f} ms")
+        print("\n".join(lines), file=sys.stderr)
+        if log_path:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_dict()) + "\n")
+
+
+startup = StartupProfile()
@@ -0,0 +1,251 @@
+import os
+import time
+import tempfile
+from openpyxl import load_workbook
+from nodeaudit.column_schema import schema_for
+from nodeaudit.diagnostics import diagnostics
+from nodeaudit.xlsx_patch import patch_workbook, PatchUnsupported
+
+
+class ExternalModificationError(Exception):
+    """Raised when the workbook on disk changed since the session last read or wrote it."""
+
+
+@diagnostics.timed("header.read")
+def read_sheet_header(path, sheet=None):
+    """(title, header row) of a sheet (default: the active one), read without parsing the rest of the file."""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        for values in worksheet.iter_rows(min_row=1, max_row=1, values_only=True):
+            return worksheet.title, list(values)
+        return worksheet.title, []
+    finally:
+        workbook.close()
+
+
+def read_headers(path, sheet=None):
+    """Header row of a sheet (default: the active one)."""
+    return read_sheet_header(path, sheet)[1]
+
+
+class SheetView:
+    """The cell API of one sheet in a WorkbookSession.
+
+    Writes are queued in the owning session, so every sheet of a file goes
+    out with the same save. ``listeners`` work as on the session.
+    """
+
+    def __init__(self, session, name, header=None):
+        self.session = session
+        self.name = name
+        self.listeners = []
+        if header is None:
+            header = read_headers(session.path, name)
+        self.schema = schema_for(header)
+
+    @property
+    def path(self):
+        return self.session.path
+
+    @property
+    def headers(self):
+        return list(self.schema.headers)
+
+    @property
+    def pending(self):
+        return self.session.pending
+
+    def write_cell(self, row, column, value):
+        self.session.pending_cells.setdefault((self.name, row), {})[column] = value
+        for listener in self.listeners:
+            listener(row, column, value)
+
+    def maybe_flush(self):
+        return self.session.maybe_flush()
+
+    def flush(self, force=False):
+        return self.session.flush(force)
+
+
+class WorkbookSession:
+    """Keeps one workbook open in memory and writes changes back in batches.
+
+    Only the header row is read up front. Written cells are queued in
+    ``pending_cells`` ({(sheet title, row): {column: value}}) and written out
+    by ``flush``. With ``incremental`` set, flush patches just those rows in
+    the file's sheet XML (see nodeaudit.xlsx_patch); the full workbook is
+    parsed and saved with openpyxl only when a change can't be patched.
+    Before saving, the file's mtime and size are compared with what we last
+    saw so edits made elsewhere are not clobbered.
+
+    The session's own cell API works on ``sheet`` (default: the active
+    sheet); ``view(name)`` gives the same API for any other sheet of the file.
+
+    Callables in ``listeners`` are called with (row, column, value) for every
+    written cell, so in-memory indexes can follow the writes.
+    Callables in ``flush_listeners`` are called with no arguments after each
+    successful flush.
+    """
+
+    def __init__(self, path, sheet=None, flush_every=25, flush_interval=30.0, incremental=True):
+        self.path = path
+        self.incremental = incremental
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.pending_cells = {}
+        self.flush_listeners = []
+        self._workbook = None
+        self._views = {}
+        title, header = read_sheet_header(path, sheet)
+        self.default_view = self._views[title] = SheetView(self, title, header)
+        self._open()
+
+    def _open(self):
+        self._stamp = self._disk_stamp()
+        self._workbook = None
+        self.pending_cells.clear()
+        self._last_flush = time.monotonic()
+
+    def _load(self):
+        self._stamp = self._disk_stamp()
+        with diagnostics.timer("workbook.load"):
+            self._workbook = load_workbook(self.path)
+
+    def _disk_stamp(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    @property
+    def workbook(self):
+        if self._workbook is None:
+            self._load()
+        return self._workbook
+
+    def view(self, name):
+        """SheetView for the named sheet; the same object is returned on every call."""
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = SheetView(self, name)
+        return view
+
+    @property
+    def sheet_name(self):
+        return self.default_view.name
+
+    @property
+    def schema(self):
+        return self.default_view.schema
+
+    @property
+    def listeners(self):
+        return self.default_view.listeners
+
+    @property
+    def loaded(self):
+        return self._workbook is not None
+
+    @property
+    def headers(self):
+        return self.default_view.headers
+
+    @property
+    def pending(self):
+        """Rows with cells waiting for the next flush."""
+        return len(self.pending_cells)
+
+    def modified_externally(self):
+        try:
+            return self._disk_stamp() != self._stamp
+        except FileNotFoundError:
+            return True
+
+    def write_cell(self, row, column, value):
+        self.default_view.write_cell(row, column, value)
+
+    def flush_due(self):
+        if not self.pending_cells:
+            return False
+        if len(self.pending_cells) >= self.flush_every:
+            return True
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def maybe_flush(self):
+        """Flush only if enough rows are dirty or the flush interval has passed."""
+        if self.flush_due():
+            return self.flush()
+        return False
+
+    def flush(self, force=False):
+        """Write all pending rows to disk. Returns True if anything was written.
+
+        Raises ExternalModificationError if the file changed on disk, unless
+        ``force`` is set.
+        """
+        if not self.pending_cells:
+            return False
+        if not force and self.modified_externally():
+            raise ExternalModificationError(f"{os.path.basename(self.path)} was modified outside NodeAudit")
+
+        # Save next to the original and swap it in so a failed save never leaves a half-written file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+        os.close(fd)
+        try:
+            if not self._patch(tmp_path):
+                self._save(tmp_path)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._stamp = self._disk_stamp()
+        self.pending_cells.clear()
+        self._last_flush = time.monotonic()
+        for listener in self.flush_listeners:
+            listener()
+        return True
+
+    def _patch(self, tmp_path):
+        """Write the pending cells by patching the file's XML; False if a full save is needed."""
+        if not self.incremental:
+            return False
+        changes = {}
+        for (name, row), cells in self.pending_cells.items():
+            changes.setdefault(name, {})[row] = cells
+        try:
+            with diagnostics.timer("workbook.patch"):
+                patch_workbook(self.path, tmp_path, changes)
+        except PatchUnsupported:
+            return False
+        # A workbook parsed earlier doesn't have these cells; parse again if it's needed
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        return True
+
+    def _save(self, tmp_path):
+        workbook = self.workbook
+        with diagnostics.timer("cells.apply"):
+            for (name, row), cells in self.pending_cells.items():
+                sheet = workbook[name]
+                for column, value in cells.items():
+                    sheet.cell(row=row, column=column).value = value
+        with diagnostics.timer("workbook.save"):
+            workbook.save(tmp_path)
+
+    def reload(self):
+        """Drop pending changes and re-read the file from disk."""
+        if self._workbook is not None:
+            self._workbook.close()
+        self._open()
+        for view in self._views.values():
+            view.schema = schema_for(read_headers(self.path, view.name))
+
+    def close(self, flush=True):
+        if flush:
+            self.flush()
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
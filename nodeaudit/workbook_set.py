@@ -0,0 +1,346 @@
+"""Several workbooks and sheets opened together behind one row space.
+
+Each (workbook, sheet) pair is a part. Parts are numbered one after the
+other: the first part's rows keep their sheet row numbers (2..max_row), the
+next part continues from there, and so on. With a single part the unified
+row numbers are exactly the sheet's own, so the single-workbook behaviour
+is unchanged.
+
+Sheets are scanned in worker processes when there is more than one, since
+openpyxl parsing is CPU-bound and holds the GIL. Writes go back per file:
+every workbook has its own WorkbookSession (all its sheets share one save)
+and its own journal.
+"""
+import os
+import bisect
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from openpyxl import load_workbook
+
+from nodeaudit.audit_summary import merge_summaries
+from nodeaudit.column_schema import PID_FIELDS, normalize_pid, schema_for
+from nodeaudit.diagnostics import diagnostics
+from nodeaudit.journal import Journal
+from nodeaudit.row_navigator import RowNavigator, scan_sheet
+from nodeaudit.workbook_session import WorkbookSession, ExternalModificationError
+
+
+def audit_sheets(path):
+    """Titles of the sheets whose header has a PID column; the active sheet if none has."""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        titles = []
+        for worksheet in workbook.worksheets:
+            header = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            schema = schema_for(tuple(header))
+            if any(field in schema for field in PID_FIELDS):
+                titles.append(worksheet.title)
+        return titles or [workbook.active.title]
+    finally:
+        workbook.close()
+
+
+def expand_sources(paths, sheets=None, all_sheets=False):
+    """[(path, sheet)] parts for some workbooks.
+
+    ``sheets`` names the sheets to open in every workbook (workbooks without
+    them are skipped); ``all_sheets`` opens every sheet with a PID column;
+    otherwise each workbook's active sheet is used (sheet None).
+    """
+    sources = []
+    for path in dict.fromkeys(os.path.abspath(path) for path in paths):
+        if sheets:
+            workbook = load_workbook(path, read_only=True)
+            try:
+                titles = workbook.sheetnames
+            finally:
+                workbook.close()
+            sources.extend((path, sheet) for sheet in sheets if sheet in titles)
+        elif all_sheets:
+            sources.extend((path, sheet) for sheet in audit_sheets(path))
+        else:
+            sources.append((path, None))
+    return sources
+
+
+def scan_parts(sources, max_workers=None, progress=None):
+    """SheetScans for [(path, sheet)] sources, in order.
+
+    ``progress(done, total, rows)`` reports rows scanned for a single source,
+    and finished parts (rows None) when several are scanned in parallel.
+    """
+    total = len(sources)
+    if total == 1:
+        path, sheet = sources[0]
+        report = (lambda rows: progress(0, 1, rows)) if progress else None
+        return [scan_sheet(path, sheet, report)]
+    workers = min(total, max_workers or os.cpu_count() or 1)
+    # spawn, not fork: the GUI calls this with Qt threads running
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(scan_sheet, path, sheet) for path, sheet in sources]
+        for done, _ in enumerate(as_completed(futures), start=1):
+            if progress:
+                progress(done, total, None)
+        return [future.result() for future in futures]
+
+
+class WorkbookPart:
+    """One sheet of one workbook inside a WorkbookSet; ``base`` + sheet row = unified row."""
+
+    def __init__(self, navigator, view, journal, base):
+        self.navigator = navigator
+        self.view = view
+        self.journal = journal
+        self.base = base
+
+    @property
+    def path(self):
+        return self.navigator.path
+
+    @property
+    def sheet(self):
+        return self.navigator.sheet
+
+    @property
+    def schema(self):
+        return self.view.schema
+
+    @property
+    def label(self):
+        return f"{os.path.basename(self.path)} / {self.sheet}"
+
+    def to_global(self, row):
+        return self.base + row
+
+
+class WorkbookSet:
+    """Navigation, PID lookup and write-back over several (workbook, sheet) parts.
+
+    Row arguments and results are unified row numbers. Use ``open`` to build
+    one; ``replayed`` and ``stale`` are the journal replay counts summed over
+    all files.
+    """
+
+    def __init__(self, parts, sessions, journals):
+        self.parts = parts
+        self.sessions = sessions
+        self.journals = journals
+        self.replayed = self.stale = 0
+        self._layout()
+
+    def _layout(self):
+        """Number the parts' rows one after another, from each navigator's current size."""
+        base = 0
+        for part in self.parts:
+            part.base = base
+            base += part.navigator.max_row - 1
+        self._bases = [part.base for part in self.parts]
+
+    @classmethod
+    @diagnostics.timed("workbook.open")
+    def open(cls, sources, journal=True, max_workers=None, progress=None, flush_every=25, flush_interval=30.0):
+        scans = scan_parts(sources, max_workers, progress)
+        sessions = {}
+        journals = {}
+        parts = []
+        for (path, sheet), scan in zip(sources, scans):
+            session = sessions.get(path)
+            if session is None:
+                session = sessions[path] = WorkbookSession(path, scan.title, flush_every, flush_interval)
+            view = session.view(scan.title)
+            navigator = RowNavigator(path, scan=scan)
+            view.listeners.append(navigator.cell_written)
+            parts.append(WorkbookPart(navigator, view, None, 0))
+        workbooks = cls(parts, sessions, journals)
+        if journal:
+            # Replay after the navigators are listening, so recovered writes show up in navigation
+            for path, session in sessions.items():
+                journals[path] = Journal.for_workbook(path)
+                replayed, stale = journals[path].replay(session)
+                session.flush_listeners.append(journals[path].checkpoint)
+                workbooks.replayed += replayed
+                workbooks.stale += stale
+            for part in parts:
+                part.journal = journals[part.path]
+            # Replayed rows past the end of a sheet push the parts after it down
+            workbooks._layout()
+        return workbooks
+
+    # Row space
+
+    @property
+    def max_row(self):
+        last = self.parts[-1]
+        return last.base + last.navigator.max_row
+
+    def part_for(self, row):
+        """(part, sheet row) for a unified row; rows past the end belong to the last part."""
+        i = bisect.bisect_right(self._bases, row - 2) - 1
+        if i < 0:
+            raise IndexError(f"row {row} out of range 2..{self.max_row}")
+        part = self.parts[i]
+        return part, row - part.base
+
+    def describe(self, row):
+        """Where a unified row lives, for status text: "north.xlsx / Sheet1, row 5"."""
+        part, local = self.part_for(row)
+        return f"{part.label}, row {local}"
+
+    @property
+    def label(self):
+        files = len(self.sessions)
+        if len(self.parts) == 1:
+            return os.path.basename(self.parts[0].path)
+        return f"{files} workbook(s), {len(self.parts)} sheets"
+
+    def schema_at(self, row):
+        return self.part_for(row)[0].schema
+
+    def problems(self):
+        """Column problems of every part, labelled when there is more than one."""
+        problems = []
+        for part in self.parts:
+            text = part.schema.problems()
+            if text:
+                problems.append(text if len(self.parts) == 1 else f"{part.label}:\n{text}")
+        return "\n\n".join(problems)
+
+    # Navigator API, in unified rows
+
+    def row(self, row):
+        part, local = self.part_for(row)
+        return part.navigator.row(local)
+
+    def value(self, row, field):
+        part, local = self.part_for(row)
+        return part.navigator.value(local, field)
+
+    def set_value(self, row, field, value):
+        part, local = self.part_for(row)
+        part.navigator.set_value(local, field, value)
+
+    def cell_written(self, row, column, value):
+        part, local = self.part_for(row)
+        part.navigator.cell_written(local, column, value)
+
+    def locate(self, pid):
+        pid = normalize_pid(pid)
+        return [(part.to_global(row), slot) for part in self.parts for row, slot in part.navigator.locate(pid)]
+
+    def row_pids(self, row):
+        part, local = self.part_for(row)
+        return part.navigator.row_pids(local)
+
+    def pid_locations(self):
+        """{pid: [(row, slot), ...]} over every part."""
+        locations = {}
+        for part in self.parts:
+            for pid, places in part.navigator.pid_index.items():
+                locations.setdefault(pid, []).extend((part.to_global(row), slot) for row, slot in places)
+        return locations
+
+    def split_locations(self, locations):
+        """{part: {pid: [(sheet row, slot)]}} for unified-row locations."""
+        by_part = {}
+        for pid, places in locations.items():
+            for row, slot in places:
+                part, local = self.part_for(row)
+                by_part.setdefault(part, {}).setdefault(pid, []).append((local, slot))
+        return by_part
+
+    def next_incomplete(self, after=1):
+        """First row after ``after`` still missing a PID, Node or Build State, wrapping to the top; None if none is."""
+        for wrapped in (False, True):
+            for part in self.parts:
+                start = 1 if wrapped else after - part.base
+                if start > part.navigator.max_row:
+                    continue
+                row = part.navigator.completeness.next_after(start)
+                if row is not None:
+                    return part.to_global(row)
+        return None
+
+    def summary(self):
+        """Build State / Config counts: {"total": ..., "parts": [... with "label"]}; see nodeaudit.audit_summary."""
+        parts = [dict(part.navigator.summary_dict(), label=part.label) for part in self.parts]
+        return {"total": merge_summaries(parts), "parts": parts}
+
+    def search(self, query, limit=50):
+        """[(row, field, value)] matching ``query`` in any part: exact, then prefix, then substring matches."""
+        with diagnostics.timer("search.query"):
+            hits = [(rank, part.to_global(row), field, value)
+                    for part in self.parts for rank, row, field, value in part.navigator.search(query, limit)]
+            hits.sort(key=lambda hit: hit[:2])
+            return [hit[1:] for hit in hits[:limit]]
+
+    def missing(self, row):
+        """nodeaudit.completeness flags for a row (0 when nothing is missing)."""
+        part, local = self.part_for(row)
+        return part.navigator.completeness.missing(local)
+
+    @property
+    def incomplete_count(self):
+        return sum(len(part.navigator.completeness) for part in self.parts)
+
+    def duplicates(self):
+        """{pid: [rows]} for PIDs on more than one row, in any workbook or sheet."""
+        found = {}
+        for pid, places in self.pid_locations().items():
+            rows = sorted({row for row, _ in places})
+            if len(rows) > 1:
+                found[pid] = rows
+        return found
+
+    # Write-back, per file
+
+    def write_cell(self, row, column, value):
+        part, local = self.part_for(row)
+        part.view.write_cell(local, column, value)
+
+    def append_journal(self, kind, row, cells):
+        """Journal a write in its workbook's journal; returns (path, seq), or None without journals."""
+        part, local = self.part_for(row)
+        if part.journal is None:
+            return None
+        session = self.sessions[part.path]
+        sheet = None if part.view is session.default_view else part.sheet
+        return part.path, part.journal.append(kind, local, cells, sheet)
+
+    def mark_applied(self, seqs):
+        """Mark {path: seq} journal positions as written into the in-memory workbooks."""
+        for path, seq in seqs.items():
+            self.journals[path].mark_applied(seq)
+
+    @property
+    def pending(self):
+        return sum(session.pending for session in self.sessions.values())
+
+    def _each_session(self, flush):
+        # A file changed elsewhere must not keep the other files from being written
+        wrote = False
+        conflicts = []
+        for session in self.sessions.values():
+            try:
+                wrote = flush(session) or wrote
+            except ExternalModificationError:
+                conflicts.append(os.path.basename(session.path))
+        if conflicts:
+            raise ExternalModificationError(f"{', '.join(conflicts)} modified outside NodeAudit")
+        return wrote
+
+    def maybe_flush(self):
+        return self._each_session(lambda session: session.maybe_flush())
+
+    def flush(self, force=False):
+        return self._each_session(lambda session: session.flush(force))
+
+    def close(self, flush=True):
+        try:
+            if flush:
+                self.flush()
+        finally:
+            for session in self.sessions.values():
+                session.close(flush=False)
+            for journal in self.journals.values():
+                journal.close()
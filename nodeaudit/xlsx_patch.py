@@ -0,0 +1,328 @@
+"""Write changed cells straight into an .xlsx file's sheet XML.
+
+openpyxl can only save by parsing the whole workbook and serializing every
+part again, which takes seconds on a large audit sheet and drops whatever
+openpyxl does not model. ``patch_workbook`` instead copies the zip entry by
+entry, streams each affected sheet's XML through in chunks and rewrites only
+the ``<row>``/``<c>`` elements of the changed rows; everything else goes out
+byte for byte. New text is added to the shared-string table, reusing an
+existing entry when an identical one is found.
+
+Anything that cannot be patched safely (a formula in a changed cell, rows
+without ``r`` attributes, non-UTF-8 or prefixed sheet XML, values other than
+text, numbers and booleans) raises PatchUnsupported, and the caller falls
+back to a full openpyxl save.
+"""
+import re
+import math
+import shutil
+import zipfile
+import posixpath
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils.cell import range_boundaries
+
+CHUNK = 1 << 20
+# Recompressing a large sheet dominates the patch time; level 1 is several times faster than the default
+SHEET_COMPRESSLEVEL = 1
+
+_ROW_RE = re.compile(rb"<row\b[^>]*?(/?)>")
+_ROW_NUM_RE = re.compile(rb'\sr="(\d+)"')
+_CELL_RE = re.compile(rb"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+_CELL_REF_RE = re.compile(rb'\sr="([A-Z]+)(\d+)"')
+_STYLE_RE = re.compile(rb'\ss="(\d+)"')
+_SPANS_RE = re.compile(rb'\sspans="[^"]*"')
+_DIMENSION_RE = re.compile(rb'(<dimension\s+ref=")([^"]*)("\s*/>)')
+_ENCODING_RE = re.compile(rb'<\?xml[^>]*encoding="([^"]+)"')
+_SHEET_DATA_RE = re.compile(rb"<sheetData\s*(/?)>")
+_SST_RE = re.compile(rb"<sst\b[^>]*?(/?)>")
+_UNIQUE_COUNT_RE = re.compile(rb'\suniqueCount="\d+"')
+_COUNT_RE = re.compile(rb'\scount="(\d+)"')
+# Control characters XML 1.0 can't carry; openpyxl refuses them too
+_ILLEGAL_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class PatchUnsupported(Exception):
+    """The change can't be written by patching the XML; save with openpyxl instead."""
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _relationships(zin, rels_name, directory):
+    """{Id: (type, part name)} of a .rels part; targets are resolved against ``directory``."""
+    root = ElementTree.fromstring(zin.read(rels_name))
+    relationships = {}
+    for rel in root:
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target")
+        name = target[1:] if target.startswith("/") else posixpath.normpath(posixpath.join(directory, target))
+        relationships[rel.get("Id")] = (rel.get("Type"), name)
+    return relationships
+
+
+def locate_parts(zin):
+    """({sheet title: sheet XML part}, shared strings part or None) of an open xlsx zip."""
+    package = _relationships(zin, "_rels/.rels", "")
+    workbook_part = next(name for type_, name in package.values() if type_.endswith("/officeDocument"))
+    directory, filename = posixpath.split(workbook_part)
+    rels = _relationships(zin, posixpath.join(directory, "_rels", filename + ".rels"), directory)
+    sheets = {}
+    for element in ElementTree.fromstring(zin.read(workbook_part)).iter():
+        if _local(element.tag) == "sheet":
+            rel_id = next(value for key, value in element.attrib.items() if _local(key) == "id")
+            sheets[element.get("name")] = rels[rel_id][1]
+    shared = next((name for type_, name in rels.values() if type_.endswith("/sharedStrings")), None)
+    return sheets, shared
+
+
+def _text_xml(text):
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f"<t{space}>{escape(text)}</t>"
+
+
+class SharedStrings:
+    """Append-only editor for sharedStrings.xml.
+
+    Existing entries are found by a byte search for the exact ``<si>`` we
+    would write, so the table is never parsed; text not found is appended.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.size = self._entries_before(len(data))
+        self.added = []
+        self.references = 0
+        self._known = {}
+
+    def _entries_before(self, end):
+        return self.data.count(b"<si>", 0, end) + self.data.count(b"<si ", 0, end)
+
+    def index(self, text):
+        self.references += 1
+        index = self._known.get(text)
+        if index is None:
+            entry = f"<si>{_text_xml(text)}</si>".encode("utf-8")
+            pos = self.data.find(entry)
+            if pos >= 0:
+                index = self._entries_before(pos)
+            else:
+                index = self.size + len(self.added)
+                self.added.append(entry)
+            self._known[text] = index
+        return index
+
+    def to_bytes(self):
+        if not self.added:
+            return self.data
+        match = _SST_RE.search(self.data)
+        if not match:
+            raise PatchUnsupported("unrecognised shared strings table")
+        tag = match.group(0)
+        if match.group(1):
+            tag = tag[:-2] + b">"
+        tag = _UNIQUE_COUNT_RE.sub(b"", tag)
+        tag = tag[:-1] + b' uniqueCount="%d">' % (self.size + len(self.added))
+        tag = _COUNT_RE.sub(lambda m: b' count="%d"' % (int(m.group(1)) + self.references), tag)
+        if match.group(1):
+            return self.data[:match.start()] + tag + b"".join(self.added) + b"</sst>" + self.data[match.end():]
+        end = self.data.rindex(b"</sst>")
+        return self.data[:match.start()] + tag + self.data[match.end():end] + b"".join(self.added) + self.data[end:]
+
+
+def _cell_xml(ref, value, style, strings):
+    attrs = f' r="{ref}"' + (f' s="{style}"' if style else "")
+    if value is None or value == "":
+        return f"<c{attrs}/>"
+    if isinstance(value, bool):
+        return f'<c{attrs} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and not math.isfinite(value):
+            raise PatchUnsupported(f"can't write {value!r}")
+        return f"<c{attrs}><v>{value!r}</v></c>"
+    if isinstance(value, str):
+        # openpyxl would store a leading "=" as a formula
+        if value.startswith("=") or _ILLEGAL_RE.search(value):
+            raise PatchUnsupported(f"can't write {value!r} as plain text")
+        if strings is None:
+            return f'<c{attrs} t="inlineStr"><is>{_text_xml(value)}</is></c>'
+        return f'<c{attrs} t="s"><v>{strings.index(value)}</v></c>'
+    raise PatchUnsupported(f"can't write {type(value).__name__} values")
+
+
+def _row_xml(row, cells, strings, start=None, body=b""):
+    """A complete ``<row>`` with ``cells`` ({column: value}) merged into its existing ``body``."""
+    out = {}
+    styles = {}
+    if body:
+        if _CELL_RE.sub(b"", body).strip():
+            raise PatchUnsupported(f"row {row} holds something other than cells")
+        for match in _CELL_RE.finditer(body):
+            ref = _CELL_REF_RE.search(match.group(1))
+            if not ref or int(ref.group(2)) != row:
+                raise PatchUnsupported(f"row {row} has cells without references")
+            col = column_index_from_string(ref.group(1).decode("ascii"))
+            if col in cells:
+                if match.group(2) and b"<f" in match.group(2):
+                    raise PatchUnsupported(f"row {row} column {col} holds a formula")
+                style = _STYLE_RE.search(match.group(1))
+                styles[col] = style.group(1).decode("ascii") if style else None
+            out[col] = match.group(0)
+    for col, value in cells.items():
+        out[col] = _cell_xml(f"{get_column_letter(col)}{row}", value, styles.get(col), strings).encode("utf-8")
+    # The spans hint may no longer cover the row's cells; it's optional, so drop it
+    start = _SPANS_RE.sub(b"", start) if start else b'<row r="%d">' % row
+    return start + b"".join(out[col] for col in sorted(out)) + b"</row>"
+
+
+class _SheetPatcher:
+    """Streams one sheet's XML, replacing or inserting the rows in ``rows`` ({row: {column: value}})."""
+
+    def __init__(self, rows, strings, write):
+        self.rows = rows
+        self.pending = sorted(rows)
+        self.strings = strings
+        self.write = write
+        self.last_row = 0
+
+    def new_rows_before(self, row):
+        while self.pending and self.pending[0] < row:
+            number = self.pending.pop(0)
+            self.write(_row_xml(number, self.rows[number], self.strings))
+
+    def head(self, data):
+        match = _ENCODING_RE.match(data)
+        if match and match.group(1).lower() not in (b"utf-8", b"utf8"):
+            raise PatchUnsupported(f"sheet XML is {match.group(1).decode()}")
+        dimension = _DIMENSION_RE.search(data)
+        if dimension:
+            min_col, min_row, max_col, max_row = range_boundaries(dimension.group(2).decode("ascii"))
+            max_row = max(max_row or 1, max(self.rows))
+            max_col = max(max_col or 1, max(col for cells in self.rows.values() for col in cells))
+            ref = f"{get_column_letter(min_col or 1)}{min_row or 1}:{get_column_letter(max_col)}{max_row}"
+            data = data[:dimension.start(2)] + ref.encode("ascii") + data[dimension.end(2):]
+        self.write(data)
+
+    def rows_chunk(self, data):
+        """Handle a run of complete ``<row>`` elements."""
+        if not self.pending:
+            self.write(data)
+            return
+        last = data.rfind(b"<row")
+        if last < 0:
+            self.write(data)
+            return
+        number = _ROW_NUM_RE.search(data, last, data.index(b">", last))
+        if not number:
+            raise PatchUnsupported("rows without r attributes")
+        if int(number.group(1)) < self.pending[0]:
+            self.write(data)
+            return
+        pos = 0
+        for match in _ROW_RE.finditer(data):
+            number = _ROW_NUM_RE.search(match.group(0))
+            if not number:
+                raise PatchUnsupported("rows without r attributes")
+            row = int(number.group(1))
+            if row <= self.last_row:
+                raise PatchUnsupported("rows out of order")
+            self.last_row = row
+            if not self.pending or self.pending[0] > row:
+                continue
+            self.write(data[pos:match.start()])
+            pos = match.start()
+            self.new_rows_before(row)
+            if self.pending and self.pending[0] == row:
+                self.pending.pop(0)
+                if match.group(1):
+                    start, body, end = match.group(0)[:-2] + b">", b"", match.end()
+                else:
+                    end = data.index(b"</row>", match.end())
+                    start, body, end = match.group(0), data[match.end():end], end + len(b"</row>")
+                self.write(_row_xml(row, self.rows[row], self.strings, start, body))
+                pos = end
+        self.write(data[pos:])
+
+    def run(self, source):
+        buffer = b""
+        while True:
+            chunk = source.read(CHUNK)
+            buffer += chunk
+            match = _SHEET_DATA_RE.search(buffer)
+            if match:
+                break
+            if not chunk:
+                raise PatchUnsupported("no sheetData element")
+        self.head(buffer[:match.start()])
+        buffer = buffer[match.end():]
+        if match.group(1):
+            # <sheetData/>: nothing to merge with
+            self.write(b"<sheetData>")
+            self.new_rows_before(float("inf"))
+            self.write(b"</sheetData>")
+        else:
+            self.write(match.group(0))
+            while True:
+                end = buffer.find(b"</sheetData>")
+                if end >= 0:
+                    self.rows_chunk(buffer[:end])
+                    self.new_rows_before(float("inf"))
+                    buffer = buffer[end:]
+                    break
+                # Everything before the last row start is a run of complete rows
+                cut = buffer.rfind(b"<row")
+                if cut > 0:
+                    self.rows_chunk(buffer[:cut])
+                    buffer = buffer[cut:]
+                chunk = source.read(CHUNK)
+                if not chunk:
+                    raise PatchUnsupported("sheetData is not closed")
+                buffer += chunk
+        self.write(buffer)
+        for chunk in iter(lambda: source.read(CHUNK), b""):
+            self.write(chunk)
+
+
+def _copy_info(info):
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    copy.compress_type = info.compress_type
+    copy.external_attr = info.external_attr
+    copy.create_system = info.create_system
+    return copy
+
+
+def patch_workbook(path, out_path, changes):
+    """Write the xlsx at ``path`` to ``out_path`` with ``changes`` ({sheet title: {row: {column: value}}}) applied.
+
+    Raises PatchUnsupported if the change needs a full openpyxl save.
+    """
+    try:
+        with zipfile.ZipFile(path) as zin:
+            sheets, shared_name = locate_parts(zin)
+            parts = {}
+            for title, rows in changes.items():
+                if title not in sheets:
+                    raise PatchUnsupported(f"sheet {title!r} not found")
+                if rows:
+                    parts[sheets[title]] = rows
+            strings = SharedStrings(zin.read(shared_name)) if shared_name else None
+            with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED, compresslevel=SHEET_COMPRESSLEVEL) as zout:
+                for info in zin.infolist():
+                    if info.filename == shared_name:
+                        continue
+                    if info.filename in parts:
+                        # Opened by name so the entry gets the archive's compression level
+                        with zin.open(info) as source, zout.open(info.filename, "w") as target:
+                            _SheetPatcher(parts[info.filename], strings, target.write).run(source)
+                    else:
+                        with zin.open(info) as source, zout.open(_copy_info(info), "w") as target:
+                            shutil.copyfileobj(source, target, CHUNK)
+                # Last, once the sheets have added their strings
+                if shared_name:
+                    zout.writestr(_copy_info(zin.getinfo(shared_name)), strings.to_bytes())
+    except (KeyError, StopIteration, ValueError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        raise PatchUnsupported(str(e)) from e
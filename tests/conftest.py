@@ -0,0 +1,10 @@
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES_DIR, name)
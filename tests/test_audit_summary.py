@@ -0,0 +1,59 @@
+"""Build State / Config counts and their totals across sheets."""
+from openpyxl import Workbook
+
+from nodeaudit.audit_summary import BLANK, AuditSummary, merge_summaries
+from nodeaudit.workbook_set import WorkbookSet, expand_sources
+
+
+def test_merge_adds_up_every_sheet():
+    north = AuditSummary({"BUILD STATE": ["Design Approved", "Rejected", None],
+                          "CONFIG": ["1x1", "1x1", "8x8"]}, 4).to_dict()
+    north["incomplete"] = 2
+    # A sheet without a Config column only adds to the Build State counts
+    south = AuditSummary({"BUILD STATE": ["Rejected", " ", "Design Approved", "Rejected"]}, 5).to_dict()
+    south["incomplete"] = 1
+    merged = merge_summaries([north, south])
+    assert merged["rows"] == 7
+    assert merged["incomplete"] == 3
+    # Known values first (zeros included), then the rest by count, blanks last
+    assert list(merged["fields"]["BUILD STATE"].items()) == [
+        ("Design Approved", 2), ("In Progress", 0), ("In Design", 0), ("Does Not Exist", 0), ("PRO-I", 0),
+        ("Rejected", 3), (BLANK, 2)]
+    assert merged["fields"]["CONFIG"] == {"1x1": 2, "2x2": 0, "4x4": 0, "N/A": 0, "8x8": 1}
+
+
+def test_merge_without_incomplete_counts():
+    summary = AuditSummary({"CONFIG": ["2x2"]}, 2).to_dict()
+    assert merge_summaries([summary, summary]) == {"rows": 2, "fields": {"CONFIG": {
+        "1x1": 0, "2x2": 2, "4x4": 0, "N/A": 0}}}
+    assert merge_summaries([]) == {"rows": 0, "fields": {}}
+
+
+def test_workbook_set_summary_totals_its_parts(tmp_path):
+    path = str(tmp_path / "audit.xlsx")
+    workbook = Workbook()
+    north = workbook.active
+    north.title = "North"
+    north.append(["PID 1", "NODE 1", "Build State"])
+    north.append(["N1", "NODE-1", "In Progress"])
+    north.append(["N2", None, "In Progress"])
+    south = workbook.create_sheet("South")
+    south.append(["PID 1", "NODE 1", "Build State"])
+    south.append(["S1", "NODE-S1", "Design Approved"])
+    workbook.save(path)
+    workbooks = WorkbookSet.open(expand_sources([path], all_sheets=True), journal=False)
+    try:
+        report = workbooks.summary()
+        assert [part["label"] for part in report["parts"]] == ["audit.xlsx / North", "audit.xlsx / South"]
+        total = report["total"]
+        assert total["rows"] == 3
+        assert total["fields"]["BUILD STATE"]["In Progress"] == 2
+        assert total["fields"]["BUILD STATE"]["Design Approved"] == 1
+        assert total["incomplete"] == sum(part["incomplete"] for part in report["parts"]) == 1
+        # A write moves the row between counts
+        workbooks.cell_written(3, 3, "Design Approved")
+        total = workbooks.summary()["total"]
+        assert total["fields"]["BUILD STATE"]["In Progress"] == 1
+        assert total["fields"]["BUILD STATE"]["Design Approved"] == 2
+    finally:
+        workbooks.close(flush=False)
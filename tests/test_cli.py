@@ -0,0 +1,71 @@
+"""The headless ``python -m nodeaudit apply`` command."""
+import json
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from nodeaudit.cli import main
+
+
+def make_workbook(path):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["PID 1", "NODE 1", "PID 2", "NODE 2", "Build State"])
+    sheet.append(["P1", None, "P1B", None, "In Progress"])
+    sheet.append(["P2", None, None, None, None])
+    sheet["A1"].font = Font(bold=True)
+    workbook.save(path)
+
+
+def read_rows(path):
+    workbook = load_workbook(path)
+    try:
+        sheet = workbook.active
+        return [list(row) for row in sheet.iter_rows(values_only=True)], sheet["A1"].font.bold
+    finally:
+        workbook.close()
+
+
+def test_apply_writes_the_updates(tmp_path, capsys):
+    workbook = str(tmp_path / "audit.xlsx")
+    make_workbook(workbook)
+    updates = tmp_path / "updates.csv"
+    updates.write_text("PID,Node 2,Build State,row\n"
+                       "P1B ,NODE-1B,Design Approved,\n"
+                       ",NODE-4,In Design,4\n", encoding="utf-8")
+    assert main(["apply", str(updates), workbook]) == 0
+    rows, bold = read_rows(workbook)
+    assert rows == [
+        ["PID 1", "NODE 1", "PID 2", "NODE 2", "Build State"],
+        ["P1", None, "P1B", "NODE-1B", "Design Approved"],
+        ["P2", None, None, None, None],
+        [None, None, None, "NODE-4", "In Design"],
+    ]
+    assert bold
+    assert "updated: 1, appended: 1, unmatched PIDs: 0" in capsys.readouterr().out
+
+
+def test_apply_reports_unmatched_pids(tmp_path, capsys):
+    workbook = str(tmp_path / "audit.xlsx")
+    output = str(tmp_path / "out.xlsx")
+    make_workbook(workbook)
+    updates = tmp_path / "updates.jsonl"
+    updates.write_text("\n".join(json.dumps(update) for update in (
+        {"PID": "P2", "NODE 1": "NODE-2"},
+        {"PID": "MISSING", "NODE 1": "NODE-X"},
+    )) + "\n", encoding="utf-8")
+    assert main(["apply", str(updates), workbook, "-o", output]) == 1
+    assert "no row has PID MISSING" in capsys.readouterr().err
+    assert read_rows(output)[0][2] == ["P2", "NODE-2", None, None, None]
+    # The input workbook is left alone when writing elsewhere
+    assert read_rows(workbook)[0][2] == ["P2", None, None, None, None]
+
+
+def test_apply_rejects_unknown_columns(tmp_path, capsys):
+    workbook = str(tmp_path / "audit.xlsx")
+    make_workbook(workbook)
+    updates = tmp_path / "updates.csv"
+    updates.write_text("PID,Colour\nP1,red\n", encoding="utf-8")
+    assert main(["apply", str(updates), workbook]) == 2
+    assert "Unknown column" in capsys.readouterr().err
+    assert read_rows(workbook)[0][1] == ["P1", None, "P1B", None, "In Progress"]
@@ -0,0 +1,27 @@
+"""Header matching for the sheet fields."""
+from nodeaudit.column_schema import BUILD_STATE, CONFIG, schema_for
+
+
+def test_build_state_column_beats_notes_and_state():
+    schema = schema_for(["PID 1", "Notes", "State", "Build  State"])
+    assert schema.column(BUILD_STATE) == 4
+    # The looser names aren't reported as competing with the real column
+    assert BUILD_STATE not in schema.ambiguous
+    assert "BUILD STATE" not in schema.problems()
+
+
+def test_notes_then_state_when_there_is_no_build_state_column():
+    assert schema_for(["PID 1", "State", "NOTES"]).column(BUILD_STATE) == 3
+    assert schema_for(["PID 1", "state"]).column(BUILD_STATE) == 2
+    schema = schema_for(["PID 1", "Notes", "Notes"])
+    assert schema.column(BUILD_STATE) == 2
+    assert schema.ambiguous[BUILD_STATE] == ["Notes", "Notes"]
+    assert BUILD_STATE in schema_for(["PID 1"]).unmapped
+
+
+def test_preferred_alias_then_leftmost_column():
+    schema = schema_for(["Config", "PID 1", "AOI Node", "Build State", "BUILD STATE"])
+    assert schema.column(CONFIG) == 3
+    assert schema.ambiguous[CONFIG] == ["AOI Node", "Config"]
+    assert schema.column(BUILD_STATE) == 4
+    assert schema.ambiguous[BUILD_STATE] == ["Build State", "BUILD STATE"]
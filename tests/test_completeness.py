@@ -0,0 +1,82 @@
+"""Rows still missing a PID, Node or Build State, and "Next incomplete"."""
+from openpyxl import Workbook
+
+from nodeaudit.completeness import (CompletenessIndex, MISSING_BUILD_STATE, MISSING_NODE, MISSING_PID,
+                                    describe_missing)
+from nodeaudit.workbook_set import WorkbookSet, expand_sources
+
+
+def make_columns():
+    return {
+        "PID 1": ["P1", "P2", None, "P4", None, None, None],
+        "NODE 1": ["N1", None, None, "N4", None, "N7", None],
+        "PID 2": [None, None, None, "P4B", None, None, None],
+        "NODE 2": [None, None, None, None, None, None, None],
+        "BUILD STATE": ["Design Approved", "In Progress", None, "Rejected", "  ", None, None],
+    }
+
+
+def test_flags_and_next_after():
+    index = CompletenessIndex(make_columns(), 8)
+    # Rows 4 and 8 are blank and row 6 only has whitespace: blank rows aren't work
+    assert [index.missing(row) for row in range(2, 9)] == [
+        0, MISSING_NODE, 0, MISSING_NODE, 0, MISSING_PID | MISSING_BUILD_STATE, 0]
+    assert describe_missing(index.missing(7)) == "PID, Build State"
+    assert index.rows == [3, 5, 7] and len(index) == 3
+    assert index.next_after(1) == 3
+    assert index.next_after(3) == 5
+    assert index.next_after(7) is None
+    assert index.missing(100) == 0
+
+
+def test_update_after_a_write():
+    columns = make_columns()
+    index = CompletenessIndex(columns, 8)
+    columns["NODE 1"][1] = "N2"
+    index.update(3)
+    assert index.next_after(1) == 5
+    columns["BUILD STATE"][0] = None
+    index.update(2)
+    assert index.rows == [2, 5, 7]
+    assert index.next_after(1) == 2
+    # Rows past the end are indexed when first written
+    for values in columns.values():
+        values.append(None)
+    columns["PID 1"][7] = "P9"
+    index.update(9)
+    assert index.rows == [2, 5, 7, 9]
+    assert index.missing(9) == MISSING_NODE | MISSING_BUILD_STATE
+
+
+def make_workbook(path):
+    workbook = Workbook()
+    north = workbook.active
+    north.title = "North"
+    north.append(["PID 1", "NODE 1", "Build State"])
+    north.append(["N1", None, "In Progress"])
+    north.append(["N2", "NODE-2", "Design Approved"])
+    south = workbook.create_sheet("South")
+    south.append(["PID 1", "NODE 1", "Build State"])
+    south.append(["S1", "NODE-S1", "Design Approved"])
+    south.append(["S2", "NODE-S2", None])
+    workbook.save(path)
+
+
+def test_next_incomplete_wraps_around_every_sheet(tmp_path):
+    path = str(tmp_path / "audit.xlsx")
+    make_workbook(path)
+    workbooks = WorkbookSet.open(expand_sources([path], all_sheets=True), journal=False)
+    try:
+        # North is rows 2-3, South rows 4-5
+        assert workbooks.incomplete_count == 2
+        assert workbooks.next_incomplete() == 2
+        assert workbooks.next_incomplete(2) == 5
+        assert workbooks.next_incomplete(5) == 2
+        # Once the row is filled in, it's skipped
+        workbooks.cell_written(2, 2, "NODE-1")
+        assert workbooks.incomplete_count == 1
+        assert workbooks.next_incomplete(5) == 5
+        workbooks.cell_written(5, 3, "Rejected")
+        assert workbooks.next_incomplete(3) is None
+    finally:
+        workbooks.close(flush=False)
@@ -0,0 +1,95 @@
+"""Design Review browser results reaching the entry form (offscreen Qt, no web engine needed)."""
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt5.QtWidgets")
+
+import main
+from nodeaudit.prism_cache import PrismCache
+from nodeaudit.prism_extract import PrismRecord
+
+DESIGN_URL_TEMPLATE = "https://prism.example/design?pid={pid}"
+
+
+@pytest.fixture(scope="module")
+def app():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "load_settings", lambda: {"prism_url_template": DESIGN_URL_TEMPLATE})
+    monkeypatch.setattr(main, "save_settings", lambda settings: None)
+    monkeypatch.setattr(main, "app_dir", lambda: str(tmp_path))
+    window = main.ExcelAutomationApp()
+    window.prism_cache = PrismCache(str(tmp_path / "prism_cache.sqlite3"))
+    yield window
+    window.close()
+
+
+def test_unrelated_page_leaves_build_state_alone(window):
+    bridge = main.Bridge(window)
+    window.build_state_dropdown.setCurrentText("PRO-I")
+    for url in ("https://www.google.com/", "https://prism.example/search?q=north", ""):
+        bridge.last_key = None
+        bridge.receive_record(PrismRecord(), url)
+        assert window.build_state_dropdown.currentText() == "PRO-I"
+
+
+def test_design_page_without_design_falls_back_to_in_progress(window):
+    bridge = main.Bridge(window)
+    bridge.receive_record(PrismRecord(), "https://prism.example/design?pid=123")
+    assert window.build_state_dropdown.currentText() == "In Progress"
+
+
+def test_design_page_keeps_build_state_chosen_by_operator(window):
+    bridge = main.Bridge(window)
+    window.build_state_dropdown.setCurrentText("Does Not Exist")
+    bridge.receive_record(PrismRecord(), "https://prism.example/design?pid=123")
+    assert window.build_state_dropdown.currentText() == "Does Not Exist"
+    # Later loads of the same page don't change it either
+    bridge.last_key = None
+    bridge.receive_record(PrismRecord(), "https://prism.example/design?pid=123")
+    assert window.build_state_dropdown.currentText() == "Does Not Exist"
+
+
+def load_rows(window, tmp_path, rows):
+    from openpyxl import Workbook
+    from nodeaudit.workbook_set import WorkbookSet, expand_sources
+    path = str(tmp_path / "audit.xlsx")
+    workbook = Workbook()
+    workbook.active.append(["PID 1", "NODE 1", "PID 2", "NODE 2", "Build State"])
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    window.workbooks = WorkbookSet.open(expand_sources([path]), journal=False)
+    window.excel_file_path = path
+
+
+def test_page_approval_folds_the_row_build_state(window, tmp_path):
+    load_rows(window, tmp_path, [["A1", None, "R1", None, None],
+                                 ["A2", None, "U2", None, None],
+                                 ["A3", None, "P3", None, None]])
+    window.prism_cache.put(PrismRecord(pid="p3", node="N-P3", status="Design Approved"))
+    try:
+        window.apply_prism_records([
+            PrismRecord(pid="A1", node="N-A1", status="Design Approved"),
+            PrismRecord(pid="R1", node="N-R1", status="Rejected"),
+            PrismRecord(pid="A2", node="N-A2", status="Design Approved"),
+            PrismRecord(pid="A3", node="N-A3", status="Design Approved"),
+        ])
+        workbooks = window.workbooks
+        # One rejected PID keeps the row Rejected
+        assert workbooks.value(2, "NODE 1") == "N-A1"
+        assert workbooks.value(2, "BUILD STATE") == "Rejected"
+        # An unknown PID leaves the Build State alone, but the node is still written
+        assert workbooks.value(3, "NODE 1") == "N-A2"
+        assert workbooks.value(3, "BUILD STATE") is None
+        # Every PID approved, one of them from the cache
+        assert workbooks.value(4, "BUILD STATE") == "Design Approved"
+    finally:
+        window.workbooks.close(flush=False)
+        window.workbooks = None
@@ -0,0 +1,104 @@
+"""Journal replay after a crash, stale entries and checkpoints."""
+import json
+import os
+import types
+
+from openpyxl import Workbook, load_workbook
+
+from nodeaudit import journal as journal_module
+from nodeaudit.journal import Journal
+from nodeaudit.workbook_session import WorkbookSession
+
+
+def make_workbook(path, node=None):
+    workbook = Workbook()
+    workbook.active.append(["PID 1", "NODE 1"])
+    workbook.active.append(["P1", node])
+    workbook.active.append(["P2", None])
+    workbook.save(path)
+
+
+def cell(path, row, column):
+    workbook = load_workbook(path)
+    try:
+        return workbook.active.cell(row, column).value
+    finally:
+        workbook.close()
+
+
+def crash(journal):
+    """Stop using a journal the way a killed process would: no flush, no close()."""
+    journal._file.close()
+
+
+def test_writes_that_never_reached_the_workbook_are_replayed(tmp_path):
+    path = str(tmp_path / "audit.xlsx")
+    make_workbook(path)
+    journal = Journal.for_workbook(path)
+    journal.append("row", 2, {2: "NODE-1"})
+    journal.append("approval", 3, {2: "NODE-2"})
+    crash(journal)
+    # The last line was half written when the process died
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "ts": 1')
+
+    journal = Journal.for_workbook(path)
+    session = WorkbookSession(path)
+    try:
+        assert journal.replay(session) == (2, 0)
+    finally:
+        session.close(flush=False)
+        journal.close()
+    assert cell(path, 2, 2) == "NODE-1"
+    assert cell(path, 3, 2) == "NODE-2"
+    # Everything replayed is in the file, so nothing is left to recover
+    assert not os.path.exists(journal.path)
+
+
+def test_entries_older_than_a_save_elsewhere_are_skipped(tmp_path, monkeypatch):
+    path = str(tmp_path / "audit.xlsx")
+    make_workbook(path)
+    clock = types.SimpleNamespace(time=lambda: 1000.0)
+    monkeypatch.setattr(journal_module, "time", clock)
+    journal = Journal.for_workbook(path)
+    journal.append("row", 2, {2: "OURS-OLD"})
+    clock.time = lambda: 3000.0
+    journal.append("row", 3, {2: "OURS-NEW"})
+    crash(journal)
+    # Someone else saved the workbook between the two writes
+    make_workbook(path, node="THEIRS")
+    os.utime(path, (2000.0, 2000.0))
+
+    journal = Journal.for_workbook(path)
+    session = WorkbookSession(path)
+    try:
+        assert journal.replay(session) == (1, 1)
+    finally:
+        session.close(flush=False)
+        journal.close()
+    assert cell(path, 2, 2) == "THEIRS"
+    assert cell(path, 3, 2) == "OURS-NEW"
+
+
+def test_checkpoint_drops_the_flushed_entries(tmp_path):
+    path = str(tmp_path / "audit.xlsx")
+    make_workbook(path)
+    journal = Journal.for_workbook(path)
+    for node in ("NODE-1", "NODE-2", "NODE-3"):
+        seq = journal.append("row", 2, {2: node})
+    journal.mark_applied(seq - 1)
+    journal.checkpoint()
+    assert [entry["cells"] for entry in journal.entries()] == [{"2": "NODE-3"}]
+    with open(journal.path, encoding="utf-8") as f:
+        base = json.loads(f.readline())
+    assert base == {"kind": "base", "stamp": journal._workbook_stamp()}
+    crash(journal)
+
+    # Sequence numbers carry on after reopening
+    journal = Journal.for_workbook(path)
+    assert journal.append("row", 3, {2: "NODE-4"}) == seq + 1
+    journal.mark_applied(seq + 1)
+    journal.checkpoint()
+    assert journal.entries() == []
+    journal.close()
+    assert not os.path.exists(journal.path)
@@ -0,0 +1,116 @@
+"""Reconciliation against a local HTTP stub serving saved PRISM pages."""
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from conftest import fixture_path
+from nodeaudit.prism_batch import PrismFetcher, ReconcileReport, fetch_statuses, is_design_url, reconcile
+from nodeaudit.prism_extract import APPROVED, IN_PROGRESS, REJECTED
+from nodeaudit.workbook_set import WorkbookSet, expand_sources
+
+# PID -> saved page; other PIDs get a 404
+PAGES = {
+    "10001": "prism_approved.html",
+    "10002": "prism_in_progress.html",
+    "10003": "prism_rejected.html",
+    "10004": "prism_missing_pid.html",
+}
+
+
+class PrismStub(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        name = PAGES.get(query.get("pid", [""])[0])
+        if name is None:
+            self.send_error(404)
+            return
+        with open(fixture_path(name), "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def prism_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PrismStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/design?pid={{pid}}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    path = tmp_path / "audit.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["PID 1", "NODE 1", "PID 2", "NODE 2", "BUILD STATE"])
+    sheet.append(["10001", None, None, None, None])
+    sheet.append(["10002", None, 10003, None, None])
+    sheet.append(["10004", None, None, None, None])
+    sheet.append(["10005", "KEEP", None, None, "PRO-I"])
+    workbook.save(path)
+    return str(path)
+
+
+def test_fetch_statuses(prism_url):
+    seen = []
+    records, errors = fetch_statuses(["10001", "10002", "10003", "10004", "10005"], PrismFetcher(prism_url),
+                                     concurrency=2, progress=lambda done, total: seen.append((done, total)))
+    assert records["10001"].node == "NODE-A1" and records["10001"].status == APPROVED
+    assert records["10002"].node == "NODE-B2" and records["10002"].status == IN_PROGRESS
+    assert records["10003"].node == "NODE-C3" and records["10003"].status == REJECTED
+    assert not records["10004"].pid and records["10004"].status is None
+    assert list(errors) == ["10005"] and "404" in errors["10005"]
+    assert seen[-1] == (5, 5) and len(seen) == 5
+
+
+def test_reconcile_writes_results(prism_url, workbook_path):
+    workbooks = WorkbookSet.open(expand_sources([workbook_path]), journal=False)
+    try:
+        report = reconcile(workbooks, PrismFetcher(prism_url), concurrency=4)
+    finally:
+        workbooks.close(flush=False)
+
+    assert isinstance(report, ReconcileReport)
+    assert report.pids == 5
+    assert list(report.errors) == ["10005"]
+    assert report.rows_updated == 3
+    assert report.counts() == {APPROVED: 1, IN_PROGRESS: 2, REJECTED: 1}
+    assert report.pids_per_minute > 0
+    assert "PIDs/min" in str(report)
+
+    rows = [list(values) for values in load_workbook(workbook_path).active.iter_rows(min_row=2, values_only=True)]
+    assert rows == [
+        ["10001", "NODE-A1", None, None, APPROVED],
+        ["10002", "NODE-B2", 10003, "NODE-C3", REJECTED],
+        # A page without a design leaves the node alone and counts as In Progress
+        ["10004", None, None, None, IN_PROGRESS],
+        # Failed fetches write nothing
+        ["10005", "KEEP", None, None, "PRO-I"],
+    ]
+
+
+@pytest.mark.parametrize("url, template, expected", [
+    ("https://prism.example/design?pid=10001", "https://prism.example/design?pid={pid}", True),
+    ("https://PRISM.example/design?pid=10001&tab=2", "https://prism.example/design?pid={pid}", True),
+    ("https://prism.example/search?q=10001", "https://prism.example/design?pid={pid}", False),
+    ("https://www.google.com/", "https://prism.example/design?pid={pid}", False),
+    ("https://prism.example/designs/10001/review", "https://prism.example/designs/{pid}/review", True),
+    ("https://prism.example/designs/", "https://prism.example/designs/{pid}/review", False),
+    ("https://prism.example/design?pid=10001", None, False),
+])
+def test_is_design_url(url, template, expected):
+    assert is_design_url(url, template) is expected
@@ -0,0 +1,76 @@
+"""PrismCache keys, expiry and eviction."""
+import pytest
+
+from nodeaudit.prism_cache import PrismCache
+from nodeaudit.prism_extract import PrismRecord
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PrismCache(str(tmp_path / "prism_cache.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_pids_are_matched_however_they_were_written(cache):
+    cache.put(PrismRecord(pid="ab12cD ", node="NODE-1", status="Design Approved"))
+    for pid in ("AB12CD", "ab12cd", " Ab12Cd\u200b"):
+        record = cache.get(pid)
+        assert record is not None and record.node == "NODE-1"
+    assert cache.get_many(["ab12CD", "XY99"]) == {"ab12CD": cache.get("ab12CD")}
+    # A later fetch under another spelling replaces the entry instead of adding one
+    cache.put(PrismRecord(pid="AB12CD", node="NODE-2", status="Rejected"))
+    assert cache.get("ab12cd").node == "NODE-2"
+    assert cache._conn.execute("SELECT COUNT(*) FROM prism_cache").fetchone() == (1,)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    clock = Clock()
+    cache = PrismCache(str(tmp_path / "prism_cache.sqlite3"), ttl=60, clock=clock)
+    try:
+        cache.put(PrismRecord(pid="OLD", node="NODE-1"))
+        clock.now += 30
+        cache.put(PrismRecord(pid="NEW", node="NODE-2"))
+        clock.now += 31
+        assert cache.get("OLD") is None
+        assert cache.get("NEW").node == "NODE-2"
+        # The expired entry is gone from the table, not just hidden
+        assert cache._conn.execute("SELECT pid FROM prism_cache").fetchall() == [("NEW",)]
+        clock.now += 30
+        assert cache.get_many(["OLD", "NEW"]) == {}
+    finally:
+        cache.close()
+
+
+def test_eviction_keeps_the_newest_entries(tmp_path):
+    clock = Clock()
+    cache = PrismCache(str(tmp_path / "prism_cache.sqlite3"), max_entries=3, clock=clock)
+    try:
+        for pid in ("P1", "P2", "P3", "P4", "P5"):
+            cache.put(PrismRecord(pid=pid, node=f"NODE-{pid}"))
+            clock.now += 1
+        # Size eviction is batched; below the write threshold nothing is dropped yet
+        assert len(cache.get_many(["P1", "P2", "P3", "P4", "P5"])) == 5
+        cache.evict()
+        assert sorted(cache.get_many(["P1", "P2", "P3", "P4", "P5"])) == ["P3", "P4", "P5"]
+    finally:
+        cache.close()
+
+
+def test_eviction_runs_after_enough_writes(tmp_path):
+    cache = PrismCache(str(tmp_path / "prism_cache.sqlite3"), max_entries=10, clock=Clock())
+    try:
+        cache.put_many([PrismRecord(pid=f"P{i}") for i in range(999)], fetched_at=1000.0)
+        cache.put(PrismRecord(pid="LATEST"), fetched_at=1001.0)
+        assert cache._conn.execute("SELECT COUNT(*) FROM prism_cache").fetchone() == (10,)
+        assert cache.get("LATEST") is not None
+    finally:
+        cache.close()
@@ -0,0 +1,68 @@
+"""PrismPageParser over saved PRISM pages."""
+import pytest
+
+from conftest import fixture_path
+from nodeaudit.prism_extract import (PrismRecord, cell_text, extract_record, extract_records, parse_file,
+                                     APPROVED, IN_PROGRESS, REJECTED)
+
+
+def read_fixture(name):
+    with open(fixture_path(name), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name, record", [
+    ("prism_approved.html", PrismRecord("10001", "NODE-A1", "Design Approved", APPROVED)),
+    ("prism_in_progress.html", PrismRecord("10002", "NODE-B2", "In Progress - Pending QC", IN_PROGRESS)),
+    ("prism_rejected.html", PrismRecord("10003", "NODE-C3", "Rejected", REJECTED)),
+])
+def test_single_form_page(name, record):
+    assert extract_record(read_fixture(name)) == record
+    assert extract_records(read_fixture(name)) == [record]
+    # Small chunks split tags and text across feed() calls
+    assert parse_file(fixture_path(name), chunk_size=7).record() == record
+
+
+def test_missing_pid_page():
+    record = extract_record(read_fixture("prism_missing_pid.html"))
+    assert record == PrismRecord()
+    assert not record.found
+    assert extract_records(read_fixture("prism_missing_pid.html")) == []
+
+
+def test_result_table_page():
+    html = read_fixture("prism_results.html")
+    assert extract_records(html) == [
+        PrismRecord("20001", "NODE-R1", "Design Approved", APPROVED),
+        PrismRecord("20002", "NODE-R2", "In Progress", IN_PROGRESS),
+        PrismRecord("20003", "NODE-R3", "Rejected - see notes", REJECTED),
+        # No node, so no usable status
+        PrismRecord("20004", "", "Design Approved", None),
+    ]
+    # The layout table around the results is not a form
+    assert extract_record(html) == PrismRecord()
+
+
+def test_nested_table_stays_in_its_row():
+    # The Node value is wrapped in a table of its own; the Design Status after
+    # it is in the same outer row and must still be paired with its label
+    record = extract_record(read_fixture("prism_nested.html"))
+    assert record == PrismRecord("30001", "NODE-N1", "Design Approved", APPROVED)
+
+
+def test_nested_table_rows_close_separately():
+    html = ("<table><tr><td class='formLabel'>PID</td><td>1</td>"
+            "<td class='formLabel'>Node</td><td><table><tr><td>N</td></tr><tr><td>1</td></tr></table></td>"
+            "<td class='formLabel'>Design Status</td><td>Rejected</td></tr></table>")
+    assert extract_record(html) == PrismRecord("1", "N 1", "Rejected", REJECTED)
+
+
+def test_nbsp_and_zero_width_text():
+    record = extract_record(read_fixture("prism_nbsp.html"))
+    assert record == PrismRecord("40001", "NODE-Z1", "Design Approved", APPROVED)
+
+
+def test_cell_text():
+    assert cell_text("\u00a0 Design\u00a0\u00a0Approved\u200b \n") == "Design Approved"
+    assert cell_text("\ufeffNODE\u200c-1\u2060") == "NODE-1"
+    assert cell_text(" \u00a0 ") == ""
@@ -0,0 +1,60 @@
+"""Ranking, updates and rebuilds of the PID / Node / Magellan search."""
+from nodeaudit.search_index import EXACT, PREFIX, SUBSTRING, SearchIndex
+
+
+def make_index(rebuild_after=5000):
+    columns = {
+        "PID 1": ["XAB1", "AB1", "AB12", None, "ab1"],
+        "NODE 1": ["NODE-AB1", None, "N2", "N3", "N4"],
+        "BUILD STATE": ["AB1", "AB1", "AB1", "AB1", "AB1"],
+    }
+    return columns, SearchIndex(columns, rebuild_after=rebuild_after)
+
+
+def test_exact_then_prefix_then_substring():
+    _, index = make_index()
+    assert index.search("Ab1") == [
+        (EXACT, 3, "PID 1", "AB1"),
+        (EXACT, 6, "PID 1", "ab1"),
+        (PREFIX, 4, "PID 1", "AB12"),
+        (SUBSTRING, 2, "NODE 1", "NODE-AB1"),
+        (SUBSTRING, 2, "PID 1", "XAB1"),
+    ]
+    # Only the searchable columns are indexed
+    assert all(field != "BUILD STATE" for _, _, field, _ in index.search("ab1"))
+    assert index.search("  ") == []
+    assert index.search("zz") == []
+
+
+def test_prefix_matches_are_not_crowded_out_by_substrings():
+    columns = {"PID 1": [f"X{i}ab" for i in range(20)] + ["AB"]}
+    index = SearchIndex(columns)
+    assert index.search("ab", limit=1) == [(EXACT, 22, "PID 1", "AB")]
+
+
+def test_update_replaces_the_old_value():
+    columns, index = make_index()
+    columns["NODE 1"][2] = "FRESH-7"
+    index.update(4, "NODE 1", "FRESH-7")
+    assert index.search("n2") == []
+    assert index.search("fresh") == [(PREFIX, 4, "NODE 1", "FRESH-7")]
+    assert index.search("sh-7") == [(SUBSTRING, 4, "NODE 1", "FRESH-7")]
+    # A cell cleared later stops matching too
+    columns["NODE 1"][2] = None
+    index.update(4, "NODE 1", None)
+    assert index.search("fresh") == []
+
+
+def test_rebuild_after_enough_updates():
+    columns, index = make_index(rebuild_after=2)
+    text = index.lines.text
+    for row, value in ((2, "NEW-1"), (3, "NEW-2")):
+        columns["NODE 1"][row - 2] = value
+        index.update(row, "NODE 1", value)
+    assert len(index.delta) == 2 and index.lines.text == text
+    columns["NODE 1"][3] = "NEW-3"
+    index.update(5, "NODE 1", "NEW-3")
+    # The delta was folded into a fresh main text
+    assert len(index.delta) == 0
+    assert "\nnew-3\n" in index.lines.text and "\nn3\n" not in index.lines.text
+    assert [row for _, row, _, _ in index.search("new")] == [2, 3, 5]
@@ -0,0 +1,64 @@
+"""Unified row numbering across the sheets of a WorkbookSet."""
+import pytest
+from openpyxl import Workbook
+
+from nodeaudit.journal import Journal
+from nodeaudit.workbook_set import WorkbookSet, expand_sources
+
+
+def make_workbook(path):
+    workbook = Workbook()
+    north = workbook.active
+    north.title = "North"
+    north.append(["PID 1", "NODE 1"])
+    north.append(["N1", None])
+    north.append(["N2", None])
+    south = workbook.create_sheet("South")
+    south.append(["PID 1", "NODE 1"])
+    south.append(["S1", None])
+    workbook.save(path)
+
+
+def test_replayed_rows_past_the_end_move_later_sheets(tmp_path):
+    path = str(tmp_path / "audit.xlsx")
+    make_workbook(path)
+    # A save past the end of the first sheet that never reached the file
+    journal = Journal.for_workbook(path)
+    journal.append("row", 5, {1: "N5", 2: "NODE-5"}, "North")
+    journal.close()
+
+    workbooks = WorkbookSet.open(expand_sources([path], all_sheets=True))
+    try:
+        assert workbooks.replayed == 1
+        assert [part.base for part in workbooks.parts] == [0, 4]
+        assert workbooks.max_row == 6
+        assert workbooks.locate("N5") == [(5, 0)]
+        assert workbooks.value(5, "NODE 1") == "NODE-5"
+        assert workbooks.locate("S1") == [(6, 0)]
+        assert workbooks.describe(6) == "audit.xlsx / South, row 2"
+    finally:
+        workbooks.close(flush=False)
+
+
+def test_parts_follow_each_other(tmp_path):
+    path = str(tmp_path / "audit.xlsx")
+    make_workbook(path)
+    workbooks = WorkbookSet.open(expand_sources([path], all_sheets=True), journal=False)
+    try:
+        assert [part.base for part in workbooks.parts] == [0, 2]
+        assert workbooks.locate("N2") == [(3, 0)]
+        assert workbooks.locate("S1") == [(4, 0)]
+    finally:
+        workbooks.close(flush=False)
+
+
+def test_app_opens_the_active_sheet_unless_all_sheets_is_chosen(tmp_path):
+    main = pytest.importorskip("main")
+    path = str(tmp_path / "audit.xlsx")
+    make_workbook(path)
+    for all_sheets, labels in ((False, ["audit.xlsx / North"]), (True, ["audit.xlsx / North", "audit.xlsx / South"])):
+        workbooks = main.open_workbooks([path], lambda message: None, all_sheets)
+        try:
+            assert [part.label for part in workbooks.parts] == labels
+        finally:
+            workbooks.close(flush=False)
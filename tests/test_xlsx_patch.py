@@ -0,0 +1,179 @@
+"""Patching cells into the sheet XML of an .xlsx, checked by reading the result back with openpyxl."""
+import datetime
+import re
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
+
+from nodeaudit import xlsx_patch
+from nodeaudit.workbook_session import WorkbookSession
+from nodeaudit.xlsx_patch import PatchUnsupported, patch_workbook
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    path = tmp_path / "audit.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Audit"
+    sheet.append(["PID 1", "NODE 1", "BUILD STATE"])
+    sheet.append(["P2", "alpha", None])
+    sheet["A5"] = "P5"
+    sheet["B5"] = "beta"
+    sheet["C2"] = "=1+1"
+    sheet["B2"].font = Font(bold=True)
+    sheet["C5"].fill = PatternFill("solid", fgColor="FFFF00")
+    workbook.create_sheet("Lookup").append(["keep"])
+    workbook.save(path)
+    return str(path)
+
+
+# What Excel writes and openpyxl doesn't: text cells pointing into a shared-string table
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
+</Types>"""
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Audit" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>
+</Relationships>"""
+SHEET = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><dimension ref="A1:B2"/><sheetData>\
+<row r="1" spans="1:2"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c></row>\
+<row r="2" spans="1:2"><c r="A2" t="s"><v>2</v></c><c r="B2" t="s"><v>3</v></c></row>\
+</sheetData></worksheet>"""
+SHARED_STRINGS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="4" uniqueCount="4">\
+<si><t>PID 1</t></si><si><t>NODE 1</t></si><si><t>P2</t></si><si><t>alpha</t></si></sst>"""
+
+
+@pytest.fixture
+def shared_strings_path(tmp_path):
+    path = tmp_path / "excel.xlsx"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zout:
+        zout.writestr("[Content_Types].xml", CONTENT_TYPES)
+        zout.writestr("_rels/.rels", PACKAGE_RELS)
+        zout.writestr("xl/workbook.xml", WORKBOOK)
+        zout.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS)
+        zout.writestr("xl/worksheets/sheet1.xml", SHEET)
+        zout.writestr("xl/sharedStrings.xml", SHARED_STRINGS)
+    return str(path)
+
+
+def patched(workbook_path, tmp_path, rows, sheet="Audit"):
+    out_path = str(tmp_path / "out.xlsx")
+    patch_workbook(workbook_path, out_path, {sheet: rows})
+    return out_path
+
+
+def values(path, sheet="Audit"):
+    workbook = load_workbook(path)
+    try:
+        return [list(row) for row in workbook[sheet].iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+
+
+def read_part(path, name):
+    with zipfile.ZipFile(path) as zin:
+        return zin.read(name).decode("utf-8")
+
+
+def test_replaces_cells_and_keeps_the_rest(workbook_path, tmp_path):
+    out_path = patched(workbook_path, tmp_path, {5: {2: "gamma", 3: 7}})
+    assert values(out_path) == [
+        ["PID 1", "NODE 1", "BUILD STATE"],
+        ["P2", "alpha", "=1+1"],
+        [None, None, None],
+        [None, None, None],
+        ["P5", "gamma", 7],
+    ]
+    assert values(out_path, "Lookup") == [["keep"]]
+
+
+def test_shared_strings_are_reused_and_appended(shared_strings_path, tmp_path):
+    out_path = patched(shared_strings_path, tmp_path, {3: {1: "P3", 2: "alpha"}, 2: {2: "new text"}})
+    strings = read_part(out_path, "xl/sharedStrings.xml")
+    assert strings.count("<t>alpha</t>") == 1
+    assert strings.count("<t>new text</t>") == 1
+    assert 'uniqueCount="6"' in strings and 'count="7"' in strings
+    sheet_xml = read_part(out_path, "xl/worksheets/sheet1.xml")
+    # "alpha" points at its existing entry, the new texts at entries appended after it
+    assert '<c r="B3" t="s"><v>3</v></c>' in sheet_xml
+    assert values(out_path) == [["PID 1", "NODE 1"], ["P2", "new text"], ["P3", "alpha"]]
+
+
+def test_rows_split_across_read_chunks(workbook_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(xlsx_patch, "CHUNK", 5)
+    out_path = patched(workbook_path, tmp_path, {2: {2: "two"}, 3: {1: "P3"}, 5: {2: "five"}, 8: {1: "P8"}})
+    assert values(out_path) == [
+        ["PID 1", "NODE 1", "BUILD STATE"],
+        ["P2", "two", "=1+1"],
+        ["P3", None, None],
+        [None, None, None],
+        ["P5", "five", None],
+        [None, None, None],
+        [None, None, None],
+        ["P8", None, None],
+    ]
+
+
+def test_rows_inserted_between_and_after_existing_rows(workbook_path, tmp_path):
+    out_path = patched(workbook_path, tmp_path, {3: {1: "P3"}, 4: {2: "four"}, 9: {1: "P9", 4: "extra"}})
+    rows = values(out_path)
+    assert rows[2][:2] == ["P3", None]
+    assert rows[3][:2] == [None, "four"]
+    assert rows[4][:2] == ["P5", "beta"]
+    assert rows[8] == ["P9", None, None, "extra"]
+    sheet_xml = read_part(out_path, "xl/worksheets/sheet1.xml")
+    numbers = [int(n) for n in re.findall(r'<row [^>]*?r="(\d+)"', sheet_xml)]
+    assert numbers == sorted(numbers) == [1, 2, 3, 4, 5, 9]
+
+
+def test_dimension_grows_to_cover_new_cells(workbook_path, tmp_path):
+    assert '<dimension ref="A1:C5"' in read_part(workbook_path, "xl/worksheets/sheet1.xml")
+    out_path = patched(workbook_path, tmp_path, {12: {5: "far"}})
+    assert '<dimension ref="A1:E12"' in read_part(out_path, "xl/worksheets/sheet1.xml")
+
+
+def test_cell_styles_are_kept(workbook_path, tmp_path):
+    out_path = patched(workbook_path, tmp_path, {2: {2: "bold still"}, 5: {3: "filled"}})
+    sheet = load_workbook(out_path)["Audit"]
+    assert sheet["B2"].value == "bold still" and sheet["B2"].font.b
+    assert sheet["C5"].value == "filled" and sheet["C5"].fill.fgColor.rgb == "00FFFF00"
+    assert not sheet["A2"].font.b
+
+
+@pytest.mark.parametrize("rows", [
+    {2: {3: "replaces formula"}},
+    {5: {2: "=SUM(A1:A2)"}},
+    {5: {2: datetime.datetime(2024, 5, 1, 8, 30)}},
+], ids=["formula cell", "leading equals", "datetime"])
+def test_unsupported_changes_fall_back_to_openpyxl(workbook_path, tmp_path, rows):
+    with pytest.raises(PatchUnsupported):
+        patched(workbook_path, tmp_path, rows)
+
+    session = WorkbookSession(workbook_path, "Audit")
+    [(row, cells)] = rows.items()
+    for column, value in cells.items():
+        session.write_cell(row, column, value)
+    session.close()
+    sheet = load_workbook(workbook_path)["Audit"]
+    for column, value in cells.items():
+        assert sheet.cell(row=row, column=column).value == value
+    assert sheet["B2"].font.b